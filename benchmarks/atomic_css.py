@@ -0,0 +1,65 @@
+"""Atomic CSS benchmark
+
+Styles every item of a large list the way `HTMLElement.style` and the CSS extensions do,
+then compares the CSS bytes (inline styles, or the stylesheet plus the added class names)
+and the size of the rendered page before and after compiling to atomic classes.
+
+Usage:
+    > python -m benchmarks.atomic_css
+    > python -m benchmarks.atomic_css --size 50000
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from time import perf_counter
+
+from pynetic.core.build.atomic import AtomicCSS
+from pynetic.core.html import Div, HTMLElement, Li, Span, Ul
+
+
+def build_page(size: int) -> HTMLElement:
+    """A list of `size` items, each styled with its own copy of a handful of declarations"""
+    return Ul(
+        *(
+            Li(
+                Span(f"item {index}").style(font_weight="bold", color="#333"),
+                Div(f"{index % 7} days ago").style(color="#999", font_size="12px"),
+            ).style(
+                display="flex",
+                align_items="center",
+                justify_content="space-between",
+                padding=f"{4 * (index % 3)}px",
+                **{"::before": {"content": '""', "display": "inline-block", "width": "0"}},
+            )
+            for index in range(size)
+        )
+    )
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=5_000)
+    args = parser.parse_args()
+
+    page = build_page(args.size)
+    html_before = len(page.render().encode())
+
+    start = perf_counter()
+    atomic = AtomicCSS()
+    atomic.compile(page)
+    stylesheet = atomic.stylesheet().encode()
+    elapsed = perf_counter() - start
+
+    css_after = len(stylesheet) + atomic.added
+    html_after = len(page.render().encode()) + len(stylesheet)
+
+    print(f"items:       {args.size:>12,}")
+    print(f"rules:       {len(atomic.rules):>12,}")
+    print(f"compiled in: {elapsed:>11.3f}s")
+    print(f"CSS bytes:   {atomic.before:>12,} -> {css_after:,} ({css_after / atomic.before:.1%})")
+    print(f"page bytes:  {html_before:>12,} -> {html_after:,} ({html_after / html_before:.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Stylesheet parsing benchmark
+
+Generates a utility-class stylesheet in the style of framework output (escaped selectors,
+media queries, data URLs and keyframes) and times parsing it with the native tokenizer
+and with cssutils.
+
+Usage:
+    > python -m benchmarks.css_parse
+    > python -m benchmarks.css_parse --megabytes 5 --parser native
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from time import perf_counter
+
+from pynetic.core.css import parse
+
+PARSERS = {"native": False, "cssutils": True}
+
+BREAKPOINTS = {"sm": 640, "md": 768, "lg": 1024, "xl": 1280}
+
+
+def build_stylesheet(size: int) -> str:
+    """Builds a stylesheet of roughly `size` bytes"""
+    chunks: list[str] = ['/*! generated for benchmarking */\n@charset "utf-8";\n']
+    total = 0
+    index = 0
+
+    while total < size:
+        block = [
+            f".p-{index}{{padding:{index * 0.25}rem}}\n",
+            f".hover\\:text-{index}:hover"
+            f"{{color:rgb({index % 256} {index * 7 % 256} 0 / 0.5)}}\n",
+            f".w-{index}\\/12{{width:calc({index} / 12 * 100%)}}\n",
+            f".bg-icon-{index}"
+            f"{{background-image:url(data:image/svg+xml;base64,PHN2Zz4{index}==)}}\n",
+            f".grid-{index} > :not([hidden]) ~ :not([hidden]) {{\n"
+            f"  --tw-space-x-reverse: 0;\n"
+            f"  margin-right: calc({index}px * var(--tw-space-x-reverse));\n}}\n",
+        ]
+        media = "".join(
+            f"@media (min-width: {width}px) {{ .{name}\\:p-{index} {{ padding: {index}px }} }}\n"
+            for name, width in BREAKPOINTS.items()
+        )
+        keyframes = (
+            f"@keyframes spin-{index} "
+            "{ from { transform: rotate(0) } to { transform: rotate(360deg) } }\n"
+        )
+
+        for chunk in (*block, media, keyframes):
+            chunks.append(chunk)
+            total += len(chunk)
+
+        index += 1
+
+    return "".join(chunks)
+
+
+def count(rules: tuple) -> int:
+    return sum(1 + count(rule.rules or ()) for rule in rules)
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--megabytes", type=float, default=2)
+    parser.add_argument("--parser", choices=PARSERS, action="append")
+    args = parser.parse_args()
+
+    stylesheet = build_stylesheet(int(args.megabytes * 1_000_000))
+    print(f"{'parser':<9} {'MB':>6} {'rules':>9} {'seconds':>9} {'MB/s':>8}")
+
+    for name in args.parser or PARSERS:
+        start = perf_counter()
+        rules = parse(stylesheet, validate=PARSERS[name])
+        elapsed = perf_counter() - start
+
+        print(
+            f"{name:<9} {len(stylesheet) / 1e6:>6.2f} {count(rules):>9,} "
+            f"{elapsed:>9.3f} {len(stylesheet) / 1e6 / elapsed:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
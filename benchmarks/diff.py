@@ -0,0 +1,86 @@
+"""Diff benchmark
+
+Diffs a list of keyed items against several changes to it and reports the time taken to
+snapshot and diff, the number of patches and the size of the patches as JSON.
+
+Usage:
+    > python -m benchmarks.diff
+    > python -m benchmarks.diff --size 100000
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from argparse import ArgumentParser
+from collections.abc import Callable
+from time import perf_counter
+
+from pynetic.core.diff import diff, snapshot
+from pynetic.core.html import Li, Ul
+from pynetic.core.utils import For
+
+
+def change_text(items: list[dict]) -> None:
+    items[len(items) // 2] = {**items[len(items) // 2], "text": "changed"}
+
+
+def append(items: list[dict]) -> None:
+    items.append({"id": -1, "text": "appended"})
+
+
+def remove(items: list[dict]) -> None:
+    del items[len(items) // 2]
+
+
+def swap(items: list[dict]) -> None:
+    items[1], items[-2] = items[-2], items[1]
+
+
+def rotate(items: list[dict]) -> None:
+    items.append(items.pop(0))
+
+
+def shuffle(items: list[dict]) -> None:
+    random.Random(0).shuffle(items)
+
+
+CHANGES: dict[str, Callable[[list[dict]], None]] = {
+    "none": lambda items: None,
+    "change text": change_text,
+    "append": append,
+    "remove": remove,
+    "swap": swap,
+    "rotate": rotate,
+    "reverse": list.reverse,
+    "shuffle": shuffle,
+}
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"{'change':<12} {'snapshot ms':>12} {'diff ms':>9} {'patches':>9} {'patch bytes':>12}")
+
+    for name, change in CHANGES.items():
+        items = [{"id": index, "text": f"item {index}"} for index in range(args.size)]
+        page = Ul(For(items, None, lambda item: Li(item["text"]), key=lambda item: item["id"]))
+        before = snapshot(page)
+        change(items)
+
+        start = perf_counter()
+        after = snapshot(page)
+        snapshotted = perf_counter()
+        patches = diff(before, after)
+        diffed = perf_counter()
+
+        print(
+            f"{name:<12} {(snapshotted - start) * 1000:>12.1f} {(diffed - snapshotted) * 1000:>9.1f}"
+            f" {len(patches):>9,} {len(json.dumps(patches)):>12,}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Element memory benchmark
+
+Measures the bytes allocated per element, with `tracemalloc`, for bare leaf elements,
+leaves with attributes and classes, and the elements of a nested tree.
+
+Usage:
+    > python -m benchmarks.memory
+    > python -m benchmarks.memory --size 100000
+"""
+
+from __future__ import annotations
+
+import tracemalloc
+from argparse import ArgumentParser
+from collections.abc import Callable
+
+from benchmarks.render import Span, build_tree, count
+from pynetic.core.html import HTMLElement
+
+
+def measure(make: Callable[[], list[HTMLElement] | HTMLElement]) -> tuple[int, int]:
+    """Returns the bytes allocated by `make` and the number of elements it made"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    elements = make()
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    if isinstance(elements, HTMLElement):
+        return allocated, count(elements)
+
+    return allocated, len(elements)
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    cases: dict[str, Callable[[], list[HTMLElement] | HTMLElement]] = {
+        "bare leaf": lambda: [Span() for _ in range(args.size)],
+        "leaf with class": lambda: [Span("text", classes="item_name") for _ in range(args.size)],
+        "tree": lambda: build_tree(args.size),
+    }
+
+    print(f"{'case':<16} {'elements':>10} {'bytes/element':>14}")
+
+    for name, make in cases.items():
+        allocated, elements = measure(make)
+        print(f"{name:<16} {elements:>10,} {allocated / elements:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Render throughput benchmark
+
+Renders trees of 10k, 100k and 1M elements with each render backend and reports the time
+taken, elements per second and output size.
+
+Usage:
+    > python -m benchmarks.render
+    > python -m benchmarks.render --backend string --sizes 10000 100000
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from time import perf_counter
+
+from pynetic.core.html import RENDER_BACKENDS, Div, HTMLElement, Span
+
+FAN_OUT = 10
+
+
+def build_tree(size: int) -> HTMLElement:
+    """Builds a tree of `size` elements, each parent having up to `FAN_OUT` children"""
+    elements: list[HTMLElement] = [
+        Span(f"item {index}", classes="item", title=f"Item {index}")
+        for index in range(size - size // FAN_OUT)
+    ]
+
+    while len(elements) > 1:
+        elements = [
+            Div(*elements[index : index + FAN_OUT], classes="group")
+            for index in range(0, len(elements), FAN_OUT)
+        ]
+
+    return elements[0]
+
+
+def count(element: HTMLElement) -> int:
+    """Counts the elements in a tree"""
+    total = 0
+    stack = [element]
+
+    while stack:
+        total += 1
+        stack.extend(stack.pop()._children)
+
+    return total
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=RENDER_BACKENDS, action="append")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'backend':<8} {'elements':>10} {'seconds':>9} {'elements/s':>12} {'MB':>8}")
+
+    for size in args.sizes:
+        tree = build_tree(size)
+        elements = count(tree)
+
+        for backend in args.backend or RENDER_BACKENDS:
+            start = perf_counter()
+            html = tree.render(backend)
+            elapsed = perf_counter() - start
+
+            print(
+                f"{backend:<8} {elements:>10,} {elapsed:>9.3f} "
+                f"{elements / elapsed:>12,.0f} {len(html) / 1e6:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
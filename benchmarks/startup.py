@@ -0,0 +1,69 @@
+"""Import time benchmark
+
+Runs `python -X importtime` in a fresh interpreter for each module and reports its
+cumulative import time along with the slowest modules it pulled in. Modules the
+interpreter imports on its own at startup (`site` and friends) are left out.
+
+Usage:
+    > python -m benchmarks.startup
+    > python -m benchmarks.startup pynetic.core.server --top 20
+"""
+
+from __future__ import annotations
+
+import subprocess  # nosec: only runs the current interpreter
+import sys
+from argparse import ArgumentParser
+from statistics import median
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Imports `module` in a fresh interpreter, returning the cumulative µs of every import"""
+    result = subprocess.run(  # nosec: arguments are not passed through a shell
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    times: dict[str, int] = {}
+
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+
+    return times
+
+
+def main() -> None:
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=["pynetic.core"])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    interpreter = import_times("sys")
+
+    for module in args.modules:
+        runs = [import_times(module) for _ in range(args.runs)]
+        total = median(run[module] for run in runs)
+
+        print(f"{module}: {total / 1000:.1f} ms (median of {args.runs} runs)")
+
+        slowest = sorted(
+            (
+                (name, cumulative)
+                for name, cumulative in runs[-1].items()
+                if name not in interpreter
+            ),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+        for name, cumulative in slowest[: args.top]:
+            print(f"  {cumulative / 1000:>8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
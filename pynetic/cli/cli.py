@@ -37,6 +37,7 @@ import click
 from cookiecutter.main import cookiecutter
 from cookiecutter.replay import get_file_name as get_cookiecutter_name
 
+from ..core import css
 from ..core.application import Application
 
 cwd = Path().cwd()
@@ -59,8 +60,12 @@ def init(url: str | None) -> None:
     # TODO: Work on other version controls
 
 
-@click.group()
-def run() -> None:
+@pynetic.group(invoke_without_command=True)
+@click.pass_context
+def run(context: click.Context) -> None:
+    if context.invoked_subcommand is not None:
+        return
+
     click.echo("Please choose what you would like to run.")
     click.echo("-----------------------------------------")
     click.echo("Options:")
@@ -70,12 +75,18 @@ def run() -> None:
 
 @run.command()
 def dev() -> None:
-    pass
+    # Unknown style names are caught while developing, the build doesn't pay for the checks
+    css.STRICT = True
 
 
 @run.command()
-def build() -> None:
-    pass
+@click.option(
+    "--safelist",
+    multiple=True,
+    help="A class to keep the CSS rules of when unused rules are removed, can be repeated.",
+)
+def build(safelist: tuple[str, ...]) -> None:
+    click.echo(Application().build(safelist))
 
 
 if __name__ == "__main__":
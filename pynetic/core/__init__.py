@@ -3,4 +3,5 @@
 import html
 
 from .application import Application
-from .reference import MakeReference, Reference
+from .reference import Computed, MakeReference, Reference, computed
+from .scheduler import batch
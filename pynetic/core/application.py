@@ -2,29 +2,86 @@
 
 from __future__ import annotations
 
-from collections.abc import Generator
+import sys
+from collections.abc import Generator, Iterable
+from functools import reduce
 from importlib import import_module
+from operator import or_
 from pathlib import Path
 from types import ModuleType
+from typing import TYPE_CHECKING, Any
 
 from .component import Component
-from .reference import Reference
+from .graph import DependencyGraph
+from .html import HTMLElement
+from .parser import DEPENDENCIES, Dependencies, analyze
+from .reference import Computed
+from .scheduler import Scheduler
+from .session import SessionStore
+
+if TYPE_CHECKING:
+    from .build.report import BuildReport
+    from .reference import Reference
 
 ROUTES_FOLDER = Path().absolute().joinpath("routes")
+BUILD_FOLDER = Path().absolute().joinpath("build")
+CACHE_FOLDER = Path().absolute().joinpath(".pynetic_cache")
+STYLESHEET = "styles.css"
 
 
 def routes() -> Generator[ModuleType, None, None]:
     """Finds, imports and returns the modules in the routes folder"""
     for route_path in ROUTES_FOLDER.glob("*.py"):
-        yield import_module(str(route_path))
+        yield import_module(f"{ROUTES_FOLDER.name}.{route_path.stem}")
+
+
+def project_modules() -> list[ModuleType]:
+    """The imported modules whose source is in the project folder, i.e. routes and the
+    modules they import references and components from"""
+    root = Path().absolute()
+
+    return [
+        module
+        for module in list(sys.modules.values())
+        if (file := getattr(module, "__file__", None))
+        and Path(file).is_relative_to(root)
+        and "site-packages" not in Path(file).parts
+    ]
+
+
+def route_name(route: ModuleType) -> str:
+    """The name the route is served and built under, its module name without the package"""
+    return route.__name__.rpartition(".")[2]
+
 
+def reader_nodes(reader: str) -> list[Any]:
+    """The elements of the component, or the computed value, named by a reader in the
+    dependency table, i.e. `routes.index:home`. Empty for anything else."""
+    module, _, qualname = reader.partition(":")
+    value: Any = sys.modules.get(module)
 
-def get_component(route) -> Component:
-    return None or next(
-        component
-        for component in reversed(route.__dict__.values())
-        # using `reversed` because components are typically closer to the bottom of the file
-        if isinstance(component, Component)
+    for name in qualname.split("."):
+        if value is None or name == "<locals>":
+            return []
+
+        value = getattr(value, name, None)
+
+    if isinstance(value, Component):
+        return [element for element in value.elements if isinstance(element, HTMLElement)]
+
+    return [value] if isinstance(value, Computed) else []
+
+
+def get_component(route) -> Component | None:
+    """The route's page component, or `None` for modules without one, i.e. helpers"""
+    return next(
+        (
+            component
+            for component in reversed(route.__dict__.values())
+            # using `reversed` because components are typically closer to the bottom of the file
+            if isinstance(component, Component)
+        ),
+        None,
     )
 
 
@@ -32,6 +89,12 @@ class Application:
     """Represents a client session"""
 
     references: dict[str, Reference] = {}
+    # Which elements and derived values read which references, see `graph`
+    graph = DependencyGraph()
+    # Coalesces reference changes into one update, see `scheduler`
+    scheduler = Scheduler()
+    # Each session's values of the references, see `session`
+    sessions = SessionStore()
 
     def __init__(self) -> None:
         self._routes: set[ModuleType] = set()
@@ -39,11 +102,68 @@ class Application:
         self._components: set[Component] = set()
         self.references: set[Reference] = set()
 
-    def build(self) -> str | None:
-        """Builds the application for production"""
+    @classmethod
+    def link(cls, dependencies: Dependencies) -> None:
+        """Links each reference to the components and computed values reading it in the
+        graph, from the dependency table, see `parser`
+
+        Readers are looked up in their imported modules. A component's elements are linked,
+        so it's re-rendered even when the reference is only read in a lambda. Functions have
+        nothing to update and are left out, as are readers whose module isn't imported.
+        """
+        for reader, names in dependencies.reads.items():
+            nodes = reader_nodes(reader)
+
+            for name in names:
+                if name in cls.references:
+                    for node in nodes:
+                        cls.graph.add(cls.references[name], node)
+
+    def build(self, safelist: Iterable[str] = ()) -> BuildReport:
+        """Builds the application for production
+
+        The static styles of every page are compiled into atomic classes, see `build.atomic`,
+        and written to the build folder along with every `Style` used, less the rules no
+        route could use, see `build.treeshake`, named after a hash of its content, i.e.
+        `styles.3f9a1c2b.css`, and listed in the assets manifest, see `build.fingerprint`.
+        Each route's page is written to the build folder as `<route>.html`, with only its
+        interactive elements hydrated, see `hydration`, the CSS for its first paint inlined
+        and the rest loaded asynchronously, see `build.critical`, then minified, see
+        `build.minify`.
+        Every HTML, CSS and JS file is then precompressed, see `build.compress`.
+        Which functions and components read and write which references is written to
+        `dependencies.json`, see `parser`.
+
+        Args:
+            safelist (Iterable[str]):
+                Classes to keep the CSS rules of, such as those only used by elements made
+                once the page is interactive
+
+        Returns:
+            BuildReport: The bytes each build stage saved for each route
+        """
+        # Deferred as only building needs them, not serving
+        from . import hydration
+        from .build import critical
+        from .build.atomic import AtomicCSS
+        from .build.compress import compress
+        from .build.fingerprint import Assets
+        from .build.minify import minify
+        from .build.report import BuildReport
+        from .build.treeshake import tree_shake
+        from .build.usage import Usage
+        from .css import parse, serialize
+
+        report = BuildReport()
+        BUILD_FOLDER.mkdir(exist_ok=True)
+        pages: dict[str, Component] = {}
+
         for route in routes():
             self._routes.add(route)
 
+            if (component := get_component(route)) is not None:
+                pages[route_name(route)] = component
+
             for var in route.__dict__.values():
                 if isinstance(var, ModuleType):
                     self._modules.add(var)
@@ -51,6 +171,48 @@ class Application:
                 if isinstance(var, Component):
                     self._components.add(var)
 
+        elements = [element for component in pages.values() for element in component.elements]
+        stylesheet_rules = critical.stylesheet_rules(*elements)
+        atomic = AtomicCSS(stylesheet_rules)
+        atomic.compile(*elements)
+        rules = (*stylesheet_rules, *parse(atomic.stylesheet()))
+        usages = {name: Usage.of(*component.elements) for name, component in pages.items()}
+        unshaken = serialize(rules)
+        rules, removed = tree_shake(rules, reduce(or_, usages.values(), Usage()), safelist)
+        stylesheet = serialize(rules)
+        assets = Assets(BUILD_FOLDER)
+
+        if stylesheet:
+            assets.write(STYLESHEET, stylesheet)
+
+        if atomic.rules:
+            css_bytes = len(atomic.stylesheet()) + atomic.added
+            report.add("atomic-css", STYLESHEET, atomic.before, css_bytes)
+
+        if removed:
+            report.add("tree-shake", STYLESHEET, len(unshaken), len(stylesheet))
+            report.remove("tree-shake", removed)
+
+        for name, component in pages.items():
+            head = ""
+
+            if stylesheet:
+                inline = serialize(critical.critical_rules(rules, usages[name]))
+                report.add("critical-css", name, len(stylesheet), len(inline))
+                head = critical.head(inline, assets.url(STYLESHEET), complete=inline == stylesheet)
+
+            page = hydration.render_page(component, head=head)
+            minified = minify(page).encode()
+            report.add("minify", name, len(page.encode()), len(minified))
+            BUILD_FOLDER.joinpath(f"{name}.html").write_bytes(minified)
+
+        assets.save()
+        analyze(*project_modules()).save(BUILD_FOLDER.joinpath(DEPENDENCIES))
+
+        for name, entry in compress(BUILD_FOLDER).items():
+            for encoding, size in entry["encodings"].items():
+                report.add(encoding, name, entry["size"], size)
+
         imported_modules = self._modules - self._routes
         # TODO: Figure out how to build the CST tree for output
 
@@ -61,3 +223,5 @@ class Application:
         Add Functions to build_code
         Add Components to build_code
         """
+
+        return report
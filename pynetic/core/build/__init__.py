@@ -0,0 +1,5 @@
+"""pynetic build stages
+
+Each stage takes the output of `Application.build` for a route and makes it smaller or
+quicker to serve, recording what it saved in a `BuildReport`.
+"""
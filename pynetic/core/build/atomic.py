@@ -0,0 +1,209 @@
+"""Atomic CSS build stage
+
+Every element styled with `HTMLElement.style` carries its own copy of its declarations, so
+a list of 5,000 styled items repeats the same declarations 5,000 times. The compiler
+interns each unique declaration once as a class with a short name, i.e. `.a{display:flex}`,
+swaps the elements' static styles for those classes and emits one deduplicated stylesheet.
+
+Declarations in nested pseudo-class and pseudo-element dicts, such as `"::before"`, are
+interned along with their selector, i.e. `.b::before{content:""}`. Styles holding a
+`Reference` can change after the page is built, so they're left inline.
+
+A class doesn't win the cascade the way an inline style does, so the compiled rules go
+after the page's stylesheets, winning over selectors as specific as one class, and a
+declaration stays inline when any stylesheet rule setting the same property is more
+specific than that. A shorthand and its longhands on the same element, i.e. `margin` and
+`margin-top`, would be ordered by when each was interned rather than as they were
+written, so they're interned together as one class in their written order.
+
+Class names are never given out when they're used by the pages, `For` loops included as
+they render when compiled, or named in the stylesheets. Classes only added to elements
+made once the page is interactive should be kept out of the way by the app, i.e. with a
+prefix.
+
+Usage:
+    ```Python
+    atomic = AtomicCSS(stylesheet_rules(*home.elements, *about.elements))
+    atomic.compile(*home.elements, *about.elements)
+    stylesheet = atomic.stylesheet()
+    ```
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from ..css import Rule, declaration, property_name
+from ..html import _EMPTY, HTMLElement
+from ..reference import Reference
+from ..utils import iter_short_names
+from .usage import Usage, selector_classes, specificity
+
+__all__ = ("AtomicCSS",)
+
+
+class AtomicCSS:
+    """Interns style declarations into shared single-declaration classes
+
+    Class names are shared between every `compile` call, so compile all the pages that
+    share a stylesheet with the one compiler.
+
+    Args:
+        rules (Iterable[Rule]): The rules of the stylesheets the compiled rules go after
+
+    Attributes:
+        rules (dict[tuple[str, str], str]):
+            Class name of each interned `(pseudo selector, declaration)`
+        before (int): Bytes the compiled styles took inline, including their `style`
+            attributes. Pseudo selector rules, which can't be inline, are counted without a
+            selector
+        added (int): Bytes of the class names added to the elements
+    """
+
+    def __init__(self, rules: Iterable[Rule] = ()) -> None:
+        self.rules: dict[tuple[str, str], str] = {}
+        self.before = 0
+        self.added = 0
+        self._names = iter_short_names()
+        self._reserved: set[str] = set()
+        # Properties a stylesheet sets with a selector more specific than one class
+        self._contested: set[str] = set()
+        self._checked: dict[str, bool] = {}
+        stack = list(rules)
+
+        while stack:
+            rule = stack.pop()
+
+            if rule.rules is not None:
+                stack.extend(rule.rules)
+
+            if rule.selector.startswith("@"):
+                continue
+
+            self._reserved.update(selector_classes(rule.selector))
+
+            if specificity(rule.selector) > (0, 1, 0):
+                self._contested.update(name for name, _ in rule.declarations)
+
+    def compile(self, *elements: str | HTMLElement) -> None:
+        """Replaces the static styles of the elements, and their descendants, with classes
+
+        Names of classes already used by the elements are never given to a declaration.
+        """
+        found = list(_descendants(elements))
+        self._reserved.update(_class for element in found for _class in element._classes)
+        self._reserved.update(Usage.of(*elements).classes)
+
+        for element in found:
+            if element._styles:
+                self._compile_element(element)
+
+    def stylesheet(self) -> str:
+        """The rules for every declaration interned so far"""
+        return "".join(f".{name}{pseudo}{{{body}}}" for (pseudo, body), name in self.rules.items())
+
+    def _compile_element(self, element: HTMLElement) -> None:
+        # Static declarations of properties related to those held in references stay inline
+        # too, so they keep their order
+        references = [
+            property_name(name)
+            for name, value in element._styles.items()
+            if not isinstance(value, dict) and _is_reference(value)
+        ]
+        inline: dict[str, Any] = {}
+        static: list[str] = []
+        pseudos: list[tuple[str, list[tuple[str, Any]]]] = []
+        classes: list[str] = []
+
+        for name, value in element._styles.items():
+            if isinstance(value, dict):
+                # Other nested dicts, i.e. at-rules, aren't supported yet
+                if not name.startswith(":") or any(map(_is_reference, value.values())):
+                    inline[name] = value
+                    continue
+
+                body = ";".join(declaration(*item) for item in value.items())
+                self.before += len(f"{name}{{{body}}}")
+                pseudos.append((name, list(value.items())))
+
+            elif (
+                _is_reference(value)
+                or self._is_contested(property_name(name))
+                or any(_related(property_name(name), other) for other in references)
+            ):
+                inline[name] = value
+
+            else:
+                static.append(name)
+
+        declarations = [declaration(name, element._styles[name]) for name in static]
+        classes.extend(self._intern_all("", [(name, element._styles[name]) for name in static]))
+
+        for pseudo, items in pseudos:
+            classes.extend(self._intern_all(pseudo, items))
+
+        if declarations:
+            self.before += len(f' style="{";".join(declarations)}"')
+
+        if classes := list(dict.fromkeys(classes)):
+            self.added += sum(map(len, classes)) + len(classes) + (0 if element._classes else 8)
+
+        element._classes = (*element._classes, *classes)
+        element._styles = inline or _EMPTY
+        element._invalidate()
+
+    def _is_contested(self, name: str) -> bool:
+        """Whether a stylesheet sets the property, or one related to it, with a selector more
+        specific than one class, so it would win over the property's class"""
+        if (contested := self._checked.get(name)) is None:
+            contested = self._checked[name] = any(
+                _related(name, other) for other in self._contested
+            )
+
+        return contested
+
+    def _intern_all(self, pseudo: str, items: list[tuple[str, Any]]) -> list[str]:
+        """The class names for the declarations, one class for all of them when a shorthand
+        and one of its longhands are among them"""
+        names = [property_name(name) for name, _ in items]
+
+        if any(
+            _related(first, second)
+            for index, first in enumerate(names)
+            for second in names[index + 1 :]
+        ):
+            return [self._intern(pseudo, ";".join(declaration(*item) for item in items))]
+
+        return [self._intern(pseudo, declaration(*item)) for item in items]
+
+    def _intern(self, pseudo: str, body: str) -> str:
+        """The class name for a declaration, giving it the next free name when it's new"""
+        if (name := self.rules.get((pseudo, body))) is None:
+            name = next(name for name in self._names if name not in self._reserved)
+            self.rules[pseudo, body] = name
+
+        return name
+
+
+def _is_reference(value: Any) -> bool:
+    return isinstance(value, Reference)
+
+
+def _related(first: str, second: str) -> bool:
+    """Whether the properties are the same or one is a longhand of the other, i.e. `margin`
+    and `margin-top`"""
+    return first == second or first.startswith(f"{second}-") or second.startswith(f"{first}-")
+
+
+def _descendants(elements: tuple[str | HTMLElement, ...]) -> Iterator[HTMLElement]:
+    """The elements and their descendants, skipping children made by `For` loops as they're
+    only created when rendered"""
+    stack = [element for element in reversed(elements) if isinstance(element, HTMLElement)]
+
+    while stack:
+        element = stack.pop()
+        yield element
+        stack.extend(
+            child for child in reversed(element._children) if isinstance(child, HTMLElement)
+        )
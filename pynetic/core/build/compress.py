@@ -0,0 +1,98 @@
+"""Precompression build stage
+
+Writes a `.br` and `.gz` variant next to every HTML, CSS and JS file in the build folder,
+and a manifest with each file's content hash and the sizes of its variants, so the server
+never has to compress at request time. Files are compressed in parallel over a process pool.
+
+Brotli is optional, install it with the `compression` extra. Without it only `.gz` files are
+written.
+
+Usage:
+    ```Python
+    manifest = compress(BUILD_FOLDER)
+    manifest["index.html"]["hash"]
+    ```
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+from hashlib import blake2b
+from pathlib import Path
+from typing import Any
+
+__all__ = ("COMPRESSIBLE_SUFFIXES", "ENCODINGS", "MANIFEST", "compress", "read_manifest")
+
+COMPRESSIBLE_SUFFIXES = frozenset({".html", ".css", ".js"})
+MANIFEST = "manifest.json"
+
+# `Content-Encoding`: suffix of the precompressed file, in order of preference
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+
+
+def compress(folder: Path, workers: int | None = None) -> dict[str, dict[str, Any]]:
+    """Compresses the compressible files in `folder` and writes its manifest
+
+    Args:
+        folder (Path): The build folder
+        workers (int | None): Number of processes, defaults to the number of CPUs
+
+    Returns:
+        dict[str, dict[str, Any]]:
+            The manifest, mapping each file's path relative to `folder` to its `hash`,
+            `size` and the size of each of its `encodings`
+    """
+    from concurrent.futures import ProcessPoolExecutor  # deferred as the server only reads
+
+    paths = sorted(
+        path
+        for path in folder.rglob("*")
+        if path.suffix in COMPRESSIBLE_SUFFIXES and path.is_file()
+    )
+
+    with ProcessPoolExecutor(workers) as executor:
+        entries = list(executor.map(_compress_file, paths))
+
+    manifest = {path.relative_to(folder).as_posix(): entry for path, entry in zip(paths, entries)}
+    folder.joinpath(MANIFEST).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+    return manifest
+
+
+def read_manifest(folder: Path) -> dict[str, dict[str, Any]]:
+    """The manifest written by `compress`, or an empty one if the folder hasn't been built"""
+    try:
+        return json.loads(folder.joinpath(MANIFEST).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+
+
+def _compress_file(path: Path) -> dict[str, Any]:
+    """Writes the file's compressed variants, returning its manifest entry"""
+    data = path.read_bytes()
+    # `mtime=0` so building the same file twice gives the same bytes
+    variants = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+
+    try:
+        import brotli
+    except ImportError:
+        pass
+    else:
+        variants["br"] = brotli.compress(data, quality=11)
+
+    # Tiny files can come out larger, they're better served as they are
+    variants = {
+        encoding: compressed
+        for encoding, compressed in variants.items()
+        if len(compressed) < len(data)
+    }
+
+    for encoding, compressed in variants.items():
+        path.with_name(path.name + ENCODINGS[encoding]).write_bytes(compressed)
+
+    return {
+        "hash": blake2b(data, digest_size=16).hexdigest(),
+        "size": len(data),
+        "encodings": {encoding: len(compressed) for encoding, compressed in variants.items()},
+    }
@@ -0,0 +1,91 @@
+"""Critical CSS build stage
+
+A browser won't paint a page until the stylesheets linked in its `<head>` have loaded, yet
+most of a stylesheet shared by every route is for other routes. For each route, the rules
+that could match one of its elements, see `usage.Usage`, are inlined in a `<style>` so the
+first paint doesn't wait on the network, and the full stylesheet is loaded without blocking
+rendering.
+
+Usage:
+    ```Python
+    rules = stylesheet_rules(*home.elements)
+    critical = serialize(critical_rules(rules, Usage.of(*home.elements)))
+    html = render_page(home, head=head(critical, "/build/styles.css"))
+    ```
+"""
+
+from __future__ import annotations
+
+from ..css import Rule, Style
+from ..html import HTMLElement
+from .treeshake import at_rule_name, filter_rules, is_keyframes, tree_shake
+from .usage import Usage
+
+__all__ = ("critical_rules", "head", "stylesheet_rules")
+
+# Left to the full stylesheet, which is still loaded
+DEFERRED_AT_RULES = frozenset({"charset", "import"})
+
+
+def stylesheet_rules(*elements: str | HTMLElement) -> tuple[Rule, ...]:
+    """The rules of every `Style` among the elements and their descendants, in document order
+
+    A `Style` used by more than one element is only included once.
+    """
+    styles: dict[int, Style] = {}
+    stack = [element for element in reversed(elements) if isinstance(element, HTMLElement)]
+
+    while stack:
+        element = stack.pop()
+
+        for child in element._children:
+            if isinstance(child, Style):
+                styles.setdefault(id(child), child)
+
+        stack.extend(
+            child for child in reversed(element._children) if isinstance(child, HTMLElement)
+        )
+
+    return tuple(rule for style in styles.values() for rule in style.rules)
+
+
+def critical_rules(rules: tuple[Rule, ...], usage: Usage) -> tuple[Rule, ...]:
+    """The rules a page needs for its first paint, `@keyframes` last
+
+    Style rules are kept when their selector could match one of the page's elements,
+    grouping at-rules (i.e. `@media`) when any of their rules are kept, and `@keyframes`
+    when a kept rule animates with them. `@import` and `@charset` are left to the full
+    stylesheet and other at-rules, such as `@font-face`, are always kept.
+    """
+    kept, _ = tree_shake(rules, usage)
+    first_paint = filter_rules(
+        kept, lambda rule: at_rule_name(rule) not in DEFERRED_AT_RULES and not is_keyframes(rule)
+    )
+
+    return first_paint + tuple(rule for rule in kept if is_keyframes(rule))
+
+
+def head(critical: str, href: str, complete: bool = False) -> str:
+    """The `<head>` markup inlining the critical CSS and loading the full stylesheet
+
+    The full stylesheet is preloaded, then applied once it arrives, so it doesn't block
+    rendering. Without scripts it's linked as usual.
+
+    Args:
+        critical (str): The page's critical CSS
+        href (str): Where the full stylesheet is served
+        complete (bool): Whether the critical CSS is the whole stylesheet, so it isn't loaded
+    """
+    # "</" would end the `<style>` early, escaped it means the same to CSS
+    critical = critical.replace("</", "<\\/")
+    style = f"<style>{critical}</style>" if critical else ""
+
+    if complete:
+        return style
+
+    return (
+        f"{style}"
+        f'<link rel="preload" href="{href}" as="style" '
+        "onload=\"this.onload=null;this.rel='stylesheet'\">"
+        f'<noscript><link rel="stylesheet" href="{href}"></noscript>'
+    )
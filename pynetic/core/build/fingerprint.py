@@ -0,0 +1,90 @@
+"""Content-hashed assets build stage
+
+Stylesheets and scripts are written under a name holding a hash of their content, i.e.
+`styles.3f9a1c2b.css`, so a changed file gets a new URL and an unchanged one keeps its
+URL across builds. Browsers can then cache them forever without revalidating, see
+`server.built_file_response`.
+
+Pages link to assets through the assets manifest, which maps each asset's name to its
+hashed name. Earlier versions of an asset are removed when it's written.
+
+Usage:
+    ```Python
+    assets = Assets(BUILD_FOLDER)
+    href = assets.url(assets.write("styles.css", stylesheet))
+    assets.save()
+    ```
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from hashlib import blake2b
+from pathlib import Path
+
+__all__ = ("ASSETS_MANIFEST", "Assets", "read_assets")
+
+ASSETS_MANIFEST = "assets.json"
+# Hex digits of the content hash in an asset's name
+HASH_LENGTH = 8
+
+
+class Assets:
+    """Writes content-hashed assets to the build folder and keeps their manifest
+
+    Args:
+        folder (Path): The build folder
+    """
+
+    def __init__(self, folder: Path) -> None:
+        self.folder = folder
+        self.names: dict[str, str] = {}
+
+    def write(self, name: str, content: str | bytes) -> str:
+        """Writes the asset under its hashed name, removing its earlier versions
+
+        Args:
+            name (str): The asset's path relative to the build folder, i.e. `styles.css`
+            content (str | bytes): The asset's content, text is encoded as UTF-8
+
+        Returns:
+            str: The hashed name, i.e. `styles.3f9a1c2b.css`
+        """
+        data = content.encode() if isinstance(content, str) else content
+        path = self.folder.joinpath(name)
+        digest = blake2b(data, digest_size=HASH_LENGTH // 2).hexdigest()
+        hashed = path.with_name(f"{path.stem}.{digest}{path.suffix}")
+        earlier = re.compile(
+            rf"{re.escape(path.stem)}\.[0-9a-f]{{{HASH_LENGTH}}}{re.escape(path.suffix)}(\..+)?"
+        )
+
+        hashed.parent.mkdir(parents=True, exist_ok=True)
+
+        # Their compressed variants included
+        for stale in hashed.parent.glob(f"{path.stem}.*"):
+            if stale.name != hashed.name and earlier.fullmatch(stale.name):
+                stale.unlink()
+
+        hashed.write_bytes(data)
+        self.names[name] = hashed.relative_to(self.folder).as_posix()
+
+        return self.names[name]
+
+    def url(self, name: str) -> str:
+        """The URL the asset is served at, by its name or hashed name"""
+        return f"/{self.folder.name}/{self.names.get(name, name)}"
+
+    def save(self) -> None:
+        """Writes the assets manifest to the build folder"""
+        self.folder.joinpath(ASSETS_MANIFEST).write_text(
+            json.dumps(self.names, indent=2), encoding="utf-8"
+        )
+
+
+def read_assets(folder: Path) -> dict[str, str]:
+    """The assets manifest written by `Assets.save`, or an empty one if there isn't one"""
+    try:
+        return json.loads(folder.joinpath(ASSETS_MANIFEST).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
@@ -0,0 +1,352 @@
+"""HTML minifier build stage
+
+Shrinks rendered pages without changing how they're parsed or displayed:
+
+- Runs of whitespace in text collapse to a single space, and whitespace-only text is
+  dropped where it can't be rendered (i.e. between table rows or in the `<head>`).
+  `<pre>`, `<textarea>`, `<script>` and `<style>` are left untouched
+- End tags the HTML spec allows to be omitted are dropped, i.e. `</li>` before another `<li>`
+- Attribute values are only quoted when they need to be
+- Boolean attributes are written in their short form, i.e. `disabled`, when their value is
+  empty or their name, so i.e. `hidden="until-found"` keeps its value
+- Comments are removed, except conditional comments
+
+:ref: https://html.spec.whatwg.org/multipage/syntax.html#optional-tags
+"""
+
+from __future__ import annotations
+
+import re
+from html import escape
+from html.parser import HTMLParser
+
+__all__ = ("minify",)
+
+VOID_ELEMENTS = frozenset(
+    {
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "link",
+        "meta",
+        "source",
+        "track",
+        "wbr",
+    }
+)
+
+# Elements whose text is written out exactly as it was
+RAW_TEXT_ELEMENTS = frozenset({"script", "style"})
+WHITESPACE_PRESERVING_ELEMENTS = frozenset({"pre", "textarea", "script", "style"})
+
+# Elements in which whitespace-only text is never rendered
+NO_TEXT_ELEMENTS = frozenset(
+    {
+        "colgroup",
+        "datalist",
+        "dl",
+        "head",
+        "html",
+        "ol",
+        "optgroup",
+        "select",
+        "table",
+        "tbody",
+        "tfoot",
+        "thead",
+        "tr",
+        "ul",
+    }
+)
+
+BOOLEAN_ATTRIBUTES = frozenset(
+    {
+        "allowfullscreen",
+        "async",
+        "autofocus",
+        "autoplay",
+        "checked",
+        "controls",
+        "default",
+        "defer",
+        "disabled",
+        "formnovalidate",
+        "hidden",
+        "inert",
+        "ismap",
+        "itemscope",
+        "loop",
+        "multiple",
+        "muted",
+        "nomodule",
+        "novalidate",
+        "open",
+        "playsinline",
+        "readonly",
+        "required",
+        "reversed",
+        "selected",
+    }
+)
+
+# Elements that close an open `<p>`, so `</p>` can be omitted before them
+CLOSES_PARAGRAPH = frozenset(
+    {
+        "address",
+        "article",
+        "aside",
+        "blockquote",
+        "details",
+        "div",
+        "dl",
+        "fieldset",
+        "figcaption",
+        "figure",
+        "footer",
+        "form",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "header",
+        "hgroup",
+        "hr",
+        "main",
+        "menu",
+        "nav",
+        "ol",
+        "p",
+        "pre",
+        "section",
+        "table",
+        "ul",
+    }
+)
+
+# Parents in which `</p>` has to be kept when it's the last child
+KEEPS_LAST_PARAGRAPH_END = frozenset({"a", "audio", "del", "ins", "map", "noscript", "video"})
+
+# Tag: (next siblings allowing the end tag to be dropped, whether it can be dropped as the
+# last child of its parent)
+OPTIONAL_END_TAGS: dict[str, tuple[frozenset[str], bool]] = {
+    "li": (frozenset({"li"}), True),
+    "dt": (frozenset({"dt", "dd"}), False),
+    "dd": (frozenset({"dt", "dd"}), True),
+    "rt": (frozenset({"rt", "rp"}), True),
+    "rp": (frozenset({"rt", "rp"}), True),
+    "optgroup": (frozenset({"optgroup"}), True),
+    "option": (frozenset({"option", "optgroup"}), True),
+    "thead": (frozenset({"tbody", "tfoot"}), False),
+    "tbody": (frozenset({"tbody", "tfoot"}), True),
+    "tfoot": (frozenset(), True),
+    "tr": (frozenset({"tr"}), True),
+    "td": (frozenset({"td", "th"}), True),
+    "th": (frozenset({"td", "th"}), True),
+}
+
+WHITESPACE = re.compile(r"[ \t\n\f\r]+")
+NEEDS_QUOTES = re.compile(r"[ \t\n\f\r\"'=<>`]")
+
+
+class _Element:
+    __slots__ = ("tag", "attributes", "children", "self_closing")
+
+    def __init__(
+        self, tag: str, attributes: list[tuple[str, str | None]], self_closing: bool = False
+    ) -> None:
+        self.tag = tag
+        self.attributes = attributes
+        self.children: list[_Element | _Text | str] = []
+        # Written as `<tag/>`, which only closes foreign elements, i.e. SVG's `<path/>`
+        self.self_closing = self_closing
+
+
+class _Text(str):
+    """Text to escape when written, as opposed to declarations and comments"""
+
+
+class _TreeBuilder(HTMLParser):
+    """Parses HTML into a tree of `_Element`s, text and raw markup"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.root = _Element("", [])
+        self.stack = [self.root]
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        element = _Element(tag, attrs)
+        self.stack[-1].children.append(element)
+
+        if tag not in VOID_ELEMENTS:
+            self.stack.append(element)
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self.stack[-1].children.append(_Element(tag, attrs, self_closing=True))
+
+    def handle_endtag(self, tag: str) -> None:
+        for depth in reversed(range(1, len(self.stack))):
+            if self.stack[depth].tag == tag:
+                del self.stack[depth:]
+                return
+
+    def handle_data(self, data: str) -> None:
+        children = self.stack[-1].children
+
+        if self.stack[-1].tag in RAW_TEXT_ELEMENTS:
+            children.append(data)
+        elif children and isinstance(children[-1], _Text):
+            # i.e. text either side of a removed comment
+            children[-1] = _Text(children[-1] + data)
+        else:
+            children.append(_Text(data))
+
+    def handle_decl(self, decl: str) -> None:
+        self.stack[-1].children.append(f"<!{decl}>")
+
+    def handle_comment(self, data: str) -> None:
+        if data.startswith("[if") or data.startswith("<![endif]"):
+            self.stack[-1].children.append(f"<!--{data}-->")
+
+
+def minify(html: str) -> str:
+    """Minifies an HTML document or fragment
+
+    Args:
+        html (str): The HTML to minify
+
+    Returns:
+        str: The minified HTML
+    """
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+
+    chunks: list[str] = []
+    # Items are elements to write with their parent and next sibling, or strings to write
+    stack: list[tuple[_Element | _Text | str, _Element, object, bool] | str] = [
+        *_children(builder.root, preserve=False)
+    ]
+
+    while stack:
+        item = stack.pop()
+
+        if isinstance(item, str):
+            chunks.append(item)
+            continue
+
+        node, parent, next_sibling, preserve = item
+
+        if isinstance(node, _Text):
+            chunks.append(escape(node if preserve else WHITESPACE.sub(" ", node), quote=False))
+            continue
+
+        if isinstance(node, str):
+            chunks.append(node)
+            continue
+
+        chunks.append(_start_tag(node))
+
+        if node.tag in VOID_ELEMENTS or node.self_closing:
+            continue
+
+        if not _end_tag_optional(node, parent, next_sibling):
+            stack.append(f"</{node.tag}>")
+
+        stack.extend(
+            _children(node, preserve=preserve or node.tag in WHITESPACE_PRESERVING_ELEMENTS)
+        )
+
+    return "".join(chunks)
+
+
+def _children(parent: _Element, preserve: bool) -> list[tuple]:
+    """The children to write for `parent`, reversed for the stack in `minify`
+
+    Whitespace-only text is dropped where it isn't rendered, and otherwise collapsed.
+    """
+    drop_whitespace = not preserve and (
+        parent.tag in NO_TEXT_ELEMENTS
+        # Whitespace around the doctype and `<html>` of a whole document isn't rendered
+        or (parent.tag == "" and any(_is_document_node(child) for child in parent.children))
+    )
+    children = [
+        child
+        for child in parent.children
+        if not drop_whitespace or not isinstance(child, _Text) or child.strip(" \t\n\f\r")
+    ]
+
+    return [
+        (child, parent, children[index + 1] if index + 1 < len(children) else None, preserve)
+        for index, child in reversed(list(enumerate(children)))
+    ]
+
+
+def _is_document_node(node: object) -> bool:
+    return (isinstance(node, _Element) and node.tag == "html") or (
+        isinstance(node, str) and not isinstance(node, _Text) and node.startswith("<!")
+    )
+
+
+def _end_tag_optional(element: _Element, parent: _Element, next_sibling: object) -> bool:
+    """Whether the spec allows the element's end tag to be left out"""
+    next_tag = next_sibling.tag if isinstance(next_sibling, _Element) else None
+    is_last = next_sibling is None
+
+    if element.tag in ("html", "body"):
+        return not (isinstance(next_sibling, str) and next_sibling.startswith("<!--"))
+
+    if element.tag in ("head", "colgroup"):
+        return next_sibling is None or next_tag is not None
+
+    if element.tag == "p":
+        return next_tag in CLOSES_PARAGRAPH or (
+            is_last
+            and parent.tag != ""
+            and parent.tag not in KEEPS_LAST_PARAGRAPH_END
+            # Nor in custom elements
+            and "-" not in parent.tag
+        )
+
+    if element.tag in OPTIONAL_END_TAGS:
+        next_tags, optional_when_last = OPTIONAL_END_TAGS[element.tag]
+        return next_tag in next_tags or (is_last and optional_when_last and parent.tag != "")
+
+    return False
+
+
+def _start_tag(element: _Element) -> str:
+    attributes = []
+
+    for name, value in element.attributes:
+        if value is None or (name in BOOLEAN_ATTRIBUTES and value.lower() in ("", name)):
+            attributes.append(f" {name}")
+        else:
+            attributes.append(f" {name}={_quote(value)}")
+
+    if not element.self_closing or element.tag in VOID_ELEMENTS:
+        return f"<{element.tag}{''.join(attributes)}>"
+
+    # An unquoted value would take the slash in
+    unquoted = attributes and "=" in attributes[-1] and attributes[-1][-1] not in "\"'"
+
+    return f"<{element.tag}{''.join(attributes)}{' ' if unquoted else ''}/>"
+
+
+def _quote(value: str) -> str:
+    """The attribute value with the fewest quotes it can be written with"""
+    value = value.replace("&", "&amp;")
+
+    if value and not NEEDS_QUOTES.search(value):
+        return value
+
+    if '"' in value and "'" not in value:
+        return f"'{value}'"
+
+    return '"' + value.replace('"', "&quot;") + '"'
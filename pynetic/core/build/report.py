@@ -0,0 +1,82 @@
+"""Build report
+
+Records the size of each route or file before and after each build stage, and what stages
+that remove things, such as tree-shaking, removed.
+
+Usage:
+    ```Python
+    report = BuildReport()
+    report.add("minify", "index", 2048, 1536)
+    report.remove("tree-shake", [".unused", ".legacy"])
+    print(report)
+    ```
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+__all__ = ("BuildReport", "Entry")
+
+# Items removed by a stage listed when printed, the rest are counted
+REMOVED_SHOWN = 20
+
+
+class Entry(NamedTuple):
+    """The sizes, in bytes, of a route before and after a build stage"""
+
+    stage: str
+    name: str
+    before: int
+    after: int
+
+    @property
+    def saved(self) -> int:
+        return self.before - self.after
+
+
+class BuildReport:
+    """The sizes recorded by each build stage, printable as a table"""
+
+    def __init__(self) -> None:
+        self.entries: list[Entry] = []
+        self.removed: dict[str, list[str]] = {}
+
+    def add(self, stage: str, name: str, before: int, after: int) -> None:
+        self.entries.append(Entry(stage, name, before, after))
+
+    def remove(self, stage: str, removed: list[str]) -> None:
+        """Records what a stage removed, i.e. the selectors of unused CSS rules"""
+        self.removed.setdefault(stage, []).extend(removed)
+
+    def __str__(self) -> str:
+        rows = [("stage", "name", "before", "after", "saved")]
+        rows.extend(
+            (
+                entry.stage,
+                entry.name,
+                f"{entry.before:,}",
+                f"{entry.after:,}",
+                f"{entry.saved:,} ({entry.saved / entry.before:.1%})" if entry.before else "0",
+            )
+            for entry in self.entries
+        )
+        widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+
+        lines = [
+            "  ".join(
+                cell.ljust(width) if column < 2 else cell.rjust(width)
+                for column, (cell, width) in enumerate(zip(row, widths))
+            ).rstrip()
+            for row in rows
+        ]
+
+        for stage, removed in self.removed.items():
+            if removed:
+                lines.append(f"\n{stage} removed {len(removed):,}:")
+                lines.extend(f"  {item}" for item in removed[:REMOVED_SHOWN])
+
+            if len(removed) > REMOVED_SHOWN:
+                lines.append(f"  ... and {len(removed) - REMOVED_SHOWN:,} more")
+
+        return "\n".join(lines)
@@ -0,0 +1,144 @@
+"""CSS tree-shaking build stage
+
+Frameworks brought in through `style()` ship every rule they have, while a site uses a
+small fraction of them. Rules whose selectors can't match any element on any route, see
+`usage.Usage`, are removed, as are grouping at-rules (i.e. `@media`) left empty and
+`@keyframes` neither a remaining rule nor an inline style animates with. When an animation
+is held in a `Reference` every `@keyframes` is kept, as it can't be known which is used.
+
+Elements that only exist once the page is interactive, i.e. made by a `For` loop over a
+list that's empty when the site is built, can't be seen by the build. Classes they use
+should be safelisted, as should the names of the `@keyframes` they animate with.
+
+Usage:
+    ```Python
+    usage = Usage.of(*home.elements) | Usage.of(*about.elements)
+    rules, removed = tree_shake(rules, usage, safelist={"toast"})
+    ```
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+
+from ..css import Rule
+from .usage import ANIMATION_PROPERTIES, Usage
+
+__all__ = ("tree_shake",)
+
+# At-rules holding rules that apply when a condition is met, i.e. `@media`
+GROUPING_AT_RULES = frozenset(
+    {
+        "-moz-document",
+        "container",
+        "document",
+        "layer",
+        "media",
+        "scope",
+        "starting-style",
+        "supports",
+    }
+)
+KEYFRAMES_AT_RULES = frozenset({"keyframes", "-webkit-keyframes"})
+
+
+def tree_shake(
+    rules: tuple[Rule, ...], usage: Usage, safelist: Iterable[str] = ()
+) -> tuple[tuple[Rule, ...], list[str]]:
+    """Removes the rules that can't match any element
+
+    Args:
+        rules (tuple[Rule, ...]): The stylesheet's rules
+        usage (Usage): What every page uses
+        safelist (Iterable[str]):
+            Classes to keep the rules of, and `@keyframes` names to keep, even if no page
+            uses them
+
+    Returns:
+        tuple[tuple[Rule, ...], list[str]]:
+            The rules left, and the selectors (or at-rule preludes) of those removed
+    """
+    if safelist:
+        usage = usage | Usage(classes=frozenset(safelist), animations=frozenset(safelist))
+
+    removed: list[str] = []
+    kept = _select(rules, usage, removed)
+
+    if usage.dynamic_animations:
+        return kept, removed
+
+    animations = set(_animation_names(kept)) | usage.animations
+
+    def used_keyframes(rule: Rule) -> bool:
+        if is_keyframes(rule) and keyframes_name(rule) not in animations:
+            removed.append(rule.selector)
+            return False
+
+        return True
+
+    return filter_rules(kept, used_keyframes), removed
+
+
+def at_rule_name(rule: Rule) -> str:
+    """The at-rule's lowercased name without the `@`, or an empty string for style rules"""
+    if not rule.selector.startswith("@") or not rule.selector[1:].strip():
+        return ""
+
+    return rule.selector[1:].split(None, 1)[0].split("{", 1)[0].rstrip(";").lower()
+
+
+def is_keyframes(rule: Rule) -> bool:
+    return at_rule_name(rule) in KEYFRAMES_AT_RULES
+
+
+def keyframes_name(rule: Rule) -> str:
+    parts = rule.selector.split(None, 2)
+    return parts[1].split("{", 1)[0] if len(parts) > 1 else ""
+
+
+def filter_rules(rules: tuple[Rule, ...], keep: Callable[[Rule], bool]) -> tuple[Rule, ...]:
+    """The rules `keep` returns true for, looking inside grouping at-rules"""
+    return tuple(
+        rule._replace(rules=filter_rules(rule.rules, keep))
+        if rule.rules is not None and at_rule_name(rule) in GROUPING_AT_RULES
+        else rule
+        for rule in rules
+        if keep(rule)
+    )
+
+
+def _select(rules: tuple[Rule, ...], usage: Usage, removed: list[str]) -> tuple[Rule, ...]:
+    """The style rules that could match, within grouping at-rules too, and other at-rules"""
+    kept: list[Rule] = []
+
+    for rule in rules:
+        name = at_rule_name(rule)
+
+        if not name:
+            if usage.matches(rule.selector):
+                kept.append(rule)
+            else:
+                removed.append(rule.selector)
+
+        elif name in GROUPING_AT_RULES and rule.rules is not None:
+            if nested := _select(rule.rules, usage, removed):
+                kept.append(rule._replace(rules=nested))
+            elif rule.rules:
+                removed.append(rule.selector)
+            else:
+                kept.append(rule)
+
+        else:
+            kept.append(rule)
+
+    return tuple(kept)
+
+
+def _animation_names(rules: tuple[Rule, ...]) -> Iterator[str]:
+    for rule in rules:
+        for name, value in rule.declarations:
+            if name.lower() in ANIMATION_PROPERTIES:
+                yield from value.replace(",", " ").split()
+
+        if not is_keyframes(rule):
+            yield from _animation_names(rule.rules or ())
@@ -0,0 +1,284 @@
+"""Selector usage
+
+Works out which tags, classes, ids and attributes a page uses, and whether a CSS selector
+could match any of its elements. A selector is treated as possibly matching when every tag,
+class, id and attribute named in one of its compound selectors is used somewhere on the
+page, ignoring combinators and pseudo-classes, so a rule is never wrongly found unused.
+
+Animation names set in inline styles are collected too, so `@keyframes` only they use are
+kept. Names held in a `Reference` can change once the page is built, so any use of one is
+flagged instead.
+
+Usage:
+    ```Python
+    usage = Usage.of(*home.elements)
+    usage.matches(".card > a:hover")
+    ```
+"""
+
+from __future__ import annotations
+
+import re
+from functools import cache
+from typing import NamedTuple
+
+from ..diff import VNode, snapshot
+from ..html import HTMLElement
+from ..reference import Reference
+
+__all__ = ("ANIMATION_PROPERTIES", "Usage", "animation_names", "selector_classes", "specificity")
+
+# Elements every document has, whether or not the page's elements include them
+DOCUMENT_TAGS = frozenset({"html", "head", "body"})
+# Properties naming `@keyframes`, vendor prefixed ones included
+ANIMATION_PROPERTIES = frozenset(
+    f"{prefix}{name}"
+    for prefix in ("", "-webkit-", "-moz-", "-o-")
+    for name in ("animation", "animation-name")
+)
+
+_ESCAPE = re.compile(r"\\([0-9a-fA-F]{1,6}[ \t\n\f\r]?|.)", re.DOTALL)
+_ATTRIBUTE = re.compile(r"\[\s*([^\s~|^$*=\]]+)[^\]]*\]")
+_PSEUDO = re.compile(r"(?<!\\)::?(?:\\.|[-\w])+")
+_NAME = re.compile(r"([.#]?)((?:\\[0-9a-fA-F]{1,6}[ \t\n\f\r]?|\\.|[-\w\u00a0-\U0010ffff])+)")
+
+
+class Usage(NamedTuple):
+    """The tags, classes, ids and attribute names used by a page
+
+    Along with the animation names in its inline styles, and whether any are held in a
+    `Reference`, in which case every `@keyframes` could be used.
+    """
+
+    tags: frozenset[str] = DOCUMENT_TAGS
+    classes: frozenset[str] = frozenset()
+    ids: frozenset[str] = frozenset()
+    attributes: frozenset[str] = frozenset()
+    animations: frozenset[str] = frozenset()
+    dynamic_animations: bool = False
+
+    @classmethod
+    def of(cls, *elements: str | HTMLElement) -> Usage:
+        """Collects the usage of the elements as they render now, `For` loops included"""
+        tags, classes, ids, attributes, animations = set(DOCUMENT_TAGS), set(), set(), set(), set()
+        stack: list[VNode | str] = list(snapshot(*elements))
+
+        while stack:
+            node = stack.pop()
+
+            if isinstance(node, str):
+                continue
+
+            tags.add(node.tag)
+            attributes.update(node.attributes)
+            classes.update(node.attributes.get("class", "").split())
+
+            if "id" in node.attributes:
+                ids.add(node.attributes["id"])
+
+            if "style" in node.attributes:
+                animations.update(animation_names(node.attributes["style"]))
+
+            stack.extend(node.children)
+
+        return cls(
+            frozenset(tags),
+            frozenset(classes),
+            frozenset(ids),
+            frozenset(attributes),
+            frozenset(animations),
+            _dynamic_animations(elements),
+        )
+
+    def __or__(self, other: Usage) -> Usage:  # type: ignore[override]
+        """The usage of both pages combined"""
+        return Usage(*(mine | theirs for mine, theirs in zip(self, other)))
+
+    def matches(self, selector: str) -> bool:
+        """Whether any selector in the selector list could match an element on the page"""
+        return any(
+            tags <= self.tags
+            and classes <= self.classes
+            and ids <= self.ids
+            and attributes <= self.attributes
+            for tags, classes, ids, attributes in _requirements(selector)
+        )
+
+
+def animation_names(style: str) -> set[str]:
+    """The words in the animation properties of a `style` attribute, a superset of the
+    animation names in it"""
+    names: set[str] = set()
+
+    for item in style.split(";"):
+        name, _, value = item.partition(":")
+
+        if name.strip().lower() in ANIMATION_PROPERTIES:
+            names.update(value.replace(",", " ").split())
+
+    return names
+
+
+def _dynamic_animations(elements: tuple[str | HTMLElement, ...]) -> bool:
+    """Whether any of the elements, or their descendants, hold an animation in a `Reference`"""
+    stack = [element for element in elements if isinstance(element, HTMLElement)]
+
+    while stack:
+        element = stack.pop()
+
+        if element._static:
+            continue
+
+        if any(
+            isinstance(value, Reference) and name.replace("_", "-") in ANIMATION_PROPERTIES
+            for name, value in element._styles.items()
+        ):
+            return True
+
+        stack.extend(child for child in element._children if isinstance(child, HTMLElement))
+
+    return False
+
+
+@cache
+def selector_classes(selector_list: str) -> frozenset[str]:
+    """Every class named in the selector list, those in functional pseudo-classes included"""
+    return frozenset(
+        _unescape(name)
+        for prefix, name in _NAME.findall(_ATTRIBUTE.sub(" ", selector_list))
+        if prefix == "."
+    )
+
+
+@cache
+def specificity(selector_list: str) -> tuple[int, int, int]:
+    """The highest specificity of the selectors in the list, as `(ids, classes, tags)`
+
+    Selectors in functional pseudo-classes are counted as well, which can only overestimate.
+    """
+    highest = (0, 0, 0)
+
+    for selector in _split(selector_list):
+        attributes = len(_ATTRIBUTE.findall(selector))
+        selector = _ATTRIBUTE.sub(" ", selector)
+        pseudos = _PSEUDO.findall(selector)
+        elements = sum(pseudo.startswith("::") for pseudo in pseudos)
+        ids = classes = tags = 0
+
+        for prefix, name in _NAME.findall(_PSEUDO.sub(" ", selector)):
+            if prefix == "#":
+                ids += 1
+            elif prefix == ".":
+                classes += 1
+            elif not name[0].isdigit() and name[0] != "-":
+                tags += 1
+
+        highest = max(
+            highest, (ids, classes + attributes + len(pseudos) - elements, tags + elements)
+        )
+
+    return highest
+
+
+@cache
+def _requirements(
+    selector_list: str,
+) -> tuple[tuple[frozenset[str], frozenset[str], frozenset[str], frozenset[str]], ...]:
+    """The tags, classes, ids and attributes each selector in the list needs to match
+
+    Cached as the same selectors are checked against every page.
+    """
+    requirements = []
+
+    for selector in _split(selector_list):
+        selector = _strip_functions(selector)
+        attributes = frozenset(name.lower() for name in _ATTRIBUTE.findall(selector))
+        selector = _PSEUDO.sub(" ", _ATTRIBUTE.sub(" ", selector))
+        tags, classes, ids = set(), set(), set()
+
+        for prefix, name in _NAME.findall(selector):
+            name = _unescape(name)
+
+            if prefix == ".":
+                classes.add(name)
+            elif prefix == "#":
+                ids.add(name)
+            elif not name[0].isdigit() and name[0] != "-":
+                tags.add(name.lower())
+
+        requirements.append((frozenset(tags), frozenset(classes), frozenset(ids), attributes))
+
+    return tuple(requirements)
+
+
+def _split(selector_list: str) -> list[str]:
+    """Splits a selector list on the commas that aren't in parentheses, brackets or strings"""
+    selectors: list[str] = []
+    depth = 0
+    quote = ""
+    start = 0
+    index = 0
+
+    while index < len(selector_list):
+        char = selector_list[index]
+
+        if char == "\\":
+            index += 2
+            continue
+
+        if quote:
+            quote = "" if char == quote else quote
+        elif char in "\"'":
+            quote = char
+        elif char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            selectors.append(selector_list[start:index])
+            start = index + 1
+
+        index += 1
+
+    selectors.append(selector_list[start:])
+    return selectors
+
+
+def _strip_functions(selector: str) -> str:
+    """Removes functional pseudo-classes along with their arguments, i.e. `:not(.a)`
+
+    Their arguments don't have to be used for the selector to match.
+    """
+    while (match := re.search(r"(?<!\\)::?[-\w]+\(", selector)) is not None:
+        depth = 0
+
+        for end in range(match.end() - 1, len(selector)):
+            if selector[end] == "(":
+                depth += 1
+            elif selector[end] == ")":
+                depth -= 1
+
+                if depth == 0:
+                    break
+
+        selector = f"{selector[:match.start()]} {selector[end + 1:]}"
+
+    return selector
+
+
+def _unescape(name: str) -> str:
+    """Resolves CSS escapes in an identifier, i.e. `sm\\:flex` is `sm:flex`"""
+    if "\\" not in name:
+        return name
+
+    return _ESCAPE.sub(_unescape_match, name)
+
+
+def _unescape_match(match: re.Match[str]) -> str:
+    escaped = match.group(1)
+
+    if escaped[0] in "0123456789abcdefABCDEF":
+        # A code point in hex, zero isn't allowed and is replaced
+        return chr(int(escaped.rstrip(), 16) or 0xFFFD)
+
+    return escaped
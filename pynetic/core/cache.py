@@ -0,0 +1,126 @@
+"""pynetic parse cache
+
+Parsing large inputs, such as vendor stylesheets, is slow and the same inputs are parsed
+again on every dev server reload and build. `ParseCache` keeps parsed results keyed by a
+hash of the input in two tiers: an in-memory LRU and pickles in a folder on disk, so the
+results survive restarts.
+
+Files are additionally keyed by path, modification time and size, so an unchanged file is
+neither read nor hashed again within the same process.
+
+Usage:
+    ```Python
+    cache = ParseCache(parse, CACHE_FOLDER.joinpath("css"))
+    rules = cache.parse_file(Path("vendor/tailwind.css"))
+    ```
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+from collections import OrderedDict
+from collections.abc import Callable
+from hashlib import blake2b
+from os import PathLike
+from pathlib import Path
+from typing import Generic, TypeVar
+
+__all__ = ("ParseCache",)
+
+T = TypeVar("T")
+
+
+class ParseCache(Generic[T]):
+    """Caches the results of a parse function by the hash of the text it's given
+
+    Args:
+        parse (Callable[[str], T]): Parses text, its results must be picklable
+        folder (Path | None): Where to keep the on-disk tier, or `None` for memory only
+        maxsize (int): Number of results kept in memory
+        version (str):
+            Part of every key, change it when `parse` starts returning something different
+            so stale results on disk are ignored
+    """
+
+    def __init__(
+        self,
+        parse: Callable[[str], T],
+        folder: Path | None = None,
+        maxsize: int = 128,
+        version: str = "",
+    ) -> None:
+        self.parse = parse
+        self.folder = folder
+        self.maxsize = maxsize
+        self.version = version
+        self._memory: OrderedDict[str, T] = OrderedDict()
+        self._files: dict[Path, tuple[int, int, str]] = {}
+
+    def parse_text(self, text: str) -> T:
+        """Parses the text, or returns the cached result for the same text"""
+        return self._get(self._key(text), lambda: text)
+
+    def parse_file(self, path: PathLike) -> T:
+        """Parses the file's text, skipping reading it when it hasn't been modified"""
+        path = Path(path).absolute()
+        stat = path.stat()
+        known = self._files.get(path)
+
+        if known is not None and known[:2] == (stat.st_mtime_ns, stat.st_size):
+            return self._get(known[2], lambda: path.read_text(encoding="utf-8"))  # type: ignore
+
+        text = path.read_text(encoding="utf-8")
+        key = self._key(text)
+        self._files[path] = (stat.st_mtime_ns, stat.st_size, key)
+
+        return self._get(key, lambda: text)
+
+    def clear(self) -> None:
+        """Clears the in-memory tier, leaving the on-disk tier as it is"""
+        self._memory.clear()
+        self._files.clear()
+
+    def _key(self, text: str) -> str:
+        return blake2b(f"{self.version}\0{text}".encode(), digest_size=16).hexdigest()
+
+    def _get(self, key: str, read: Callable[[], str]) -> T:
+        """The result for the key from the first tier holding it, otherwise parses `read()`"""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+
+        result = self._load(key)
+
+        if result is None:
+            result = self.parse(read())
+            self._store(key, result)
+
+        self._memory[key] = result
+
+        if len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+        return result
+
+    def _load(self, key: str) -> T | None:
+        if self.folder is None:
+            return None
+
+        try:
+            data = self.folder.joinpath(f"{key}.pickle").read_bytes()
+            return pickle.loads(data)  # nosec: the project's own cache, written by `_store`
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # Missing, or written by a version of pynetic that no longer matches
+            return None
+
+    def _store(self, key: str, result: T) -> None:
+        if self.folder is None:
+            return
+
+        self.folder.mkdir(parents=True, exist_ok=True)
+        path = self.folder.joinpath(f"{key}.pickle")
+        # Written to a temporary file first so another process never reads half a pickle
+        temporary = path.with_name(f"{path.name}.{os.getpid()}")
+        temporary.write_bytes(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+        os.replace(temporary, path)
@@ -1,8 +1,9 @@
 """PyNetic Component Module"""
 
-from collections.abc import Iterable
+from collections.abc import AsyncGenerator, Generator, Iterable
 
-from .html import HTMLElement
+from . import application
+from .html import STREAM_CHUNK_SIZE, HTMLElement, astream, stream
 
 
 class Component:
@@ -23,9 +24,30 @@ class Component:
 
     def __init__(self, *elements: str | HTMLElement) -> None:
         self.elements = list(elements)
+        # So the elements reading references are updated when they change
+        application.Application.graph.track(*elements)
+
+    def _content_hashes(self) -> tuple[int | str, ...]:
+        return tuple(
+            element.content_hash if isinstance(element, HTMLElement) else element
+            for element in self.elements
+        )
 
     def __hash__(self) -> int:
-        return hash(self.__repr__())
+        """Combines the content hashes of the elements, so identical components hash equally"""
+        return hash(self._content_hashes())
+
+    def __eq__(self, other: object) -> bool:
+        # The content hashes themselves, a collision of the combined hash isn't equality
+        return isinstance(other, Component) and self._content_hashes() == other._content_hashes()
+
+    def stream(self, chunk_size: int = STREAM_CHUNK_SIZE) -> Generator[bytes, None, None]:
+        """Renders the component's elements as HTML chunks, see `html.stream`"""
+        return stream(*self.elements, chunk_size=chunk_size)
+
+    def astream(self, chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncGenerator[bytes, None]:
+        """Renders the component's elements as HTML chunks asynchronously, see `html.astream`"""
+        return astream(*self.elements, chunk_size=chunk_size)
 
     def __build(self) -> ...:
         # TODO: Figure out what this is going to return. AST/CST tree or just plain text?
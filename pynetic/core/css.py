@@ -1,21 +1,65 @@
 """pynetic css builtins
 
-This is just the listing from the mozilla docs for right now.
+The registry of property, pseudo-class, pseudo-element, at-rule, function, data type and
+unit names at the bottom of the module is the listing from the mozilla docs, indexed as
+frozensets so names are checked in constant time.
+
+Styles given to `HTMLElement.style` are checked against it only in strict mode, see
+`STRICT`, which is meant for development. Otherwise they aren't checked at all, so
+production pays nothing for it.
 
 :ref: https://developer.mozilla.org/en-US/docs/Web/CSS/Reference
 """
 
 from __future__ import annotations
 
-from functools import partial
+import logging
+import re
+from colorsys import hls_to_rgb
+from difflib import get_close_matches
+from functools import cache, lru_cache, partial
 from os import PathLike
-from typing import Any, overload
+from typing import Any, NamedTuple, overload
+
+from .cache import ParseCache
+
+# Strings and URLs are single tokens, so nothing inside them is shortened
+_VALUE_TOKEN = re.compile(
+    r"""(?P<string>"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')"""
+    r"|(?P<url>url\([^)]*\))"
+    r"|(?P<function>(?:rgb|hsl)a?)\((?P<arguments>[^()]*)\)"
+    r"|(?P<hex>#[0-9a-fA-F]+)(?![-\w])"
+    r"|(?<![-\w.#\\])(?P<number>-?(?:\d*\.\d+|\d+))(?P<unit>[a-zA-Z]+|%)?(?![-\w.])"
+    r"|(?P<word>[-\w]+)",
+    re.IGNORECASE,
+)
+_MATH_FUNCTION = re.compile(r"\b(?:calc|min|max|clamp)\(", re.IGNORECASE)
+
+# Whether `HTMLElement.style` checks names against the registry, see `validate_styles`.
+# Enabled by the development server, off otherwise so styling costs nothing extra
+STRICT = False
+
+
+def number(value: int | float) -> str:
+    """The shortest form of a number, i.e. `.5` for `0.50` and `2` for `2.0`
+
+    Floats are rounded to 4 decimal places, finer than any browser lays out.
+    """
+    text = f"{value:.4f}".rstrip("0").rstrip(".") if isinstance(value, float) else str(value)
+
+    if text in ("-0", ""):
+        return "0"
+
+    if text.startswith(("0.", "-0.")):
+        return text.replace("0.", ".", 1)
 
-from cssutils import css
+    return text
 
 
-def add_suffix(suffix: str | int | float, prefix: str):
-    return f"{prefix}{suffix}"
+def add_suffix(value: int | float, suffix: str) -> str:
+    """A number with a unit in its shortest form, dropping the unit of a zero length"""
+    text = number(value)
+    return text if text == "0" and suffix in LENGTH_UNITS else f"{text}{suffix}"
 
 
 px = partial(add_suffix, suffix="px")
@@ -25,7 +69,7 @@ vw = partial(add_suffix, suffix="vw")
 vh = partial(add_suffix, suffix="vh")
 cm = partial(add_suffix, suffix="cm")
 mm = partial(add_suffix, suffix="mm")
-ex = partial(add_suffix, suffix="VW")
+ex = partial(add_suffix, suffix="ex")
 ch = partial(add_suffix, suffix="ch")
 em = partial(add_suffix, suffix="em")
 rem = partial(add_suffix, suffix="rem")
@@ -34,720 +78,1513 @@ vmax = partial(add_suffix, suffix="vmax")
 percent = partial(add_suffix, suffix="%")
 
 
+@cache
+def rgb(red: int, green: int, blue: int, alpha: float = 1) -> str:
+    """The shortest form of a color, a keyword or hex, i.e. `red` or `#fff`
+
+    Args:
+        red (int): 0 to 255
+        green (int): 0 to 255
+        blue (int): 0 to 255
+        alpha (float): 0 to 1
+    """
+    channels = [red, green, blue] + ([round(alpha * 255)] if alpha < 1 else [])
+    hex_color = "#" + "".join(f"{min(max(round(channel), 0), 255):02x}" for channel in channels)
+
+    keyword = _COLOR_KEYWORDS.get(hex_color, "")
+
+    if all(hex_color[index] == hex_color[index + 1] for index in range(1, len(hex_color), 2)):
+        hex_color = "#" + hex_color[1::2]
+
+    return keyword if keyword and len(keyword) < len(hex_color) else hex_color
+
+
+def hsl(hue: float, saturation: float, lightness: float, alpha: float = 1) -> str:
+    """The shortest form of a color, see `rgb`
+
+    Args:
+        hue (float): In degrees
+        saturation (float): 0 to 100
+        lightness (float): 0 to 100
+        alpha (float): 0 to 1
+    """
+    red, green, blue = hls_to_rgb(hue / 360 % 1, lightness / 100, saturation / 100)
+    return rgb(round(red * 255), round(green * 255), round(blue * 255), alpha)
+
+
+@lru_cache(maxsize=4096)
+def normalize(name: str, value: str) -> str:
+    """The shortest equivalent form of a declaration's value
+
+    Numbers are trimmed, zero lengths lose their unit and colors are written as the shortest
+    of their keyword and hex forms, see `rgb`. Strings, URLs and custom properties are kept
+    as they are, and so are zero lengths in math functions, where they'd become numbers,
+    and in `flex`, where they'd become flex factors.
+
+    Args:
+        name (str): The property's kebab-case name
+        value (str): The value
+    """
+    if name.startswith("--") or name == "unicode-range" or "progid:" in value:
+        return value
+
+    keep_zero_units = name == "flex" or bool(_MATH_FUNCTION.search(value))
+    colors = name in COLOR_PROPERTIES or name.endswith("-color")
+
+    def shorten(match: re.Match[str]) -> str:
+        if match["number"] is not None:
+            unit = match["unit"] or ""
+            text = number(float(match["number"]))
+
+            if text == "0" and unit.lower() in LENGTH_UNITS and not keep_zero_units:
+                return text
+
+            return f"{text}{unit}"
+
+        if match["hex"] is not None:
+            return _hex_color(match["hex"])
+
+        if match["function"] is not None:
+            return _function_color(match["function"].lower(), match["arguments"]) or match[0]
+
+        if match["word"] is not None and colors and match["word"].lower() in COLORS:
+            shortest = rgb(*_channels(COLORS[match["word"].lower()]))
+            return shortest if len(shortest) < len(match[0]) else match[0]
+
+        return match[0]
+
+    return _VALUE_TOKEN.sub(shorten, value)
+
+
+def _hex_color(text: str) -> str:
+    if len(text) not in (4, 5, 7, 9):
+        return text
+
+    channels = _channels(text)
+    return rgb(*channels[:3], channels[3] / 255 if len(channels) == 4 else 1)
+
+
+def _channels(hex_color: str) -> list[int]:
+    digits = hex_color[1:]
+
+    if len(digits) in (3, 4):
+        digits = "".join(digit * 2 for digit in digits)
+
+    return [int(digits[index : index + 2], 16) for index in range(0, len(digits), 2)]
+
+
+def _function_color(function: str, arguments: str) -> str:
+    """The shortest form of an `rgb()` or `hsl()` color, or empty when it can't be shortened"""
+    parts = arguments.replace(",", " ").replace("/", " ").split()
+
+    if len(parts) not in (3, 4):
+        return ""
+
+    try:
+        if parts[3:] and parts[3].endswith("%"):
+            alpha = float(parts[3][:-1]) / 100
+        else:
+            alpha = float(parts[3]) if parts[3:] else 1
+
+        if function.startswith("rgb"):
+            return rgb(*(int(part) for part in parts[:3]), alpha=alpha)
+
+        hue, saturation, lightness = parts[:3]
+        return hsl(
+            float(hue.removesuffix("deg")),
+            float(saturation.removesuffix("%")),
+            float(lightness.removesuffix("%")),
+            alpha,
+        )
+    except ValueError:
+        # Percentages in `rgb()`, other angle units, `none` and so on are left as they are
+        return ""
+
+
+def inline_style(styles: dict[str, Any]) -> str:
+    """Serializes a style dict into the body of an inline `style` attribute
+
+    Property names are converted from snake_case to kebab-case. Nested dicts (pseudo-elements
+    such as `"::before"`) can't be expressed inline and are skipped.
+    """
+    return ";".join(
+        declaration(name, value) for name, value in styles.items() if not isinstance(value, dict)
+    )
+
+
+def declaration(name: str, value: Any) -> str:
+    """Serializes a single `property:value` declaration
+
+    The name is converted from snake_case to kebab-case, except for custom properties
+    (`--name`) which are kept as they are, and the value is shortened, see `normalize`.
+    """
+    name = property_name(name)
+    value = getattr(value, "value", value)
+    return f"{name}:{normalize(name, value if isinstance(value, str) else str(value))}"
+
+
+@cache
+def property_name(name: str) -> str:
+    """Converts a snake_case property name to kebab-case, keeping custom properties as they are
+
+    Cached as the same handful of properties are styled over and over.
+    """
+    return name if name.startswith("--") else name.replace("_", "-")
+
+
+def validate_styles(styles: dict[str, Any]) -> None:
+    """Checks the names of `HTMLElement.style` keyword arguments against the registry
+
+    Properties are checked by their kebab-case name, vendor prefixed and custom properties
+    are always accepted. Keys of nested dicts are pseudo selectors, i.e. `"::before"`, or
+    at-rules, i.e. `"@media print"`, of which only the name is checked.
+
+    Args:
+        styles (dict[str, Any]): The keyword arguments given to `HTMLElement.style`
+
+    Raises:
+        ValueError:
+            A property, pseudo selector or at-rule isn't known, suggesting the closest property
+    """
+    for name, value in styles.items():
+        if isinstance(value, dict):
+            if name.startswith("@"):
+                _validate_at_rule(name)
+            else:
+                _validate_pseudo(name)
+
+            validate_styles(value)
+        else:
+            _validate_property(name)
+
+
+@cache
+def _validate_property(name: str) -> None:
+    kebab = property_name(name)
+
+    if kebab.startswith("-") or kebab in PROPERTIES:
+        return
+
+    matches = get_close_matches(kebab, PROPERTIES, n=1)
+    suggestion = f", did you mean {matches[0].replace('-', '_')!r}?" if matches else ""
+    raise ValueError(f"Unknown CSS property {name!r}{suggestion}")
+
+
+@cache
+def _validate_at_rule(prelude: str) -> None:
+    name = prelude[1:].split(None, 1)[0].lower() if prelude[1:].strip() else ""
+
+    if name not in AT_RULES:
+        raise ValueError(f"Unknown CSS at-rule {prelude!r}")
+
+
+@cache
+def _validate_pseudo(selector: str) -> None:
+    # Arguments of functional pseudo-classes, i.e. `:nth-child(2)`, aren't checked
+    without_arguments = re.sub(r"\([^)]*\)", "", selector)
+    names = re.findall(r"::?[-\w]+", without_arguments)
+
+    if not names or "".join(names) != without_arguments:
+        raise ValueError(f"Expected a pseudo selector such as ':hover' but received {selector!r}")
+
+    for name in names:
+        name = property_name(name)
+
+        if name not in PSEUDO_CLASSES and name not in PSEUDO_ELEMENTS:
+            raise ValueError(f"Unknown CSS pseudo selector {name!r}")
+
+
+class Rule(NamedTuple):
+    """A parsed CSS rule
+
+    Args:
+        selector (str):
+            The rule's selector or at-rule prelude, i.e. `.card > a` or `@media (width>600px)`.
+            At-rules without a block, and those kept verbatim, hold their whole text,
+            including the block or closing `;`
+        declarations (tuple[tuple[str, str], ...]): The rule's `(property, value)` pairs
+        rules (tuple[Rule, ...] | None):
+            The rules nested in the rule's block, i.e. in `@media`, or `None` when it has none
+    """
+
+    selector: str
+    declarations: tuple[tuple[str, str], ...] = ()
+    rules: tuple[Rule, ...] | None = None
+
+
 class Style:
     """Contains css for an element.
 
     Formats css to be joined with other `Style` elements in preparation for final bundling.
+    Stylesheet text and files are parsed once, see `parse`, and the result is cached by a
+    hash of the text in memory and under the cache folder, so reloads and rebuilds skip
+    parsing unchanged stylesheets.
 
     Args:
-        css (str | PathLike | CSSElement):
+        css (dict | str | bytes | PathLike | Style):
+            A dict of `{selector: {property: value}}`, nesting pseudo selectors and at-rules
+            as dicts, stylesheet text, the path to a stylesheet, or another `Style`
+        validate (bool): Parse text and files with cssutils, see `parse`
     """
 
-    def __init__(self, css: dict[Any, Any] | str | PathLike | Style) -> None:
-        pass
+    __slots__ = ("rules",)
 
-    def render(self) -> Style:  # type: ignore
-        pass
+    def __init__(
+        self, css: dict[str, Any] | str | bytes | PathLike | Style, validate: bool = False
+    ) -> None:
+        if isinstance(css, Style):
+            self.rules: tuple[Rule, ...] = css.rules
+        elif isinstance(css, dict):
+            self.rules = _rules_from_dict(css)
+        elif isinstance(css, PathLike):
+            self.rules = _parse_cache(validate).parse_file(css)
+        elif isinstance(css, (str, bytes)):
+            self.rules = _parse_cache(validate).parse_text(
+                css.decode("utf-8") if isinstance(css, bytes) else css
+            )
+        else:
+            raise TypeError(
+                f"Expected dict, str, bytes, PathLike or Style type but received {type(css)}"
+            )
+
+    def render(self) -> str:
+        """Serializes the rules back into stylesheet text, see `serialize`"""
+        return serialize(self.rules)
 
 
 @overload
-def style(css: PathLike, /) -> Style:
+def style(css: PathLike, /, validate: bool = False) -> Style:
     """Loads css from a file
 
     Args:
         x (Path): path to css file
+        validate (bool): Parse with cssutils, see `parse`
     """
     pass
 
 
 @overload
-def style(css: str | bytes, /) -> Style:
+def style(css: str | bytes, /, validate: bool = False) -> Style:
     """Loads css from a string
 
     Args:
         x (Path): string containing css
+        validate (bool): Parse with cssutils, see `parse`
     """
     pass
 
 
-def style(css, /) -> Style:
-    raise NotImplementedError(f"Expected str, bytes, or PathLike type but received {type(css)}")
-
-
-# Just pleasing pre-commit
-keywords = [
-    "_webkit_line_clamp"
-    "accent_color"
-    ":active"
-    "additive_symbols"
-    "::after"
-    "align_content"
-    "align_items"
-    "align_self"
-    "align_tracks"
-    "all"
-    "<angle>"
-    "<angle_percentage>"
-    "animation"
-    "animation_delay"
-    "animation_direction"
-    "animation_duration"
-    "animation_fill_mode"
-    "animation_iteration_count"
-    "animation_name"
-    "animation_play_state"
-    "animation_timeline"
-    "animation_timing_function"
-    "@annotation"
-    "annotation()"
-    ":any_link"
-    "appearance"
-    "ascent_override"
-    "aspect_ratio"
-    "attr()"
-    "::backdrop"
-    "backdrop_filter"
-    "backface_visibility"
-    "background"
-    "background_attachment"
-    "background_blend_mode"
-    "background_clip"
-    "background_color"
-    "background_image"
-    "background_origin"
-    "background_position"
-    "background_position_x"
-    "background_position_y"
-    "background_repeat"
-    "background_size"
-    "<basic_shape>"
-    "::before"
-    ":blank"
-    "<blend_mode>"
-    "block_size"
-    "blur()"
-    "border"
-    "border_block"
-    "border_block_color"
-    "border_block_end"
-    "border_block_end_color"
-    "border_block_end_style"
-    "border_block_end_width"
-    "border_block_start"
-    "border_block_start_color"
-    "border_block_start_style"
-    "border_block_start_width"
-    "border_block_style"
-    "border_block_width"
-    "border_bottom"
-    "border_bottom_color"
-    "border_bottom_left_radius"
-    "border_bottom_right_radius"
-    "border_bottom_style"
-    "border_bottom_width"
-    "border_collapse"
-    "border_color"
-    "border_end_end_radius"
-    "border_end_start_radius"
-    "border_image"
-    "border_image_outset"
-    "border_image_repeat"
-    "border_image_slice"
-    "border_image_source"
-    "border_image_width"
-    "border_inline"
-    "border_inline_color"
-    "border_inline_end"
-    "border_inline_end_color"
-    "border_inline_end_style"
-    "border_inline_end_width"
-    "border_inline_start"
-    "border_inline_start_color"
-    "border_inline_start_style"
-    "border_inline_start_width"
-    "border_inline_style"
-    "border_inline_width"
-    "border_left"
-    "border_left_color"
-    "border_left_style"
-    "border_left_width"
-    "border_radius"
-    "border_right"
-    "border_right_color"
-    "border_right_style"
-    "border_right_width"
-    "border_spacing"
-    "border_start_end_radius"
-    "border_start_start_radius"
-    "border_style"
-    "border_top"
-    "border_top_color"
-    "border_top_left_radius"
-    "border_top_right_radius"
-    "border_top_style"
-    "border_top_width"
-    "border_width"
-    "bottom"
-    "@bottom_center"
-    "box_decoration_break"
-    "box_shadow"
-    "box_sizing"
-    "break_after"
-    "break_before"
-    "break_inside"
-    "brightness()"
-    "calc()"
-    "caption_side"
-    "caret_color"
-    "@character_variant"
-    "character_variant()"
-    "@charset"
-    ":checked"
-    "circle()"
-    "clamp()"
-    "clear"
-    "clip"
-    "clip_path"
-    "<color>"
-    "color"
-    "color_scheme"
-    "column_count"
-    "column_fill"
-    "column_gap"
-    "column_rule"
-    "column_rule_color"
-    "column_rule_style"
-    "column_rule_width"
-    "column_span"
-    "column_width"
-    "columns"
-    "conic_gradient()"
-    "contain"
-    "content"
-    "content_visibility"
-    "contrast()"
-    "<counter>"
-    "counter_increment"
-    "counter_reset"
-    "counter_set"
-    "@counter_style"
-    "counters()"
-    "cross_fade()"
-    "cubic_bezier()"
-    "::cue"
-    "::cue_region"
-    ":current"
-    "cursor"
-    "<custom_ident>"
-    "length#cap"
-    "length#ch"
-    "length#cm"
-    "angle#deg"
-    ":default"
-    ":defined"
-    "descent_override"
-    "<dimension>"
-    ":dir"
-    "direction"
-    ":disabled"
-    "display"
-    "<display_box>"
-    "<display_inside>"
-    "<display_internal>"
-    "<display_legacy>"
-    "<display_listitem>"
-    "<display_outside>"
-    "drop_shadow()"
-    "resolution#dpcm"
-    "resolution#dpi"
-    "resolution#dppx"
-    "element()"
-    "ellipse()"
-    ":empty"
-    "empty_cells"
-    ":enabled"
-    "env()"
-    "length#em"
-    "length#ex"
-    "fallback"
-    "filter"
-    "<filter_function>"
-    ":first"
-    ":first_child"
-    "::first_letter"
-    "::first_line"
-    ":first_of_type"
-    "fit_content()"
-    "<flex>"
-    "flex"
-    "flex_basis"
-    "flex_direction"
-    "flex_flow"
-    "flex_grow"
-    "flex_shrink"
-    "flex_wrap"
-    "flex_value#fr"
-    "float"
-    ":focus"
-    ":focus_visible"
-    ":focus_within"
-    "font"
-    "font_display"
-    "@font_face"
-    "font_family"
-    "font_family"
-    "font_feature_settings"
-    "@font_feature_values"
-    "font_kerning"
-    "font_language_override"
-    "font_optical_sizing"
-    "font_size"
-    "font_size_adjust"
-    "font_stretch"
-    "font_stretch"
-    "font_style"
-    "font_style"
-    "font_synthesis"
-    "font_variant"
-    "font_variant"
-    "font_variant_alternates"
-    "font_variant_caps"
-    "font_variant_east_asian"
-    "font_variant_ligatures"
-    "font_variant_numeric"
-    "font_variant_position"
-    "font_variation_settings"
-    "font_variation_settings"
-    "font_weight"
-    "font_weight"
-    "forced_color_adjust"
-    "format()"
-    "<frequency>"
-    "<frequency_percentage>"
-    ":fullscreen"
-    ":future"
-    "angle#grad"
-    "gap"
-    "<gradient>"
-    "::grammar_error"
-    "grayscale()"
-    "grid"
-    "grid_area"
-    "grid_auto_columns"
-    "grid_auto_flow"
-    "grid_auto_rows"
-    "grid_column"
-    "grid_column_end"
-    "grid_column_start"
-    "grid_row"
-    "grid_row_end"
-    "grid_row_start"
-    "grid_template"
-    "grid_template_areas"
-    "grid_template_columns"
-    "grid_template_rows"
-    "frequency#Hz"
-    "hanging_punctuation"
-    ":has"
-    "height"
-    "height"
-    ":host()"
-    ":hover"
-    "hsl()"
-    "hsla()"
-    "hue_rotate()"
-    "hyphenate_character"
-    "hyphens"
-    "<ident>"
-    "<image>"
-    "image()"
-    "image_orientation"
-    "image_rendering"
-    "image_resolution"
-    "image_set()"
-    "@import"
-    ":in_range"
-    ":indeterminate"
-    "inherit"
-    "inherits"
-    "initial"
-    "initial_letter"
-    "initial_letter_align"
-    "initial_value"
-    "inline_size"
-    "inset"
-    "inset()"
-    "inset_block"
-    "inset_block_end"
-    "inset_block_start"
-    "inset_inline"
-    "inset_inline_end"
-    "inset_inline_start"
-    "<integer>"
-    ":invalid"
-    "invert()"
-    ":is"
-    "isolation"
-    "length#ic"
-    "length#in"
-    "justify_content"
-    "justify_items"
-    "justify_self"
-    "justify_tracks"
-    "frequency#kHz"
-    "@keyframes"
-    ":lang"
-    ":last_child"
-    ":last_of_type"
-    "@layer"
-    ":left"
-    "left"
-    "@left_bottom"
-    "<length>"
-    "<length_percentage>"
-    "letter_spacing"
-    "line_break"
-    "line_gap_override"
-    "line_height"
-    "line_height_step"
-    "linear_gradient()"
-    ":link"
-    "list_style"
-    "list_style_image"
-    "list_style_position"
-    "list_style_type"
-    "local()"
-    ":local_link"
-    "length#mm"
-    "margin"
-    "margin_block"
-    "margin_block_end"
-    "margin_block_start"
-    "margin_bottom"
-    "margin_inline"
-    "margin_inline_end"
-    "margin_inline_start"
-    "margin_left"
-    "margin_right"
-    "margin_top"
-    "margin_trim"
-    "::marker"
-    "mask"
-    "mask_border"
-    "mask_border_mode"
-    "mask_border_outset"
-    "mask_border_repeat"
-    "mask_border_slice"
-    "mask_border_source"
-    "mask_border_width"
-    "mask_clip"
-    "mask_composite"
-    "mask_image"
-    "mask_mode"
-    "mask_origin"
-    "mask_position"
-    "mask_repeat"
-    "mask_size"
-    "mask_type"
-    "masonry_auto_flow"
-    "math_style"
-    "matrix()"
-    "matrix3d()"
-    "max()"
-    "max_block_size"
-    "max_height"
-    "max_height"
-    "max_inline_size"
-    "max_width"
-    "max_width"
-    "max_zoom"
-    "@media"
-    "min()"
-    "min_block_size"
-    "min_height"
-    "min_height"
-    "min_inline_size"
-    "min_width"
-    "min_width"
-    "min_zoom"
-    "minmax()"
-    "mix_blend_mode"
-    "time#ms"
-    "@namespace"
-    "negative"
-    ":not"
-    ":nth_child"
-    ":nth_col"
-    ":nth_last_child"
-    ":nth_last_col"
-    ":nth_last_of_type"
-    ":nth_of_type"
-    "<number>"
-    "object_fit"
-    "object_position"
-    "offset"
-    "offset_anchor"
-    "offset_distance"
-    "offset_path"
-    "offset_position"
-    "offset_rotate"
-    ":only_child"
-    ":only_of_type"
-    "opacity"
-    "opacity()"
-    ":optional"
-    "order"
-    "orientation"
-    "@ornaments"
-    "ornaments()"
-    "orphans"
-    ":out_of_range"
-    "outline"
-    "outline_color"
-    "outline_offset"
-    "outline_style"
-    "outline_width"
-    "overflow"
-    "overflow_anchor"
-    "overflow_block"
-    "overflow_clip_margin"
-    "overflow_inline"
-    "overflow_wrap"
-    "overflow_x"
-    "overflow_y"
-    "overscroll_behavior"
-    "overscroll_behavior_block"
-    "overscroll_behavior_inline"
-    "overscroll_behavior_x"
-    "overscroll_behavior_y"
-    "Pseudo_classes"
-    "Pseudo_elements"
-    "length#pc"
-    "length#pt"
-    "length#px"
-    "pad"
-    "padding"
-    "padding_block"
-    "padding_block_end"
-    "padding_block_start"
-    "padding_bottom"
-    "padding_inline"
-    "padding_inline_end"
-    "padding_inline_start"
-    "padding_left"
-    "padding_right"
-    "padding_top"
-    "@page"
-    "page_break_after"
-    "page_break_before"
-    "page_break_inside"
-    "paint()"
-    "paint_order"
-    "::part"
-    ":past"
-    "path()"
-    ":paused"
-    "<percentage>"
-    "perspective"
-    "perspective()"
-    "perspective_origin"
-    ":picture_in_picture"
-    "place_content"
-    "place_items"
-    "place_self"
-    "::placeholder"
-    ":placeholder_shown"
-    ":playing"
-    "pointer_events"
-    "polygon()"
-    "<position>"
-    "position"
-    "prefix"
-    "print_color_adjust"
-    "@property"
-    "length#quotes"
-    "angle#rad"
-    "length#rem"
-    "radial_gradient()"
-    "range"
-    "<ratio>"
-    ":read_only"
-    ":read_write"
-    "rect()"
-    "repeat()"
-    "repeating_conic_gradient()"
-    "repeating_linear_gradient()"
-    "repeating_radial_gradient()"
-    ":required"
-    "resize"
-    "<resolution>"
-    "revert"
-    "rgb()"
-    "rgba()"
-    ":right"
-    "right"
-    "@right_bottom"
-    ":root"
-    "rotate"
-    "rotate()"
-    "rotate3d()"
-    "rotateX()"
-    "rotateY()"
-    "rotateZ()"
-    "row_gap"
-    "ruby_align"
-    "ruby_position"
-    "saturate()"
-    "scale"
-    "scale()"
-    "scale3d()"
-    "scaleX()"
-    "scaleY()"
-    "scaleZ()"
-    ":scope"
-    "scroll_behavior"
-    "scroll_margin"
-    "scroll_margin_block"
-    "scroll_margin_block_end"
-    "scroll_margin_block_start"
-    "scroll_margin_bottom"
-    "scroll_margin_inline"
-    "scroll_margin_inline_end"
-    "scroll_margin_inline_start"
-    "scroll_margin_left"
-    "scroll_margin_right"
-    "scroll_margin_top"
-    "scroll_padding"
-    "scroll_padding_block"
-    "scroll_padding_block_end"
-    "scroll_padding_block_start"
-    "scroll_padding_bottom"
-    "scroll_padding_inline"
-    "scroll_padding_inline_end"
-    "scroll_padding_inline_start"
-    "scroll_padding_left"
-    "scroll_padding_right"
-    "scroll_padding_top"
-    "scroll_snap_align"
-    "scroll_snap_stop"
-    "scroll_snap_type"
-    "@scroll_timeline"
-    "scrollbar_color"
-    "scrollbar_gutter"
-    "scrollbar_width"
-    "::selection"
-    "sepia()"
-    "<shape>"
-    "shape_image_threshold"
-    "shape_margin"
-    "shape_outside"
-    "size"
-    "size_adjust"
-    "skew()"
-    "skewX()"
-    "skewY()"
-    "::slotted"
-    "speak_as"
-    "::spelling_error"
-    "src"
-    "steps()"
-    "<string>"
-    "@styleset"
-    "styleset()"
-    "@stylistic"
-    "stylistic()"
-    "suffix"
-    "@supports"
-    "@swash"
-    "swash()"
-    "symbols"
-    "symbols()"
-    "syntax"
-    "system"
-    "time#s"
-    "angle#turn"
-    "tab_size"
-    "table_layout"
-    ":target"
-    "::target_text"
-    ":target_within"
-    "text_align"
-    "text_align_last"
-    "text_combine_upright"
-    "text_decoration"
-    "text_decoration_color"
-    "text_decoration_line"
-    "text_decoration_skip"
-    "text_decoration_skip_ink"
-    "text_decoration_style"
-    "text_decoration_thickness"
-    "text_emphasis"
-    "text_emphasis_color"
-    "text_emphasis_position"
-    "text_emphasis_style"
-    "text_indent"
-    "text_justify"
-    "text_orientation"
-    "text_overflow"
-    "text_rendering"
-    "text_shadow"
-    "text_size_adjust"
-    "text_transform"
-    "text_underline_offset"
-    "text_underline_position"
-    "<time>"
-    "<time_percentage>"
-    "<timing_function>"
-    "top"
-    "@top_center"
-    "touch_action"
-    "transform"
-    "transform_box"
-    "<transform_function>"
-    "transform_origin"
-    "transform_style"
-    "transition"
-    "transition_delay"
-    "transition_duration"
-    "transition_property"
-    "transition_timing_function"
-    "translate"
-    "translate()"
-    "translate3d()"
-    "translateX()"
-    "translateY()"
-    "translateZ()"
-    "unicode_bidi"
-    "unicode_range"
-    "unset"
-    "<url>"
-    "url()"
-    ":user_invalid"
-    "user_select"
-    ":user_valid"
-    "user_zoom"
-    "length#vh"
-    "length#vmax"
-    "length#vmin"
-    "length#vw"
-    ":valid"
-    "var()"
-    "vertical_align"
-    "@viewport"
-    "viewport_fit"
-    "visibility"
-    ":visited"
-    ":where"
-    "white_space"
-    "widows"
-    "width"
-    "width"
-    "will_change"
-    "word_break"
-    "word_spacing"
-    "word_wrap"
-    "writing_mode"
-    "resolution#x"
-    "z_index"
-    "zoom"
-]
+def style(css, /, validate=False) -> Style:
+    return Style(css, validate=validate)
+
+
+def parse(css: str, validate: bool = False) -> tuple[Rule, ...]:
+    """Parses stylesheet text into `Rule`s
+
+    By default a single pass tokenizer splits the text into rules, selectors and
+    declarations without checking them, which is quick even on multi-megabyte framework
+    stylesheets. With `validate`, the text is parsed by cssutils into a full CSSOM first,
+    which is considerably slower and requires cssutils to be installed.
+    Unlike `Style` and `style()`, the result isn't cached.
+
+    Args:
+        css (str): The stylesheet text
+        validate (bool): Parse with cssutils
+
+    Returns:
+        tuple[Rule, ...]: The stylesheet's top level rules
+    """
+    if not validate:
+        return _parse_native(css)
+
+    try:
+        import cssutils
+    except ImportError as error:
+        raise ImportError(
+            "Validating stylesheets requires cssutils. Install it with `pip install cssutils`"
+        ) from error
+
+    cssutils.log.setLevel(logging.CRITICAL)
+    sheet = cssutils.CSSParser(validate=False, raiseExceptions=False).parseString(css)
+
+    return _rules_from_cssom(sheet.cssRules)
+
+
+@cache
+def _parse_cache(validate: bool = False) -> ParseCache[tuple[Rule, ...]]:
+    from .application import CACHE_FOLDER  # deferred as application imports this module
+
+    return ParseCache(
+        partial(parse, validate=validate),
+        CACHE_FOLDER.joinpath("css"),
+        version="cssutils" if validate else "native",
+    )
+
+
+# Strings, comments and escapes are single tokens, so the structural characters inside them
+# are never mistaken for the real thing
+_TOKEN = re.compile(
+    r"""
+    "(?:[^"\\\n]|\\.)*"?
+    | '(?:[^'\\\n]|\\.)*'?
+    | /\*.*?(?:\*/|\Z)
+    | \\.?
+    | [{};()\[\]]
+    | [^"'/\\{};()\[\]]+
+    | /
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _parse_native(css: str) -> tuple[Rule, ...]:
+    """Splits stylesheet text into rules with a single pass over its tokens
+
+    Follows the block structure of CSS: text up to a `{` is a selector or at-rule prelude,
+    text up to a `;` or `}` is a declaration, or an at-rule without a block. Anything
+    between parentheses or brackets, i.e. `url(data:...;base64,...)`, is never split.
+    Whitespace outside strings is collapsed and comments are dropped.
+    """
+    root: list[Rule] = []
+    rules = root
+    declarations: list[tuple[str, str]] = []
+    # The prelude, declarations and nested rules of each enclosing block
+    stack: list[tuple[str, list[tuple[str, str]], list[Rule]]] = []
+    prelude = ""
+    buffer: list[str] = []
+    depth = 0
+
+    for token in _TOKEN.findall(css):
+        first = token[0]
+
+        if first == '"' or first == "'" or first == "\\":
+            buffer.append(token)
+            continue
+
+        if len(token) > 1:
+            token = " " if first == "/" and token[1] == "*" else _WHITESPACE.sub(" ", token)
+
+            if token[0] == " " and (not buffer or buffer[-1][-1] == " "):
+                token = token[1:]
+
+            if token:
+                buffer.append(token)
+            continue
+
+        if first == "(" or first == "[":
+            depth += 1
+        elif first == ")" or first == "]":
+            depth = max(depth - 1, 0)
+        elif depth == 0 and first == "{":
+            stack.append((prelude, declarations, rules))
+            prelude = "".join(buffer).strip()
+            declarations, rules = [], []
+            buffer.clear()
+            continue
+        elif depth == 0 and (first == ";" or first == "}"):
+            if text := "".join(buffer).strip():
+                if text[0] == "@":
+                    rules.append(Rule(f"{text};"))
+                elif stack:
+                    name, colon, value = text.partition(":")
+                    if colon:
+                        declarations.append((name.rstrip(), value.lstrip()))
+            buffer.clear()
+
+            if first == "}" and stack:
+                rule = Rule(
+                    prelude,
+                    tuple(declarations),
+                    tuple(rules) if rules or (prelude[:1] == "@" and not declarations) else None,
+                )
+                prelude, declarations, rules = stack.pop()
+                rules.append(rule)
+            continue
+        elif first.isspace():
+            token = "" if not buffer or buffer[-1][-1] == " " else " "
+
+            if token:
+                buffer.append(token)
+            continue
+
+        buffer.append(token)
+
+    # Blocks left open at the end of the text are closed, as a browser would
+    if stack and (text := "".join(buffer).strip()):
+        name, colon, value = text.partition(":")
+        if colon:
+            declarations.append((name.rstrip(), value.lstrip()))
+
+    while stack:
+        rule = Rule(
+            prelude,
+            tuple(declarations),
+            tuple(rules) if rules or (prelude[:1] == "@" and not declarations) else None,
+        )
+        prelude, declarations, rules = stack.pop()
+        rules.append(rule)
+
+    return tuple(root)
+
+
+def _rules_from_cssom(rules: Any) -> tuple[Rule, ...]:
+    result: list[Rule] = []
+
+    for rule in rules:
+        if rule.type == rule.COMMENT:
+            continue
+
+        if rule.type == rule.STYLE_RULE:
+            result.append(Rule(rule.selectorText, _declarations_from_cssom(rule.style)))
+        elif rule.type == rule.MEDIA_RULE:
+            result.append(
+                Rule(f"@media {rule.media.mediaText}", rules=_rules_from_cssom(rule.cssRules))
+            )
+        elif rule.type == rule.FONT_FACE_RULE:
+            result.append(Rule("@font-face", _declarations_from_cssom(rule.style)))
+        elif rule.type == rule.PAGE_RULE:
+            result.append(
+                Rule(f"@page {rule.selectorText}".strip(), _declarations_from_cssom(rule.style))
+            )
+        else:
+            result.append(Rule(rule.cssText))
+
+    return tuple(result)
+
+
+def _declarations_from_cssom(style: Any) -> tuple[tuple[str, str], ...]:
+    return tuple(
+        (prop.name, f"{prop.value} !important" if prop.priority else prop.value)
+        for prop in style.getProperties(all=True)
+    )
+
+
+def _rules_from_dict(css: dict[str, Any], parent: str = "") -> tuple[Rule, ...]:
+    """Converts `{selector: {property: value}}` dicts into rules
+
+    Nested pseudo selectors are appended to their parent's selector, i.e.
+    `{"a": {":hover": {...}}}` is `a:hover`, and nested at-rules wrap their parent's rule.
+    """
+    rules: list[Rule] = []
+
+    for selector, body in css.items():
+        if selector.startswith("@"):
+            rules.append(Rule(selector, rules=_rules_from_dict(body)))
+            continue
+
+        selector = f"{parent}{selector}"
+        rules.append(
+            Rule(
+                selector,
+                tuple(
+                    (property_name(name), str(getattr(value, "value", value)))
+                    for name, value in body.items()
+                    if not isinstance(value, dict)
+                ),
+            )
+        )
+
+        for name, value in body.items():
+            if isinstance(value, dict) and name.startswith("@"):
+                rules.append(Rule(name, rules=_rules_from_dict({selector: value})))
+            elif isinstance(value, dict):
+                rules.extend(_rules_from_dict({name: value}, selector))
+
+    return tuple(rules)
+
+
+def serialize(rules: tuple[Rule, ...]) -> str:
+    """Serializes rules into stylesheet text, without any whitespace, shortening values, see
+    `normalize`"""
+    chunks: list[str] = []
+
+    for rule in rules:
+        if rule.rules is None and not rule.declarations and rule.selector.startswith("@"):
+            chunks.append(rule.selector)
+            continue
+
+        body = ";".join(f"{name}:{normalize(name, value)}" for name, value in rule.declarations)
+
+        if rule.rules:
+            body = f"{body};{serialize(rule.rules)}" if body else serialize(rule.rules)
+
+        chunks.append(f"{rule.selector}{{{body}}}")
+
+    return "".join(chunks)
+
+
+# The registry of CSS names, from the mozilla docs. Names are as written in CSS, kebab-case
+
+# Properties, vendor prefixed (`-webkit-`) and custom (`--name`) ones are checked apart
+PROPERTIES = frozenset(
+    {
+        "accent-color",
+        "align-content",
+        "align-items",
+        "align-self",
+        "align-tracks",
+        "all",
+        "animation",
+        "animation-delay",
+        "animation-direction",
+        "animation-duration",
+        "animation-fill-mode",
+        "animation-iteration-count",
+        "animation-name",
+        "animation-play-state",
+        "animation-timeline",
+        "animation-timing-function",
+        "appearance",
+        "aspect-ratio",
+        "backdrop-filter",
+        "backface-visibility",
+        "background",
+        "background-attachment",
+        "background-blend-mode",
+        "background-clip",
+        "background-color",
+        "background-image",
+        "background-origin",
+        "background-position",
+        "background-position-x",
+        "background-position-y",
+        "background-repeat",
+        "background-size",
+        "block-size",
+        "border",
+        "border-block",
+        "border-block-color",
+        "border-block-end",
+        "border-block-end-color",
+        "border-block-end-style",
+        "border-block-end-width",
+        "border-block-start",
+        "border-block-start-color",
+        "border-block-start-style",
+        "border-block-start-width",
+        "border-block-style",
+        "border-block-width",
+        "border-bottom",
+        "border-bottom-color",
+        "border-bottom-left-radius",
+        "border-bottom-right-radius",
+        "border-bottom-style",
+        "border-bottom-width",
+        "border-collapse",
+        "border-color",
+        "border-end-end-radius",
+        "border-end-start-radius",
+        "border-image",
+        "border-image-outset",
+        "border-image-repeat",
+        "border-image-slice",
+        "border-image-source",
+        "border-image-width",
+        "border-inline",
+        "border-inline-color",
+        "border-inline-end",
+        "border-inline-end-color",
+        "border-inline-end-style",
+        "border-inline-end-width",
+        "border-inline-start",
+        "border-inline-start-color",
+        "border-inline-start-style",
+        "border-inline-start-width",
+        "border-inline-style",
+        "border-inline-width",
+        "border-left",
+        "border-left-color",
+        "border-left-style",
+        "border-left-width",
+        "border-radius",
+        "border-right",
+        "border-right-color",
+        "border-right-style",
+        "border-right-width",
+        "border-spacing",
+        "border-start-end-radius",
+        "border-start-start-radius",
+        "border-style",
+        "border-top",
+        "border-top-color",
+        "border-top-left-radius",
+        "border-top-right-radius",
+        "border-top-style",
+        "border-top-width",
+        "border-width",
+        "bottom",
+        "box-decoration-break",
+        "box-shadow",
+        "box-sizing",
+        "break-after",
+        "break-before",
+        "break-inside",
+        "caption-side",
+        "caret-color",
+        "clear",
+        "clip",
+        "clip-path",
+        "color",
+        "color-scheme",
+        "column-count",
+        "column-fill",
+        "column-gap",
+        "column-rule",
+        "column-rule-color",
+        "column-rule-style",
+        "column-rule-width",
+        "column-span",
+        "column-width",
+        "columns",
+        "contain",
+        "contain-intrinsic-size",
+        "container",
+        "container-name",
+        "container-type",
+        "content",
+        "content-visibility",
+        "counter-increment",
+        "counter-reset",
+        "counter-set",
+        "cursor",
+        "direction",
+        "display",
+        "empty-cells",
+        "fill",
+        "fill-opacity",
+        "filter",
+        "flex",
+        "flex-basis",
+        "flex-direction",
+        "flex-flow",
+        "flex-grow",
+        "flex-shrink",
+        "flex-wrap",
+        "float",
+        "font",
+        "font-family",
+        "font-feature-settings",
+        "font-kerning",
+        "font-language-override",
+        "font-optical-sizing",
+        "font-size",
+        "font-size-adjust",
+        "font-stretch",
+        "font-style",
+        "font-synthesis",
+        "font-variant",
+        "font-variant-alternates",
+        "font-variant-caps",
+        "font-variant-east-asian",
+        "font-variant-ligatures",
+        "font-variant-numeric",
+        "font-variant-position",
+        "font-variation-settings",
+        "font-weight",
+        "forced-color-adjust",
+        "gap",
+        "grid",
+        "grid-area",
+        "grid-auto-columns",
+        "grid-auto-flow",
+        "grid-auto-rows",
+        "grid-column",
+        "grid-column-end",
+        "grid-column-start",
+        "grid-row",
+        "grid-row-end",
+        "grid-row-start",
+        "grid-template",
+        "grid-template-areas",
+        "grid-template-columns",
+        "grid-template-rows",
+        "hanging-punctuation",
+        "height",
+        "hyphenate-character",
+        "hyphens",
+        "image-orientation",
+        "image-rendering",
+        "image-resolution",
+        "initial-letter",
+        "initial-letter-align",
+        "inline-size",
+        "inset",
+        "inset-area",
+        "inset-block",
+        "inset-block-end",
+        "inset-block-start",
+        "inset-inline",
+        "inset-inline-end",
+        "inset-inline-start",
+        "isolation",
+        "justify-content",
+        "justify-items",
+        "justify-self",
+        "justify-tracks",
+        "left",
+        "letter-spacing",
+        "line-break",
+        "line-height",
+        "line-height-step",
+        "list-style",
+        "list-style-image",
+        "list-style-position",
+        "list-style-type",
+        "margin",
+        "margin-block",
+        "margin-block-end",
+        "margin-block-start",
+        "margin-bottom",
+        "margin-inline",
+        "margin-inline-end",
+        "margin-inline-start",
+        "margin-left",
+        "margin-right",
+        "margin-top",
+        "margin-trim",
+        "mask",
+        "mask-border",
+        "mask-border-mode",
+        "mask-border-outset",
+        "mask-border-repeat",
+        "mask-border-slice",
+        "mask-border-source",
+        "mask-border-width",
+        "mask-clip",
+        "mask-composite",
+        "mask-image",
+        "mask-mode",
+        "mask-origin",
+        "mask-position",
+        "mask-repeat",
+        "mask-size",
+        "mask-type",
+        "masonry-auto-flow",
+        "math-style",
+        "max-block-size",
+        "max-height",
+        "max-inline-size",
+        "max-width",
+        "min-block-size",
+        "min-height",
+        "min-inline-size",
+        "min-width",
+        "mix-blend-mode",
+        "object-fit",
+        "object-position",
+        "offset",
+        "offset-anchor",
+        "offset-distance",
+        "offset-path",
+        "offset-position",
+        "offset-rotate",
+        "opacity",
+        "order",
+        "orphans",
+        "outline",
+        "outline-color",
+        "outline-offset",
+        "outline-style",
+        "outline-width",
+        "overflow",
+        "overflow-anchor",
+        "overflow-block",
+        "overflow-clip-margin",
+        "overflow-inline",
+        "overflow-wrap",
+        "overflow-x",
+        "overflow-y",
+        "overscroll-behavior",
+        "overscroll-behavior-block",
+        "overscroll-behavior-inline",
+        "overscroll-behavior-x",
+        "overscroll-behavior-y",
+        "padding",
+        "padding-block",
+        "padding-block-end",
+        "padding-block-start",
+        "padding-bottom",
+        "padding-inline",
+        "padding-inline-end",
+        "padding-inline-start",
+        "padding-left",
+        "padding-right",
+        "padding-top",
+        "page-break-after",
+        "page-break-before",
+        "page-break-inside",
+        "paint-order",
+        "perspective",
+        "perspective-origin",
+        "place-content",
+        "place-items",
+        "place-self",
+        "pointer-events",
+        "position",
+        "print-color-adjust",
+        "resize",
+        "right",
+        "rotate",
+        "row-gap",
+        "ruby-align",
+        "ruby-position",
+        "scale",
+        "scroll-behavior",
+        "scroll-margin",
+        "scroll-margin-block",
+        "scroll-margin-block-end",
+        "scroll-margin-block-start",
+        "scroll-margin-bottom",
+        "scroll-margin-inline",
+        "scroll-margin-inline-end",
+        "scroll-margin-inline-start",
+        "scroll-margin-left",
+        "scroll-margin-right",
+        "scroll-margin-top",
+        "scroll-padding",
+        "scroll-padding-block",
+        "scroll-padding-block-end",
+        "scroll-padding-block-start",
+        "scroll-padding-bottom",
+        "scroll-padding-inline",
+        "scroll-padding-inline-end",
+        "scroll-padding-inline-start",
+        "scroll-padding-left",
+        "scroll-padding-right",
+        "scroll-padding-top",
+        "scroll-snap-align",
+        "scroll-snap-stop",
+        "scroll-snap-type",
+        "scrollbar-color",
+        "scrollbar-gutter",
+        "scrollbar-width",
+        "shape-image-threshold",
+        "shape-margin",
+        "shape-outside",
+        "stroke",
+        "stroke-dasharray",
+        "stroke-dashoffset",
+        "stroke-linecap",
+        "stroke-linejoin",
+        "stroke-opacity",
+        "stroke-width",
+        "tab-size",
+        "table-layout",
+        "text-align",
+        "text-align-last",
+        "text-combine-upright",
+        "text-decoration",
+        "text-decoration-color",
+        "text-decoration-line",
+        "text-decoration-skip",
+        "text-decoration-skip-ink",
+        "text-decoration-style",
+        "text-decoration-thickness",
+        "text-emphasis",
+        "text-emphasis-color",
+        "text-emphasis-position",
+        "text-emphasis-style",
+        "text-indent",
+        "text-justify",
+        "text-orientation",
+        "text-overflow",
+        "text-rendering",
+        "text-shadow",
+        "text-size-adjust",
+        "text-transform",
+        "text-underline-offset",
+        "text-underline-position",
+        "text-wrap",
+        "top",
+        "touch-action",
+        "transform",
+        "transform-box",
+        "transform-origin",
+        "transform-style",
+        "transition",
+        "transition-delay",
+        "transition-duration",
+        "transition-property",
+        "transition-timing-function",
+        "translate",
+        "unicode-bidi",
+        "user-select",
+        "vertical-align",
+        "visibility",
+        "white-space",
+        "widows",
+        "width",
+        "will-change",
+        "word-break",
+        "word-spacing",
+        "word-wrap",
+        "writing-mode",
+        "z-index",
+        "zoom",
+    }
+)
+
+# Descriptors of at-rules, i.e. `src` in `@font-face`
+DESCRIPTORS = frozenset(
+    {
+        "additive-symbols",
+        "ascent-override",
+        "descent-override",
+        "fallback",
+        "font-display",
+        "inherits",
+        "initial-value",
+        "line-gap-override",
+        "max-zoom",
+        "min-zoom",
+        "negative",
+        "orientation",
+        "pad",
+        "prefix",
+        "range",
+        "size",
+        "size-adjust",
+        "speak-as",
+        "src",
+        "suffix",
+        "symbols",
+        "syntax",
+        "system",
+        "unicode-range",
+        "user-zoom",
+        "viewport-fit",
+    }
+)
+
+# Functional ones without their arguments, i.e. `:nth-child`
+PSEUDO_CLASSES = frozenset(
+    {
+        ":active",
+        ":any-link",
+        ":autofill",
+        ":blank",
+        ":checked",
+        ":current",
+        ":default",
+        ":defined",
+        ":dir",
+        ":disabled",
+        ":empty",
+        ":enabled",
+        ":first",
+        ":first-child",
+        ":first-of-type",
+        ":focus",
+        ":focus-visible",
+        ":focus-within",
+        ":fullscreen",
+        ":future",
+        ":has",
+        ":host",
+        ":hover",
+        ":in-range",
+        ":indeterminate",
+        ":invalid",
+        ":is",
+        ":lang",
+        ":last-child",
+        ":last-of-type",
+        ":left",
+        ":link",
+        ":local-link",
+        ":modal",
+        ":not",
+        ":nth-child",
+        ":nth-col",
+        ":nth-last-child",
+        ":nth-last-col",
+        ":nth-last-of-type",
+        ":nth-of-type",
+        ":only-child",
+        ":only-of-type",
+        ":optional",
+        ":out-of-range",
+        ":past",
+        ":paused",
+        ":picture-in-picture",
+        ":placeholder-shown",
+        ":playing",
+        ":popover-open",
+        ":read-only",
+        ":read-write",
+        ":required",
+        ":right",
+        ":root",
+        ":scope",
+        ":target",
+        ":target-within",
+        ":user-invalid",
+        ":user-valid",
+        ":valid",
+        ":visited",
+        ":where",
+    }
+)
+
+PSEUDO_ELEMENTS = frozenset(
+    {
+        "::after",
+        "::backdrop",
+        "::before",
+        "::cue",
+        "::cue-region",
+        "::file-selector-button",
+        "::first-letter",
+        "::first-line",
+        "::grammar-error",
+        "::marker",
+        "::part",
+        "::placeholder",
+        "::selection",
+        "::slotted",
+        "::spelling-error",
+        "::target-text",
+    }
+)
+
+# Without the `@`
+AT_RULES = frozenset(
+    {
+        "-webkit-keyframes",
+        "annotation",
+        "bottom-center",
+        "character-variant",
+        "charset",
+        "container",
+        "counter-style",
+        "font-face",
+        "font-feature-values",
+        "font-palette-values",
+        "import",
+        "keyframes",
+        "layer",
+        "left-bottom",
+        "media",
+        "namespace",
+        "ornaments",
+        "page",
+        "property",
+        "right-bottom",
+        "scope",
+        "scroll-timeline",
+        "starting-style",
+        "styleset",
+        "stylistic",
+        "supports",
+        "swash",
+        "top-center",
+        "viewport",
+    }
+)
+
+FUNCTIONS = frozenset(
+    {
+        "annotation",
+        "attr",
+        "blur",
+        "brightness",
+        "calc",
+        "character-variant",
+        "circle",
+        "clamp",
+        "conic-gradient",
+        "contrast",
+        "counters",
+        "cross-fade",
+        "cubic-bezier",
+        "drop-shadow",
+        "element",
+        "ellipse",
+        "env",
+        "fit-content",
+        "format",
+        "grayscale",
+        "hsl",
+        "hsla",
+        "hue-rotate",
+        "image",
+        "image-set",
+        "inset",
+        "invert",
+        "linear-gradient",
+        "local",
+        "matrix",
+        "matrix3d",
+        "max",
+        "min",
+        "minmax",
+        "opacity",
+        "ornaments",
+        "paint",
+        "path",
+        "perspective",
+        "polygon",
+        "radial-gradient",
+        "rect",
+        "repeat",
+        "repeating-conic-gradient",
+        "repeating-linear-gradient",
+        "repeating-radial-gradient",
+        "rgb",
+        "rgba",
+        "rotate",
+        "rotate3d",
+        "rotateX",
+        "rotateY",
+        "rotateZ",
+        "saturate",
+        "scale",
+        "scale3d",
+        "scaleX",
+        "scaleY",
+        "scaleZ",
+        "sepia",
+        "skew",
+        "skewX",
+        "skewY",
+        "steps",
+        "styleset",
+        "stylistic",
+        "swash",
+        "symbols",
+        "translate",
+        "translate3d",
+        "translateX",
+        "translateY",
+        "translateZ",
+        "url",
+        "var",
+    }
+)
+
+# Without the angle brackets, i.e. `color` for `<color>`
+DATA_TYPES = frozenset(
+    {
+        "angle",
+        "angle-percentage",
+        "basic-shape",
+        "blend-mode",
+        "color",
+        "counter",
+        "custom-ident",
+        "dimension",
+        "display-box",
+        "display-inside",
+        "display-internal",
+        "display-legacy",
+        "display-listitem",
+        "display-outside",
+        "filter-function",
+        "flex",
+        "frequency",
+        "frequency-percentage",
+        "gradient",
+        "ident",
+        "image",
+        "integer",
+        "length",
+        "length-percentage",
+        "number",
+        "percentage",
+        "position",
+        "ratio",
+        "resolution",
+        "shape",
+        "string",
+        "time",
+        "time-percentage",
+        "timing-function",
+        "transform-function",
+        "url",
+    }
+)
+
+# Of lengths, angles, times, frequencies, resolutions and flex factors
+UNITS = frozenset(
+    {
+        "Hz",
+        "Q",
+        "cap",
+        "ch",
+        "cm",
+        "cqb",
+        "cqh",
+        "cqi",
+        "cqmax",
+        "cqmin",
+        "cqw",
+        "deg",
+        "dpcm",
+        "dpi",
+        "dppx",
+        "dvh",
+        "dvw",
+        "em",
+        "ex",
+        "fr",
+        "grad",
+        "ic",
+        "in",
+        "kHz",
+        "lh",
+        "lvh",
+        "lvw",
+        "mm",
+        "ms",
+        "pc",
+        "pt",
+        "px",
+        "rad",
+        "rem",
+        "rlh",
+        "s",
+        "svh",
+        "svw",
+        "turn",
+        "vb",
+        "vh",
+        "vi",
+        "vmax",
+        "vmin",
+        "vw",
+        "x",
+    }
+)
+
+# Values every property accepts
+GLOBAL_KEYWORDS = frozenset(
+    {
+        "inherit",
+        "initial",
+        "revert",
+        "unset",
+    }
+)
+
+
+# Units a zero can be written without, i.e. `0` for `0px`
+LENGTH_UNITS = frozenset(
+    {
+        "cap",
+        "ch",
+        "cm",
+        "cqb",
+        "cqh",
+        "cqi",
+        "cqmax",
+        "cqmin",
+        "cqw",
+        "dvh",
+        "dvw",
+        "em",
+        "ex",
+        "ic",
+        "in",
+        "lh",
+        "lvh",
+        "lvw",
+        "mm",
+        "pc",
+        "pt",
+        "px",
+        "q",
+        "rem",
+        "rlh",
+        "svh",
+        "svw",
+        "vb",
+        "vh",
+        "vi",
+        "vmax",
+        "vmin",
+        "vw",
+    }
+)
+# Properties whose values can hold color keywords, along with every `*-color` property
+COLOR_PROPERTIES = frozenset(
+    {
+        "background",
+        "border",
+        "border-block",
+        "border-block-end",
+        "border-block-start",
+        "border-bottom",
+        "border-inline",
+        "border-inline-end",
+        "border-inline-start",
+        "border-left",
+        "border-right",
+        "border-top",
+        "box-shadow",
+        "color",
+        "column-rule",
+        "fill",
+        "outline",
+        "stroke",
+        "text-decoration",
+        "text-emphasis",
+        "text-shadow",
+    }
+)
+
+# Color keywords and their hex values
+COLORS = {
+    "antiquewhite": "#faebd7",
+    "aqua": "#00ffff",
+    "aquamarine": "#7fffd4",
+    "azure": "#f0ffff",
+    "beige": "#f5f5dc",
+    "bisque": "#ffe4c4",
+    "black": "#000000",
+    "blanchedalmond": "#ffebcd",
+    "blue": "#0000ff",
+    "blueviolet": "#8a2be2",
+    "brown": "#a52a2a",
+    "burlywood": "#deb887",
+    "cadetblue": "#5f9ea0",
+    "chartreuse": "#7fff00",
+    "chocolate": "#d2691e",
+    "coral": "#ff7f50",
+    "cornflowerblue": "#6495ed",
+    "cornsilk": "#fff8dc",
+    "crimson": "#dc143c",
+    "cyan": "#00ffff",
+    "darkblue": "#00008b",
+    "darkcyan": "#008b8b",
+    "darkgoldenrod": "#b8860b",
+    "darkgray": "#a9a9a9",
+    "darkgreen": "#006400",
+    "darkgrey": "#a9a9a9",
+    "darkkhaki": "#bdb76b",
+    "darkmagenta": "#8b008b",
+    "darkolivegreen": "#556b2f",
+    "darkorange": "#ff8c00",
+    "darkorchid": "#9932cc",
+    "darkred": "#8b0000",
+    "darksalmon": "#e9967a",
+    "darkseagreen": "#8fbc8f",
+    "darkslateblue": "#483d8b",
+    "darkslategray": "#2f4f4f",
+    "darkslategrey": "#2f4f4f",
+    "darkturquoise": "#00ced1",
+    "darkviolet": "#9400d3",
+    "deeppink": "#ff1493",
+    "deepskyblue": "#00bfff",
+    "dimgray": "#696969",
+    "dimgrey": "#696969",
+    "dodgerblue": "#1e90ff",
+    "firebrick": "#b22222",
+    "floralwhite": "#fffaf0",
+    "forestgreen": "#228b22",
+    "fuchsia": "#ff00ff",
+    "gainsboro": "#dcdcdc",
+    "ghostwhite": "#f8f8ff",
+    "gold": "#ffd700",
+    "goldenrod": "#daa520",
+    "gray": "#808080",
+    "green": "#008000",
+    "greenyellow": "#adff2f",
+    "grey": "#808080",
+    "honeydew": "#f0fff0",
+    "hotpink": "#ff69b4",
+    "indianred": "#cd5c5c",
+    "indigo": "#4b0082",
+    "ivory": "#fffff0",
+    "khaki": "#f0e68c",
+    "lavender": "#e6e6fa",
+    "lavenderblush": "#fff0f5",
+    "lawngreen": "#7cfc00",
+    "lemonchiffon": "#fffacd",
+    "lightblue": "#add8e6",
+    "lightcoral": "#f08080",
+    "lightcyan": "#e0ffff",
+    "lightgoldenrodyellow": "#fafad2",
+    "lightgray": "#d3d3d3",
+    "lightgreen": "#90ee90",
+    "lightgrey": "#d3d3d3",
+    "lightpink": "#ffb6c1",
+    "lightsalmon": "#ffa07a",
+    "lightseagreen": "#20b2aa",
+    "lightskyblue": "#87cefa",
+    "lightslategray": "#778899",
+    "lightslategrey": "#778899",
+    "lightsteelblue": "#b0c4de",
+    "lightyellow": "#ffffe0",
+    "lime": "#00ff00",
+    "limegreen": "#32cd32",
+    "linen": "#faf0e6",
+    "magenta": "#ff00ff",
+    "maroon": "#800000",
+    "mediumaquamarine": "#66cdaa",
+    "mediumblue": "#0000cd",
+    "mediumorchid": "#ba55d3",
+    "mediumpurple": "#9370db",
+    "mediumseagreen": "#3cb371",
+    "mediumslateblue": "#7b68ee",
+    "mediumspringgreen": "#00fa9a",
+    "mediumturquoise": "#48d1cc",
+    "mediumvioletred": "#c71585",
+    "midnightblue": "#191970",
+    "mintcream": "#f5fffa",
+    "mistyrose": "#ffe4e1",
+    "moccasin": "#ffe4b5",
+    "navajowhite": "#ffdead",
+    "navy": "#000080",
+    "oldlace": "#fdf5e6",
+    "olive": "#808000",
+    "olivedrab": "#6b8e23",
+    "orange": "#ffa500",
+    "orangered": "#ff4500",
+    "orchid": "#da70d6",
+    "palegoldenrod": "#eee8aa",
+    "palegreen": "#98fb98",
+    "paleturquoise": "#afeeee",
+    "palevioletred": "#db7093",
+    "papayawhip": "#ffefd5",
+    "peachpuff": "#ffdab9",
+    "peru": "#cd853f",
+    "pink": "#ffc0cb",
+    "plum": "#dda0dd",
+    "powderblue": "#b0e0e6",
+    "purple": "#800080",
+    "rebeccapurple": "#663399",
+    "red": "#ff0000",
+    "rosybrown": "#bc8f8f",
+    "royalblue": "#4169e1",
+    "saddlebrown": "#8b4513",
+    "salmon": "#fa8072",
+    "sandybrown": "#f4a460",
+    "seagreen": "#2e8b57",
+    "seashell": "#fff5ee",
+    "sienna": "#a0522d",
+    "silver": "#c0c0c0",
+    "skyblue": "#87ceeb",
+    "slateblue": "#6a5acd",
+    "slategray": "#708090",
+    "slategrey": "#708090",
+    "snow": "#fffafa",
+    "springgreen": "#00ff7f",
+    "steelblue": "#4682b4",
+    "tan": "#d2b48c",
+    "teal": "#008080",
+    "thistle": "#d8bfd8",
+    "tomato": "#ff6347",
+    "turquoise": "#40e0d0",
+    "violet": "#ee82ee",
+    "wheat": "#f5deb3",
+    "white": "#ffffff",
+    "whitesmoke": "#f5f5f5",
+    "yellow": "#ffff00",
+    "yellowgreen": "#9acd32",
+}
+# The keyword of each hex value, the shorter when there are two
+_COLOR_KEYWORDS = {
+    hex_color: keyword
+    for keyword, hex_color in sorted(COLORS.items(), key=lambda item: -len(item[0]))
+}
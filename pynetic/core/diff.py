@@ -0,0 +1,364 @@
+"""pynetic diff engine
+
+Compares snapshots of an element tree taken before and after References change and
+produces the minimal list of patches needed to update the rendered page, rather than
+re-rendering whole subtrees.
+
+Nodes are addressed by a path of child indexes from the root. An element's children are
+its text content (if any) followed by its resolved children, i.e. `For` loops expanded and
+references replaced by their text. Patches are applied in order and every index refers
+to the page as it is at the time the patch is applied.
+
+Operations:
+    set-text: `(path, text)` replaces the text node at `path`
+    set-attr: `(path, name, value)` sets an attribute, or removes it when `value` is `None`
+    insert: `(path, index, html)` inserts rendered HTML as child `index` of `path`
+    remove: `(path, index)` removes child `index` of `path`
+    move: `(path, from_index, to_index)` pops child `from_index` of `path` then inserts it
+        back at `to_index`
+
+Usage:
+    ```Python
+    before = snapshot(page)
+    todos.append("Write docs")
+    patches = diff(before, snapshot(page))
+    ```
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import defaultdict, deque
+from collections.abc import Hashable
+from html import escape
+from typing import Any, NamedTuple
+
+from .html import HTMLElement, _resolve
+
+__all__ = ("Patch", "VNode", "diff", "snapshot")
+
+SET_TEXT = "set-text"
+SET_ATTR = "set-attr"
+INSERT = "insert"
+REMOVE = "remove"
+MOVE = "move"
+
+
+class Patch(NamedTuple):
+    """A single change to the rendered page, see the module docstring for operations"""
+
+    op: str
+    path: tuple[int, ...]
+    args: tuple[Any, ...]
+
+
+class VNode:
+    """An element as it was when the snapshot was taken
+
+    Args:
+        tag (str): The element's tag
+        attributes (dict[str, str]): The rendered attributes, including id, class and style
+        key (Hashable | None): The element's key amongst its siblings
+        self_closing (bool): Whether the element is self closing
+        hash (int | None):
+            The element's content hash when it's static. Two nodes with the same hash have
+            the same content, so diffing them is skipped
+    """
+
+    __slots__ = ("tag", "attributes", "key", "self_closing", "hash", "children")
+
+    def __init__(
+        self,
+        tag: str,
+        attributes: dict[str, str],
+        key: Hashable | None = None,
+        self_closing: bool = False,
+        hash: int | None = None,
+    ) -> None:
+        self.tag = tag
+        self.attributes = attributes
+        self.key = key
+        self.self_closing = self_closing
+        self.hash = hash
+        self.children: list[VNode | str] = []
+
+    def __repr__(self) -> str:
+        return f"<vnode {self.tag} ({len(self.children)} children)>"
+
+    def render(self) -> str:
+        """Renders the node and its children to HTML"""
+        chunks: list[str] = []
+        stack: list[VNode | str] = [self]
+
+        while stack:
+            node = stack.pop()
+
+            if isinstance(node, str):
+                chunks.append(node)
+                continue
+
+            chunks.append(f"<{node.tag}")
+            chunks.extend(f' {name}="{escape(value)}"' for name, value in node.attributes.items())
+            chunks.append(">")
+
+            if node.self_closing:
+                continue
+
+            stack.append(f"</{node.tag}>")
+            stack.extend(
+                escape(child, quote=False) if isinstance(child, str) else child
+                for child in reversed(node.children)
+            )
+
+        return "".join(chunks)
+
+
+def snapshot(*elements: str | HTMLElement) -> list[VNode | str]:
+    """Captures elements, with `For` loops and references resolved, for diffing later"""
+    roots: list[VNode | str] = []
+    stack: list[tuple[str | HTMLElement, list[VNode | str]]] = [
+        (element, roots) for element in reversed(elements)
+    ]
+
+    while stack:
+        element, siblings = stack.pop()
+
+        if isinstance(element, str):
+            siblings.append(element)
+            continue
+
+        node = VNode(
+            element._tag,
+            element._attributes(),
+            element._key,
+            element._self_closing,
+            # Leaves are as quick to compare as to hash, so only static parents are hashed
+            element.content_hash if element._static and element._children else None,
+        )
+        siblings.append(node)
+
+        if element._self_closing:
+            continue
+
+        if element._content:
+            node.children.append(element._content)
+
+        stack.extend(
+            (child, node.children) for child in reversed(list(_resolve(element._children)))
+        )
+
+    return roots
+
+
+def diff(old: list[VNode | str], new: list[VNode | str]) -> list[Patch]:
+    """Compares two snapshots, returning the patches that turn `old` into `new`
+
+    Children are matched by key where they have one, and otherwise in order by tag, so
+    keyed children that are reordered are moved instead of being re-created.
+    Only children that fall outside the longest run already in order are moved.
+
+    Args:
+        old (list[VNode | str]): The snapshot before the change
+        new (list[VNode | str]): The snapshot after the change
+
+    Returns:
+        list[Patch]: The patches to apply, in order
+    """
+    patches: list[Patch] = []
+    old_root, new_root = VNode("", {}), VNode("", {})
+    old_root.children, new_root.children = old, new
+    stack: list[tuple[tuple[int, ...], VNode | str, VNode | str]] = [((), old_root, new_root)]
+
+    while stack:
+        path, old_node, new_node = stack.pop()
+
+        if isinstance(old_node, str) or isinstance(new_node, str):
+            if old_node != new_node:
+                patches.append(Patch(SET_TEXT, path, (new_node,)))
+
+            continue
+
+        if old_node.hash is not None and old_node.hash == new_node.hash:
+            continue
+
+        _diff_attributes(path, old_node.attributes, new_node.attributes, patches)
+        matches = _diff_children(path, old_node.children, new_node.children, patches)
+
+        # Visiting the children after their parent is rearranged means every path below
+        # uses the child's final index
+        stack.extend(
+            ((*path, index), old_node.children[match], new_node.children[index])
+            for index, match in reversed(list(enumerate(matches)))
+            if match is not None
+        )
+
+    return patches
+
+
+def _diff_attributes(
+    path: tuple[int, ...], old: dict[str, str], new: dict[str, str], patches: list[Patch]
+) -> None:
+    """Adds the patches for attributes that were added, changed or removed"""
+    if old == new:
+        return
+
+    patches.extend(
+        Patch(SET_ATTR, path, (name, value))
+        for name, value in new.items()
+        if old.get(name) != value
+    )
+    patches.extend(Patch(SET_ATTR, path, (name, None)) for name in old.keys() - new.keys())
+
+
+def _match(old: list[VNode | str], new: list[VNode | str]) -> list[int | None]:
+    """Matches each new child to the index of the old child it updates, if any
+
+    Keyed elements match the old element with the same key and tag. Everything else
+    matches the next unmatched old child of the same tag (or the next text node).
+    """
+    keyed: dict[Hashable, int] = {}
+    unkeyed: defaultdict[str | None, deque[int]] = defaultdict(deque)
+
+    for index, child in enumerate(old):
+        if isinstance(child, str):
+            unkeyed[None].append(index)
+        elif child.key is not None and child.key not in keyed:
+            keyed[child.key] = index
+        else:
+            unkeyed[child.tag].append(index)
+
+    matches: list[int | None] = []
+
+    for child in new:
+        if isinstance(child, str):
+            matches.append(unkeyed[None].popleft() if unkeyed[None] else None)
+
+        elif child.key is not None and (index := keyed.pop(child.key, None)) is not None:
+            matches.append(index if old[index].tag == child.tag else None)  # type: ignore
+
+        else:
+            matches.append(unkeyed[child.tag].popleft() if unkeyed[child.tag] else None)
+
+    return matches
+
+
+def _longest_increasing(sequence: list[int]) -> set[int]:
+    """Returns the values making up the longest strictly increasing subsequence"""
+    tails: list[int] = []  # the smallest tail value of an increasing run of each length
+    tail_positions: list[int] = []
+    previous: list[int] = [-1] * len(sequence)
+
+    for position, value in enumerate(sequence):
+        length = bisect_left(tails, value)
+
+        if length:
+            previous[position] = tail_positions[length - 1]
+
+        if length == len(tails):
+            tails.append(value)
+            tail_positions.append(position)
+        else:
+            tails[length] = value
+            tail_positions[length] = position
+
+    result: set[int] = set()
+    position = tail_positions[-1] if tail_positions else -1
+
+    while position != -1:
+        result.add(sequence[position])
+        position = previous[position]
+
+    return result
+
+
+def _diff_children(
+    path: tuple[int, ...], old: list[VNode | str], new: list[VNode | str], patches: list[Patch]
+) -> list[int | None]:
+    """Adds the patches rearranging the children of `path`, returning the matched children"""
+    if len(old) == len(new) and all(
+        old_child.tag == new_child.tag and old_child.key == new_child.key  # type: ignore
+        if isinstance(old_child, VNode) and isinstance(new_child, VNode)
+        else isinstance(old_child, str) and isinstance(new_child, str)
+        for old_child, new_child in zip(old, new)
+    ):
+        return list(range(len(new)))
+
+    matches = _match(old, new)
+    kept = set(matches)
+
+    # Remove from the end first so the remaining indexes stay valid
+    patches.extend(
+        Patch(REMOVE, path, (index,)) for index in reversed(range(len(old))) if index not in kept
+    )
+
+    kept_in_order = [index for index in range(len(old)) if index in kept]
+
+    if [match for match in matches if match is not None] == kept_in_order:
+        patches.extend(
+            Patch(INSERT, path, (index, _html(child)))
+            for index, child in enumerate(new)
+            if matches[index] is None
+        )
+        return matches
+
+    # Children in the longest run that is already in order stay put. Working backwards from
+    # the end, everything else is placed in front of the child after it, so placed children
+    # form a run in front of the next stable child (or the end, counted as `len(old)`).
+    # A child's index is then the number of unmoved old children before it plus the number
+    # of placed children in runs ending at or before it, both kept in `_Counts`.
+    stable = _longest_increasing([match for match in matches if match is not None])
+    unmoved = _Counts(len(old) + 1)
+    placed = _Counts(len(old) + 1)
+    run_end = len(old)
+
+    for index in kept_in_order:
+        unmoved.add(index, 1)
+
+    for index in reversed(range(len(new))):
+        match = matches[index]
+
+        if match is None:
+            position = unmoved.before(run_end) + placed.before(run_end)
+            patches.append(Patch(INSERT, path, (position, _html(new[index]))))
+            placed.add(run_end, 1)
+
+        elif match in stable:
+            run_end = match
+
+        else:
+            position = unmoved.before(match) + placed.before(match + 1)
+            unmoved.add(match, -1)
+            patches.append(
+                Patch(MOVE, path, (position, unmoved.before(run_end) + placed.before(run_end)))
+            )
+            placed.add(run_end, 1)
+
+    return matches
+
+
+class _Counts:
+    """Fenwick tree of counts, for the number of children before an index in O(log n)"""
+
+    __slots__ = ("tree",)
+
+    def __init__(self, size: int) -> None:
+        self.tree = [0] * (size + 1)
+
+    def add(self, index: int, amount: int) -> None:
+        index += 1
+        while index < len(self.tree):
+            self.tree[index] += amount
+            index += index & -index
+
+    def before(self, index: int) -> int:
+        """The total of the counts at indexes less than `index`"""
+        total = 0
+        while index > 0:
+            total += self.tree[index]
+            index -= index & -index
+
+        return total
+
+
+def _html(node: VNode | str) -> str:
+    return escape(node, quote=False) if isinstance(node, str) else node.render()
@@ -5,9 +5,14 @@ These are abstractions from traditional HTML elements
 With inspiration from Flutter
 """
 
+from __future__ import annotations
+
+from collections.abc import Callable
 from enum import Enum
+from functools import cache
 
-from .html import Div, HTMLElement
+from ..html import Div, HTMLElement
+from .css_extensions import UTILITY_PREFIX, Utility, utility
 
 # An alias for `html.Div` for readability purposes
 Container = Div
@@ -22,40 +27,54 @@ class FlexDirection(Enum):
 
     # Row
     row = "row"
-    vertical = "row"
-    top_down = "row"
+    horizontal = "row"
+    left_to_right = "row"
 
     # Row Reverse
     row_reverse = "row-reverse"
-    vertial_reverse = "row-reverse"
-    bottom_up = "row-reverse"
+    horizontal_reverse = "row-reverse"
+    right_to_left = "row-reverse"
 
     # Column
     column = "column"
-    horizontal = "column"
-    left_to_right = "column"
+    vertical = "column"
+    top_down = "column"
 
     # Column Reverse
-    column_reverse = "column_reverse"
-    horizontal_reverse = "column_reverse"
-    right_to_left = "column_reverse"
+    column_reverse = "column-reverse"
+    vertial_reverse = "column-reverse"
+    bottom_up = "column-reverse"
 
 
 def FlexBox(
     direction: FlexDirection = FlexDirection.row,
     /,
-) -> Callable[HTMLElement, HTMLElement]:
+) -> Callable[..., HTMLElement]:
     """Returns a `Div` with a display of flex
 
     Args:
         direction (FlexDirection): Direction of the resulting Element
 
     Usage:
-        TODO
+        ```Python
+        FlexBox(FlexDirection.column)(
+            Flex(1)("Hello"),
+            Flex(2)("World"),
+        )
+        ```
     """
+    flex_box = _flex_box(direction)
 
     def MakeFlexBox(*elements: str | HTMLElement) -> HTMLElement:
-        return Div(
-            *elements,
-            style={"display": "flex"},
-        )
+        return flex_box.apply(Div(*elements))
+
+    return MakeFlexBox
+
+
+@cache
+def _flex_box(direction: FlexDirection) -> Utility:
+    """The `FlexBox` utility for the direction, registered on first use"""
+    return utility(
+        f"{UTILITY_PREFIX}flex-box-{direction.value}",
+        {"display": "flex", "flex_direction": direction.value},
+    )
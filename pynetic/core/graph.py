@@ -0,0 +1,192 @@
+"""pynetic dependency graph
+
+Links each `Reference` to what's derived from it and to the elements that read it. When
+references change, `DependencyGraph.invalidate` visits everything downstream of them once,
+in topological order, so a node is only updated after everything it depends on. With
+diamond dependencies, i.e. an element reading two values derived from the same reference,
+the element is still only updated once.
+
+Nodes are:
+    References: Sources, changed by the app
+    Derived values: `Computed` references and anything else with an `_invalidate()`
+        method, called when an input changes
+    Elements: `HTMLElement`s reading a reference or derived value, their cached HTML is
+        cleared and the topmost of them are returned to be re-rendered
+    Readers: Anything else recorded as reading a reference, which is kept track of but
+        has nothing to update
+
+Usage:
+    ```Python
+    graph = DependencyGraph()
+    graph.track(*home.elements)
+    graph.add(todos, remaining)
+    dirty = graph.invalidate(todos)
+    ```
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Any
+
+from .html import HTMLElement
+from .reference import Computed, Reference
+from .utils import For
+
+__all__ = ("DependencyGraph",)
+
+
+class DependencyGraph:
+    """Directed graph from each node to the nodes that depend on it
+
+    Nodes are kept by identity, as references compare by their values.
+    """
+
+    def __init__(self) -> None:
+        self._nodes: dict[int, Any] = {}
+        # Dicts are used as insertion ordered sets, so passes are deterministic
+        self._dependents: dict[int, dict[int, None]] = {}
+        self._dependencies: dict[int, dict[int, None]] = {}
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, node: Any) -> bool:
+        return id(node) in self._nodes
+
+    def add(self, source: Any, dependent: Any) -> None:
+        """Records that `dependent` reads `source`"""
+        for node in (source, dependent):
+            if id(node) not in self._nodes:
+                self._nodes[id(node)] = node
+                self._dependents[id(node)] = {}
+                self._dependencies[id(node)] = {}
+
+        self._dependents[id(source)][id(dependent)] = None
+        self._dependencies[id(dependent)][id(source)] = None
+
+    def remove(self, node: Any) -> None:
+        """Removes the node and its edges, i.e. once a derived value is no longer used"""
+        if id(node) not in self._nodes:
+            return
+
+        for source in self._dependencies.pop(id(node)):
+            self._dependents[source].pop(id(node), None)
+
+        for dependent in self._dependents.pop(id(node)):
+            self._dependencies[dependent].pop(id(node), None)
+
+        del self._nodes[id(node)]
+
+    def unlink(self, source: Any, dependent: Any) -> None:
+        """Removes the edge from `source` to `dependent`, i.e. once it's no longer read"""
+        self._dependents.get(id(source), {}).pop(id(dependent), None)
+        self._dependencies.get(id(dependent), {}).pop(id(source), None)
+
+    def dependents(self, node: Any) -> list[Any]:
+        """The nodes that read the node directly"""
+        return [self._nodes[dependent] for dependent in self._dependents.get(id(node), ())]
+
+    def dependencies(self, node: Any) -> list[Any]:
+        """The nodes the node reads directly"""
+        return [self._nodes[source] for source in self._dependencies.get(id(node), ())]
+
+    def track(self, *elements: str | HTMLElement) -> None:
+        """Links every element to the references and derived values it reads directly
+
+        References read in attributes, styles, children and by `For` loops are found,
+        static subtrees are skipped as they can't read any. Elements made by `For` loops
+        are re-created on every render, so it's the element holding the loop that's linked.
+        """
+        stack = [element for element in elements if isinstance(element, HTMLElement)]
+
+        while stack:
+            element = stack.pop()
+
+            if element._static:
+                continue
+
+            for value in (
+                *element._named_children.values(),
+                *element._styles.values(),
+                *element._children,
+            ):
+                if isinstance(value, For):
+                    value = value.each
+
+                if isinstance(value, Reference) or _is_derived(value):
+                    self.add(value, element)
+
+            stack.extend(child for child in element._children if isinstance(child, HTMLElement))
+
+    def order(self, *changed: Any) -> list[Any]:
+        """Every node downstream of the changed nodes, each after all of its dependencies
+
+        Raises:
+            ValueError: The nodes depend on each other in a cycle
+        """
+        reachable: dict[int, None] = {}
+        queue = deque(id(node) for node in changed if id(node) in self._nodes)
+
+        while queue:
+            for dependent in self._dependents[queue.popleft()]:
+                if dependent not in reachable:
+                    reachable[dependent] = None
+                    queue.append(dependent)
+
+        # Kahn's algorithm over the reachable nodes, counting only edges from nodes that
+        # will themselves be visited, the changed nodes are already up to date
+        waiting = {
+            node: sum(source in reachable for source in self._dependencies[node])
+            for node in reachable
+        }
+        ready = deque(node for node, count in waiting.items() if count == 0)
+        ordered: list[Any] = []
+
+        while ready:
+            node = ready.popleft()
+            ordered.append(self._nodes[node])
+
+            for dependent in self._dependents[node]:
+                waiting[dependent] -= 1
+
+                if waiting[dependent] == 0:
+                    ready.append(dependent)
+
+        if len(ordered) != len(reachable):
+            raise ValueError("References and derived values depend on each other in a cycle")
+
+        return ordered
+
+    def invalidate(self, *changed: Any) -> list[HTMLElement]:
+        """Updates everything downstream of the changed nodes in one pass, see `order`
+
+        Derived values are invalidated and the cached HTML of elements is cleared.
+
+        Returns:
+            list[HTMLElement]:
+                The elements to re-render, leaving out those inside another one, in the
+                order they were reached
+        """
+        elements: dict[int, HTMLElement] = {}
+
+        for node in self.order(*changed):
+            if isinstance(node, HTMLElement):
+                node._invalidate(static=False)
+                elements[id(node)] = node
+            elif _is_derived(node):
+                node._invalidate()
+
+        return [element for element in elements.values() if not _has_ancestor(element, elements)]
+
+
+def _is_derived(node: Any) -> bool:
+    # References answer every attribute lookup, so they're ruled out first
+    return isinstance(node, Computed) or (
+        not isinstance(node, (Reference, HTMLElement))
+        and callable(getattr(node, "_invalidate", None))
+    )
+
+
+def _has_ancestor(element: HTMLElement, elements: dict[int, HTMLElement]) -> bool:
+    return any(id(ancestor) in elements for ancestor in element._ancestors())
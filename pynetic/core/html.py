@@ -5,101 +5,694 @@ HTML tags act as components and as page elements depending upon use and location
 
 from __future__ import annotations
 
-from collections.abc import Callable, Iterable
+from collections.abc import (
+    AsyncGenerator,
+    Callable,
+    Generator,
+    Hashable,
+    Iterable,
+    Mapping,
+)
+from functools import cache
+from hashlib import blake2b
+from html import escape
+from types import MappingProxyType
 from typing import Any, Type, TypeAlias
 
-from css import Style  # type: ignore
-from lxml.html import builder as HTMLBuilder
+from . import css
+from .css import Style, inline_style
+from .reference import Reference
+from .utils import For
 
 __code: TypeAlias = Any
 
+# Chunks are buffered up to roughly this many characters before being yielded,
+# so a streamed response isn't sent one tag at a time
+STREAM_CHUNK_SIZE = 16_384
+
+DOCTYPE = "<!DOCTYPE html>"
+
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+@cache
+def _kebab(name: str) -> str:
+    """Converts a snake_case name to kebab-case
+
+    Cached as the same handful of class and attribute names are used over and over, which
+    also lets every element share the one converted string.
+    """
+    return name.replace("_", "-")
+
 
 class HTMLElement:
     """The Base HTML element in which all other elements derive from
 
     Args:
-        children (str | HTMLElement, optional):
+        children (str | HTMLElement | For | Reference, optional):
             Sub-elements to render within this element
         classes (str | Iterable[str], optional):
             Custom HTML classes to use in rendered HTML
         id (str): Custom HTML id to use in rendered HTML
+        key (Hashable, optional):
+            Identifies the element amongst its siblings when diffing, so a reordered
+            element is moved rather than re-created. Set automatically for `For` loops
     """
 
+    __slots__ = (
+        "_parents",
+        "_cache",
+        "_hash",
+        "_static",
+        "_id",
+        "_key",
+        "_content",
+        "_classes",
+        "_children",
+        "_named_children",
+        "_events",
+        "_styles",
+    )
+
     _tag: str = "html"
     _self_closing: bool = False
 
     def __init__(
         self,
-        *__children: str | HTMLElement,
+        *__children: str | HTMLElement | For | Reference,
         classes: str | Iterable[str] = "",
         children: Iterable[str | HTMLElement] = "",
         id: str | None = None,
-        styles: Iterable[Style],
-        **kwargs: str | Callable,
+        key: Hashable | None = None,
+        styles: Iterable[Style] = (),
+        **kwargs: str | Reference | Callable,
     ) -> None:
+        # Every element it's a child of, as an element can be reused in several places
+        self._parents: tuple[HTMLElement, ...] = ()
+        self._cache: bytes | None = None
+        self._hash: int | None = None
         self._id = id
-        self._content: str = ""
-        self._children = list(children)
-        self._named_children: dict[str, str] = {}
-        self._events: dict[str, Callable] = {}
-        self.elements: list[HTMLElement] = []
-        self._styles = {}
+        self._key = key
+        self._content: str = next((child for child in __children if isinstance(child, str)), "")
+        self._children: tuple[str | HTMLElement | Style | For | Reference, ...] = (
+            *children,
+            *(
+                child
+                for child in __children
+                if isinstance(child, (HTMLElement, Style, For, Reference))
+            ),
+        )
 
-        for name, value in kwargs.items():
-            if isinstance(value, str):
-                self._named_children[name] = value
+        # Most elements are leaves without attributes, events or styles, so they share one
+        # read-only empty mapping until something is actually added
+        self._named_children: Mapping[str, str | Reference] = _EMPTY
+        self._events: Mapping[str, Callable] = _EMPTY
+        self._styles: Mapping[str, Any] = _EMPTY
 
-            if isinstance(value, Callable):
-                self._events[name] = value
+        if kwargs:
+            self._named_children = {
+                name: value for name, value in kwargs.items() if isinstance(value, (str, Reference))
+            } or _EMPTY
+            self._events = {
+                name: value
+                for name, value in kwargs.items()
+                if not isinstance(value, (str, Reference)) and isinstance(value, Callable)
+            } or _EMPTY
 
-        for child in __children:
-            if isinstance(child, str) and self._content == "":
-                self._content = child
+        for child in self._children:
+            if isinstance(child, HTMLElement):
+                child._parents = (*child._parents, self)
 
-            if isinstance(child, (HTMLElement, Style)):
-                self._children.append(child)
+        # A static element holds nothing that can change once it's created (no events,
+        # references or loops, in itself or any descendant), so it only needs rendering once
+        self._static: bool = (
+            not self._events
+            and not any(isinstance(value, Reference) for value in self._named_children.values())
+            and all(
+                child._static if isinstance(child, HTMLElement) else isinstance(child, (str, Style))
+                for child in self._children
+            )
+        )
 
-        self._classes = (
-            [classes.replace("_", "-")]
+        self._classes: tuple[str, ...] = (
+            ((_kebab(classes),) if classes else ())
             if isinstance(classes, str)
-            else [_class.replace("_", "-") for _class in classes]
+            else tuple(map(_kebab, classes))
         )
 
-    def style(self, **kwargs: str) -> HTMLElement:
+    def style(self, **kwargs: str | Reference | dict[str, Any]) -> HTMLElement:
         """Apply CSS styling to the current element
 
+        Invalidates the precompiled HTML and content hash of this element and every element
+        containing it. In strict mode, see `css.STRICT`, the names are checked first.
+
+        Raises:
+            ValueError: In strict mode, a property or pseudo selector isn't known
+
         Returns:
             HTMLElement: _description_
         """
-        self._styles.update(kwargs)
+        if css.STRICT:
+            css.validate_styles(kwargs)
+
+        if self._styles is _EMPTY:
+            self._styles = {}
+
+        self._styles.update(kwargs)  # type: ignore
+        self._invalidate(static=not any(isinstance(value, Reference) for value in kwargs.values()))
+
+        return self
+
+    def add_classes(self, *classes: str, styles: Iterable[Style] = ()) -> HTMLElement:
+        """Adds classes to the element, along with `Style`s to bundle with it, i.e. those
+        holding the classes' rules. Classes it already has aren't added again.
+
+        Invalidates the precompiled HTML and content hash of this element and every element
+        containing it.
+
+        Returns:
+            HTMLElement: The element
+        """
+        added = tuple(
+            name for name in dict.fromkeys(map(_kebab, classes)) if name not in self._classes
+        )
+        # By identity, references in the children compare equal to anything
+        styles = tuple(
+            style for style in styles if all(style is not child for child in self._children)
+        )
+
+        if added or styles:
+            self._classes = (*self._classes, *added)
+            self._children = (*self._children, *styles)
+            self._invalidate()
+
         return self
 
-    def render(self, tree: HTMLBuilder) -> tuple[HTMLElement, CSSClass, __code]:  # type: ignore
-        """_summary_
+    def _invalidate(self, static: bool = True) -> None:
+        """Clears the precompiled HTML and content hash of this element and every element
+        containing it, after it's changed in place
+
         Args:
-            minified (bool):
-                If True, minifies elements when rendering, otherwise returns human readable syntax.
-        Returns:
-            tuple[str, dict[str, str], str]: tuple of rendered (html, css, js)
+            static (bool): Whether the element can still be static after the change
         """
-        rendered_html = getattr(HTMLBuilder, self._tag.upper())(
-            self,
-            *(
-                child.render()  # type: ignore
-                for child in self._children
-                if isinstance(child, (HTMLElement, Style))
-            ),
+        for element in (self, *self._ancestors()):
+            element._cache = None
+            element._hash = None
+            element._static = element._static and static
+
+    def _ancestors(self) -> list[HTMLElement]:
+        """Every element containing this one, through each of its parents, once each"""
+        ancestors: dict[int, HTMLElement] = {}
+        stack = list(self._parents)
+
+        while stack:
+            if id(element := stack.pop()) not in ancestors:
+                ancestors[id(element)] = element
+                stack.extend(element._parents)
+
+        return list(ancestors.values())
+
+    @property
+    def content_hash(self) -> int:
+        """A Merkle-style hash of the element built from its tag, attributes, styles, text and
+        the hashes of its children
+
+        Computed on first use and kept until the element, or one of its descendants, is
+        restyled, so only the changed path is hashed again.
+        For static elements the hash depends on content alone, so it's stable across
+        processes. References, loops and events are hashed by identity.
+        """
+        if self._hash is None:
+            _hash_tree(self)
+
+        return self._hash  # type: ignore
+
+    def stream(self, chunk_size: int = STREAM_CHUNK_SIZE) -> Generator[bytes, None, None]:
+        """Renders the element as HTML chunks, see `stream`"""
+        return stream(self, chunk_size=chunk_size)
+
+    def astream(self, chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncGenerator[bytes, None]:
+        """Renders the element as HTML chunks asynchronously, see `astream`"""
+        return astream(self, chunk_size=chunk_size)
+
+    def _attributes(self) -> dict[str, str]:
+        """The element's id, classes, attributes and inline styles as unescaped strings"""
+        attributes: dict[str, str] = {}
+
+        if self._id is not None:
+            attributes["id"] = self._id
+
+        if classes := " ".join(_class for _class in self._classes if _class):
+            attributes["class"] = classes
+
+        for name, value in self._named_children.items():
+            attributes[_kebab(name)] = str(_value(value))
+
+        if self._styles:
+            attributes["style"] = inline_style(
+                self._styles
+                if self._static
+                else {name: _value(value) for name, value in self._styles.items()}
+            )
+
+        return attributes
+
+    def _start_tag(self, extra: Mapping[str, str] = _EMPTY) -> str:
+        """Renders the opening tag, including the id, classes, attributes and inline styles
+
+        Args:
+            extra (Mapping[str, str]): Attributes to add that aren't part of the element
+        """
+        if not (attributes := self._attributes() | extra):
+            return f"<{self._tag}>"
+
+        return "".join(
+            (
+                f"<{self._tag}",
+                *(f' {name}="{escape(value)}"' for name, value in attributes.items()),
+                ">",
+            )
         )
 
+    def render(self, backend: str = "string") -> str:
+        """Renders the element and its children to HTML
+
+        Args:
+            backend (str):
+                `"string"` (default) writes the markup straight into a list of chunks.
+                `"lxml"` builds an lxml tree first, which validates tag and attribute names,
+                but is considerably slower and requires lxml to be installed.
+
+        Returns:
+            str: The rendered HTML
+        """
+        if backend not in RENDER_BACKENDS:
+            raise ValueError(
+                f'Unknown render backend "{backend}", expected one of {", ".join(RENDER_BACKENDS)}'
+            )
+
+        return RENDER_BACKENDS[backend](self)
+
 
 def define_element(tag: str, docstring: str, is_self_closing: bool = False) -> type[HTMLElement]:
     class TaggedHTMLElement(HTMLElement):
+        __slots__ = ()
+
         _tag: str = tag
-        _self_closing = not is_self_closing
+        _self_closing = is_self_closing
 
         def __repr__(self):
             return f"<html {tag.lower()} element>"
 
     TaggedHTMLElement.__doc__ = docstring
+    TaggedHTMLElement.__name__ = TaggedHTMLElement.__qualname__ = tag.capitalize()
 
     return TaggedHTMLElement
+
+
+def _value(value: Any) -> Any:
+    """Unwraps a `Reference` to the value it currently holds"""
+    return value._var if isinstance(value, Reference) else value
+
+
+def _resolve(children: Iterable[Any]) -> Generator[str | HTMLElement, None, None]:
+    """Resolves children into the elements and (unescaped) text to render
+
+    `For` loops are expanded, references are replaced by their current value and `Style`
+    children are skipped as they're bundled separately.
+    """
+    for child in children:
+        if isinstance(child, HTMLElement):
+            yield child
+
+        elif isinstance(child, For):
+            for key, result in child.keyed():
+                if isinstance(result, HTMLElement) and result._key is None:
+                    result._key = key
+
+                yield from _resolve((result,))
+
+        elif not isinstance(child, Style):
+            yield str(_value(child))
+
+
+def _hash_tree(element: HTMLElement) -> None:
+    """Hashes the element and any descendants that aren't hashed yet, children first"""
+    stack: list[tuple[HTMLElement, bool]] = [(element, False)]
+
+    while stack:
+        element, children_hashed = stack.pop()
+
+        if not children_hashed:
+            stack.append((element, True))
+            stack.extend(
+                (child, False)
+                for child in element._children
+                if isinstance(child, HTMLElement) and child._hash is None
+            )
+            continue
+
+        parts = (
+            element._tag,
+            element._id,
+            element._classes,
+            element._content,
+            tuple((name, _hash_part(value)) for name, value in element._named_children.items()),
+            tuple((name, _hash_part(value)) for name, value in element._styles.items()),
+            tuple((name, id(handler)) for name, handler in element._events.items()),
+            tuple(_hash_part(child) for child in element._children),
+        )
+        element._hash = int.from_bytes(blake2b(repr(parts).encode(), digest_size=8).digest(), "big")
+
+
+def _hash_part(value: Any) -> Any:
+    """What goes into a parent's hash for a child, attribute or style value"""
+    if isinstance(value, HTMLElement):
+        return value._hash
+
+    # By its rules, in order as they cascade, so static elements hash the same everywhere
+    if isinstance(value, Style):
+        return "Style", value.render()
+
+    if isinstance(value, (Reference, For)) or callable(value):
+        return type(value).__name__, id(value)
+
+    return value
+
+
+def _walk(
+    *elements: str | HTMLElement,
+    precompile: bool = True,
+    extra_attributes: Mapping[int, Mapping[str, str]] = _EMPTY,
+) -> Generator[str | bytes, None, None]:
+    """Walks the elements depth-first yielding HTML fragments
+
+    Uses an explicit stack rather than recursion so deeply nested trees neither hit the
+    recursion limit nor pay for a chain of nested generators on every fragment.
+    Closing tags and escaped text are pushed onto the stack as plain strings.
+
+    With `precompile`, a static subtree is rendered once into UTF-8 bytes, cached on its
+    root element and yielded as-is from then on.
+
+    `extra_attributes` adds attributes to the elements, keyed by the element's `id()`.
+    """
+    stack: list[str | HTMLElement] = list(reversed(elements))
+
+    while stack:
+        element = stack.pop()
+
+        if isinstance(element, str):
+            yield element
+            continue
+
+        if precompile and element._static:
+            if element._cache is None:
+                element._cache = "".join(_walk(element, precompile=False)).encode()  # type: ignore
+
+            yield element._cache
+            continue
+
+        yield element._start_tag(extra_attributes.get(id(element), _EMPTY))
+
+        if element._self_closing:
+            continue
+
+        if element._content:
+            yield escape(element._content, quote=False)
+
+        stack.append(f"</{element._tag}>")
+        stack.extend(
+            reversed(
+                [
+                    escape(child, quote=False) if isinstance(child, str) else child
+                    for child in _resolve(element._children)
+                ]
+            )
+        )
+
+
+def stream(
+    *elements: str | HTMLElement, chunk_size: int = STREAM_CHUNK_SIZE
+) -> Generator[bytes, None, None]:
+    """Renders elements to UTF-8 encoded HTML, yielding chunks as the tree is walked
+
+    Strings passed in as elements are escaped and treated as text. Precompiled static
+    subtrees are spliced into the chunks without being re-encoded.
+
+    Args:
+        *elements (str | HTMLElement): The elements to render, in order
+        chunk_size (int): Approximate number of characters to buffer before yielding
+
+    Yields:
+        bytes: Chunks of rendered HTML
+    """
+    pending: list[str] = []
+    chunk: list[bytes] = []
+    buffered = 0
+
+    for fragment in _walk(
+        *(
+            escape(element, quote=False) if isinstance(element, str) else element
+            for element in elements
+        )
+    ):
+        if isinstance(fragment, str):
+            pending.append(fragment)
+        else:
+            chunk.append("".join(pending).encode())
+            chunk.append(fragment)
+            pending.clear()
+
+        buffered += len(fragment)
+
+        if buffered >= chunk_size:
+            chunk.append("".join(pending).encode())
+            yield b"".join(chunk)
+            pending.clear()
+            chunk.clear()
+            buffered = 0
+
+    if pending or chunk:
+        chunk.append("".join(pending).encode())
+        yield b"".join(chunk)
+
+
+async def astream(
+    *elements: str | HTMLElement, chunk_size: int = STREAM_CHUNK_SIZE
+) -> AsyncGenerator[bytes, None]:
+    """Asynchronous version of `stream`
+
+    Hands control back to the event loop between chunks so a large page doesn't block
+    other requests while it renders.
+    """
+    import asyncio  # deferred as it's only needed once a page is actually served
+
+    for chunk in stream(*elements, chunk_size=chunk_size):
+        yield chunk
+        await asyncio.sleep(0)
+
+
+def render_string(
+    *elements: str | HTMLElement, extra_attributes: Mapping[int, Mapping[str, str]] = _EMPTY
+) -> str:
+    """Renders elements by writing tags, attributes and escaped text into a chunk list
+
+    Args:
+        *elements (str | HTMLElement): The elements to render, in order
+        extra_attributes (Mapping[int, Mapping[str, str]]):
+            Attributes to add to dynamic elements when rendered, keyed by the element's `id()`
+    """
+    return "".join(
+        fragment if isinstance(fragment, str) else fragment.decode()
+        for fragment in _walk(
+            *(
+                escape(element, quote=False) if isinstance(element, str) else element
+                for element in elements
+            ),
+            extra_attributes=extra_attributes,
+        )
+    )
+
+
+def render_lxml(*elements: str | HTMLElement) -> str:
+    """Renders elements by building, then serializing, an lxml tree
+
+    lxml rejects unknown tags and invalid attribute names, which makes this backend useful
+    for validating a tree during development.
+    """
+    try:
+        from lxml.html import builder as HTMLBuilder
+        from lxml.html import tostring
+    except ImportError as error:
+        raise ImportError(
+            'The "lxml" render backend requires lxml. '
+            "Install it with `pip install pynetic[validation]`"
+        ) from error
+
+    def build(element: HTMLElement) -> Any:
+        try:
+            make_element = getattr(HTMLBuilder, element._tag.upper())
+        except AttributeError:
+            raise ValueError(f'"{element._tag}" is not a valid HTML tag') from None
+
+        return make_element(
+            element._attributes(),
+            *((element._content,) if element._content else ()),
+            *(
+                build(child) if isinstance(child, HTMLElement) else child
+                for child in _resolve(element._children)
+            ),
+        )
+
+    return "".join(
+        escape(element, quote=False)
+        if isinstance(element, str)
+        else tostring(build(element), encoding="unicode")
+        for element in elements
+    )
+
+
+RENDER_BACKENDS: dict[str, Callable[..., str]] = {
+    "string": render_string,
+    "lxml": render_lxml,
+}
+
+
+# Tag name: (docstring, is self closing)
+#
+# :ref: https://developer.mozilla.org/en-US/docs/Web/HTML/Element
+TAGS: dict[str, tuple[str, bool]] = {
+    "a": ("A hyperlink to web pages, files, email addresses or locations in the same page", False),
+    "abbr": ("An abbreviation or acronym", False),
+    "address": ("Contact information for a person, people or organization", False),
+    "area": ("A clickable area inside an image map", True),
+    "article": ("A self-contained composition, such as a post or an article", False),
+    "aside": ("A portion of a document only indirectly related to its main content", False),
+    "audio": ("Embeds sound content", False),
+    "b": ("Draws attention to its contents, traditionally rendered as bold", False),
+    "base": ("The base URL to use for all relative URLs in a document", True),
+    "bdi": ("Isolates text that might be formatted in a different direction", False),
+    "bdo": ("Overrides the current directionality of text", False),
+    "blockquote": ("An extended quotation", False),
+    "body": ("The content of an HTML document", False),
+    "br": ("A line break in text", True),
+    "button": ("An interactive button", False),
+    "canvas": ("A container for graphics drawn with the canvas or WebGL APIs", False),
+    "caption": ("The caption, or title, of a table", False),
+    "cite": ("The title of a cited creative work", False),
+    "code": ("A fragment of computer code", False),
+    "col": ("A column within a column group", True),
+    "colgroup": ("A group of columns within a table", False),
+    "data": ("Links content with a machine-readable translation", False),
+    "datalist": ("A set of options to choose from in other controls", False),
+    "dd": ("The description of a term in a description list", False),
+    "del": ("A range of text that has been deleted from a document", False),
+    "details": ("A disclosure widget, showing its contents when toggled open", False),
+    "dfn": ("The term being defined in a definition", False),
+    "dialog": ("A dialog box or other interactive component", False),
+    "div": ("The generic container for flow content", False),
+    "dl": ("A description list", False),
+    "dt": ("A term in a description list", False),
+    "em": ("Text that has stressed emphasis", False),
+    "embed": ("Embeds external content", True),
+    "fieldset": ("Groups several controls and labels within a form", False),
+    "figcaption": ("A caption describing the rest of its parent figure", False),
+    "figure": ("Self-contained content, optionally with a caption", False),
+    "footer": ("The footer of its nearest sectioning content or root", False),
+    "form": ("A section containing interactive controls for submitting information", False),
+    "h1": ("A level 1 section heading", False),
+    "h2": ("A level 2 section heading", False),
+    "h3": ("A level 3 section heading", False),
+    "h4": ("A level 4 section heading", False),
+    "h5": ("A level 5 section heading", False),
+    "h6": ("A level 6 section heading", False),
+    "head": ("Machine-readable information about the document", False),
+    "header": ("Introductory content, typically navigational aids", False),
+    "hgroup": ("A heading grouped with any secondary content", False),
+    "hr": ("A thematic break between paragraph-level elements", True),
+    "html": ("The root of an HTML document", False),
+    "i": ("Text set off from the normal text, traditionally rendered as italic", False),
+    "iframe": ("A nested browsing context, embedding another page", False),
+    "img": ("Embeds an image", True),
+    "input": ("An interactive control for accepting data from the user", True),
+    "ins": ("A range of text that has been added to a document", False),
+    "kbd": ("Text representing user input", False),
+    "label": ("A caption for an item in a user interface", False),
+    "legend": ("A caption for the content of its parent fieldset", False),
+    "li": ("An item in a list", False),
+    "link": ("A relationship to an external resource, such as a stylesheet", True),
+    "main": ("The dominant content of the body of a document", False),
+    "map": ("An image map, used with area elements", False),
+    "mark": ("Text marked or highlighted for reference", False),
+    "menu": ("A semantic alternative to ul, for a list of commands", False),
+    "meta": ("Metadata that can't be represented by other meta-related elements", True),
+    "meter": ("A scalar value within a known range", False),
+    "nav": ("A section providing navigation links", False),
+    "noscript": ("Content shown when scripting is unsupported or disabled", False),
+    "object": ("An external resource, such as an image or a nested browsing context", False),
+    "ol": ("An ordered list of items", False),
+    "optgroup": ("A grouping of options within a select element", False),
+    "option": ("An item contained in a select, optgroup or datalist", False),
+    "output": ("A container for the result of a calculation or user action", False),
+    "p": ("A paragraph", False),
+    "picture": ("Contains source elements and an img, offering alternative images", False),
+    "pre": ("Preformatted text, presented exactly as written", False),
+    "progress": ("The completion progress of a task", False),
+    "q": ("A short inline quotation", False),
+    "rp": ("Fallback parentheses for browsers without ruby annotation support", False),
+    "rt": ("The ruby text component of a ruby annotation", False),
+    "ruby": ("Small annotations rendered above, below or next to base text", False),
+    "s": ("Text that is no longer relevant or accurate", False),
+    "samp": ("Sample or quoted output from a computer program", False),
+    "script": ("Embeds executable code or data", False),
+    "section": ("A generic standalone section of a document", False),
+    "select": ("A control providing a menu of options", False),
+    "slot": ("A placeholder inside a web component", False),
+    "small": ("Side-comments and small print", False),
+    "source": ("Media resources for picture, audio or video elements", True),
+    "span": ("A generic inline container for phrasing content", False),
+    "strong": ("Content with strong importance, seriousness or urgency", False),
+    "style": ("Style information for a document", False),
+    "sub": ("Inline text displayed as subscript", False),
+    "summary": ("A summary, caption or legend for a details element", False),
+    "sup": ("Inline text displayed as superscript", False),
+    "table": ("Tabular data", False),
+    "tbody": ("Encapsulates a set of table rows", False),
+    "td": ("A cell of a table that contains data", False),
+    "template": ("Holds HTML that is not rendered when the page is loaded", False),
+    "textarea": ("A multi-line plain-text editing control", False),
+    "tfoot": ("A set of rows summarizing the columns of a table", False),
+    "th": ("A cell of a table that is a header", False),
+    "thead": ("A set of rows defining the head of the columns of a table", False),
+    "time": ("A specific period in time", False),
+    "title": ("The document's title shown in the browser's title bar or tab", False),
+    "tr": ("A row of cells in a table", False),
+    "track": ("Timed text tracks for media elements", True),
+    "u": ("A span of text with an unarticulated, non-textual annotation", False),
+    "ul": ("An unordered list of items", False),
+    "var": ("The name of a variable in a mathematical expression or programming context", False),
+    "video": ("Embeds a media player supporting video playback", False),
+    "wbr": ("A position where the browser may optionally break a line", True),
+}
+
+_tagged_elements: dict[str, type[HTMLElement]] = {}
+
+
+def __getattr__(name: str) -> type[HTMLElement]:
+    """Creates the element class for a tag the first time it's imported, i.e. `html.Div`
+
+    Creating all of the element classes up front slows down importing pynetic, so each one
+    is only made when first used, then stored on the module so later lookups skip this.
+    """
+    if not name[:1].isupper() or (tag := name.lower()) not in TAGS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    if tag not in _tagged_elements:
+        _tagged_elements[tag] = define_element(tag, *TAGS[tag])
+
+    globals()[name] = _tagged_elements[tag]
+    return _tagged_elements[tag]
+
+
+def __dir__() -> list[str]:
+    return [*globals(), *(tag.capitalize() for tag in TAGS)]
@@ -0,0 +1,218 @@
+"""pynetic partial hydration
+
+Only elements that are interactive, those with events or that read a `Reference` directly,
+need any code on the client. Each is rendered as an island, marked with a `data-island`
+attribute, and only the islands' bootstrap data and event handlers are sent to the client.
+Everything else on the page is left as plain HTML.
+
+Usage:
+    ```Python
+    html = render_page(home)
+    ```
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from inspect import getsource
+from textwrap import dedent
+from typing import Any, NamedTuple
+
+from . import application
+from .component import Component
+from .html import DOCTYPE, HTMLElement, render_string
+from .reference import Reference
+from .utils import For, iter_short_names
+
+__all__ = ("Island", "find_islands", "render", "render_page")
+
+ISLAND_ATTRIBUTE = "data-island"
+BOOTSTRAP_ID = "pynetic-islands"
+CODE_ID = "pynetic-code"
+# The client-side dict event handlers are registered in by name
+HANDLERS = "_handlers"
+
+
+class Island(NamedTuple):
+    """An interactive element and what it needs on the client
+
+    Args:
+        id (str): Short id the element is marked with
+        element (HTMLElement): The interactive element
+        events (dict[str, Callable]): The element's event handlers
+        references (list[Reference]): The references the element reads directly
+    """
+
+    id: str
+    element: HTMLElement
+    events: dict[str, Callable]
+    references: list[Reference]
+
+
+def is_interactive(element: HTMLElement) -> bool:
+    """Whether the element has events or reads a `Reference` in its attributes, styles or
+    children, including through a `For` loop"""
+    return bool(element._events) or any(
+        isinstance(value, (Reference, For))
+        for value in (
+            *element._named_children.values(),
+            *element._styles.values(),
+            *element._children,
+        )
+    )
+
+
+def find_islands(*elements: str | HTMLElement) -> list[Island]:
+    """Finds the interactive elements, in document order
+
+    Static subtrees can't hold interactive elements, so they aren't searched.
+    """
+    islands: list[Island] = []
+    names = iter_short_names()
+    stack = [element for element in reversed(elements) if isinstance(element, HTMLElement)]
+
+    while stack:
+        element = stack.pop()
+
+        if element._static:
+            continue
+
+        if is_interactive(element):
+            islands.append(
+                Island(
+                    next(names),
+                    element,
+                    dict(element._events),
+                    [
+                        value
+                        for value in (
+                            *element._named_children.values(),
+                            *element._styles.values(),
+                            *(
+                                child.each if isinstance(child, For) else child
+                                for child in element._children
+                            ),
+                        )
+                        if isinstance(value, Reference)
+                    ],
+                )
+            )
+
+        stack.extend(
+            child for child in reversed(element._children) if isinstance(child, HTMLElement)
+        )
+
+    return islands
+
+
+def bootstrap(islands: list[Island]) -> str:
+    """Renders the scripts the client needs to hydrate the islands
+
+    The bootstrap data maps each island to the names of its event handlers and of the
+    references it reads. References made with `MakeReference` go by their name, others by
+    their slot, i.e. `$3`. The code holds the source of each handler once, followed by
+    its registration in `_handlers` under its name, so handlers sharing a function name
+    don't replace each other.
+    Returns an empty string when there are no islands, so static pages ship no scripts.
+
+    Raises:
+        ValueError: A handler is a lambda, its source can't be sent on its own
+    """
+    if not islands:
+        return ""
+
+    reference_names = {
+        id(reference): name for name, reference in application.Application.references.items()
+    }
+    handler_names: dict[int, str] = {}
+    handlers: list[Callable] = []
+    names = iter_short_names()
+    data: dict[str, Any] = {}
+
+    for island in islands:
+        for handler in island.events.values():
+            if id(handler) not in handler_names:
+                handler_names[id(handler)] = next(names)
+                handlers.append(handler)
+
+        data[island.id] = {
+            "events": {name: handler_names[id(handler)] for name, handler in island.events.items()},
+            "references": [
+                reference_names.get(id(reference), f"${reference._slot}")
+                for reference in island.references
+            ],
+        }
+
+    code = "\n".join(
+        (
+            f"{HANDLERS} = {{}}",
+            *(_handler_code(handler, handler_names[id(handler)]) for handler in handlers),
+        )
+    )
+    # Neither can contain "</" or the browser would end the script early
+    code = code.replace("</", "<\\/")
+    bootstrap_data = json.dumps(data, separators=(",", ":")).replace("</", "<\\/")
+
+    return (
+        f'<script type="application/json" id="{BOOTSTRAP_ID}">{bootstrap_data}</script>'
+        f'<script type="text/python" id="{CODE_ID}">{code}</script>'
+    )
+
+
+def render(*elements: str | HTMLElement) -> tuple[str, list[Island]]:
+    """Renders elements with their interactive elements marked as islands
+
+    Returns:
+        tuple[str, list[Island]]: The rendered HTML and the islands in it
+    """
+    islands = find_islands(*elements)
+    html = render_string(
+        *elements,
+        extra_attributes={id(island.element): {ISLAND_ATTRIBUTE: island.id} for island in islands},
+    )
+
+    return html, islands
+
+
+def render_page(component: Component, head: str = "") -> str:
+    """Renders a full HTML document for the component with only its islands hydrated
+
+    The bootstrap scripts go at the end of the `<body>`, or the end of the document if
+    there isn't one.
+
+    Args:
+        component (Component): The page's component
+        head (str): HTML to add at the end of the `<head>`, or the start of the document if
+            there isn't one, i.e. stylesheet links
+    """
+    html, islands = render(*component.elements)
+    scripts = bootstrap(islands)
+    body_end = html.rfind("</body>")
+
+    if body_end != -1:
+        html = f"{html[:body_end]}{scripts}{html[body_end:]}"
+    else:
+        html += scripts
+
+    if head and (head_end := html.find("</head>")) != -1:
+        return f"{DOCTYPE}{html[:head_end]}{head}{html[head_end:]}"
+
+    return f"{DOCTYPE}{head}{html}"
+
+
+def _handler_code(handler: Callable, name: str) -> str:
+    """The handler's source code registering it under the name, or an empty string when
+    its source isn't available (i.e. builtins)"""
+    if getattr(handler, "__name__", "") == "<lambda>":
+        raise ValueError(
+            f"Event handler lambda in {handler.__module__} can't be sent to the client, "
+            "define it with def instead"
+        )
+
+    try:
+        source = dedent(getsource(handler))
+    except (OSError, TypeError):
+        return ""
+
+    return f'{source}\n{HANDLERS}["{name}"] = {handler.__name__}'
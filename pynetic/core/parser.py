@@ -1,6 +1,332 @@
-from ast import parse as ast_parse
+"""pynetic static analyzer
 
+Works out, without running anything, which functions and components read or write which
+references. References are the names assigned in a `with MakeReference():` block, see
+`reference`. Functions and methods are keyed by their module and qualified name, i.e.
+`routes.index:increment`, and components by the module level name they're assigned to.
 
-def parse(filename: str) -> None:
-    with open(filename) as of:
-        tree = ast_parse(of.read())
+The table is written when the app is built and loaded when it starts. The components and
+computed values reading each reference are then linked to it in the dependency graph, see
+`Application.link`, without inspecting frames at runtime.
+
+Usage:
+    ```Python
+    dependencies = analyze(index, state)
+    dependencies.reads["routes.index:increment"]
+    dependencies.save(BUILD_FOLDER.joinpath(DEPENDENCIES))
+    ```
+"""
+
+from __future__ import annotations
+
+import ast
+import json
+from pathlib import Path
+from types import ModuleType
+from typing import NamedTuple
+
+__all__ = ("DEPENDENCIES", "Dependencies", "analyze", "parse", "read_dependencies")
+
+DEPENDENCIES = "dependencies.json"
+
+
+class Dependencies(NamedTuple):
+    """The dependency table
+
+    Args:
+        references (dict[str, str]): The module each reference is made in, by name
+        reads (dict[str, tuple[str, ...]]): The references each function or component reads
+        writes (dict[str, tuple[str, ...]]): The references each function or component writes
+    """
+
+    references: dict[str, str]
+    reads: dict[str, tuple[str, ...]]
+    writes: dict[str, tuple[str, ...]]
+
+    def save(self, path: Path) -> None:
+        path.write_text(json.dumps(self._asdict(), indent=2), encoding="utf-8")
+
+
+def read_dependencies(folder: Path) -> Dependencies | None:
+    """The dependency table written to the build folder, or `None` if it hasn't been built"""
+    try:
+        table = json.loads(folder.joinpath(DEPENDENCIES).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+
+    return Dependencies(
+        table["references"],
+        {reader: tuple(names) for reader, names in table["reads"].items()},
+        {writer: tuple(names) for writer, names in table["writes"].items()},
+    )
+
+
+def parse(filename: str | Path) -> ast.Module:
+    with open(filename, encoding="utf-8") as of:
+        return ast.parse(of.read(), filename=str(filename))
+
+
+def analyze(*modules: ModuleType) -> Dependencies:
+    """Builds the dependency table of the modules from their source
+
+    Modules without a source file, i.e. builtins, are skipped.
+    """
+    trees = {
+        module.__name__: parse(module.__file__)
+        for module in modules
+        if getattr(module, "__file__", None) and module.__file__.endswith(".py")  # type: ignore
+    }
+    references: dict[str, str] = {}
+
+    for name, tree in trees.items():
+        references.update(dict.fromkeys(_reference_names(tree), name))
+
+    reads: dict[str, tuple[str, ...]] = {}
+    writes: dict[str, tuple[str, ...]] = {}
+    packages = {module.__name__ for module in modules if hasattr(module, "__path__")}
+
+    for name, tree in trees.items():
+        imports = _imports(tree, name, name in packages)
+
+        for qualname, node in _readers(tree):
+            visitor = _Usage(references, imports, name)
+            visitor.visit_scope(node)
+
+            if visitor.reads:
+                reads[f"{name}:{qualname}"] = tuple(visitor.reads)
+            if visitor.writes:
+                writes[f"{name}:{qualname}"] = tuple(visitor.writes)
+
+    return Dependencies(references, reads, writes)
+
+
+def _reference_names(tree: ast.Module) -> list[str]:
+    """The names assigned in the module's `with MakeReference():` blocks"""
+    names: list[str] = []
+
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.With) or not any(
+            _called_name(item.context_expr) == "MakeReference" for item in node.items
+        ):
+            continue
+
+        for statement in node.body:
+            targets = (
+                statement.targets
+                if isinstance(statement, ast.Assign)
+                else [statement.target]
+                if isinstance(statement, ast.AnnAssign)
+                else []
+            )
+            names.extend(target.id for target in targets if isinstance(target, ast.Name))
+
+    return names
+
+
+def _called_name(node: ast.expr) -> str:
+    """The name of `name`, `module.name` or a call of either"""
+    if isinstance(node, ast.Call):
+        node = node.func
+
+    if isinstance(node, ast.Attribute):
+        return node.attr
+
+    return node.id if isinstance(node, ast.Name) else ""
+
+
+def _imports(tree: ast.Module, module: str, package: bool) -> dict[str, tuple[str, str]]:
+    """Each name imported into the module, mapped to the module and name it comes from
+
+    Modules imported whole map to themselves and an empty name, so joining the two with a
+    dot gives the module or object imported.
+    """
+    imports: dict[str, tuple[str, str]] = {}
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname:
+                    imports[alias.asname] = (alias.name, "")
+                else:
+                    imports[alias.name.split(".")[0]] = (alias.name.split(".")[0], "")
+
+        elif isinstance(node, ast.ImportFrom):
+            parts = module.split(".") if package else module.split(".")[:-1]
+            base = ".".join(parts[: len(parts) - node.level + 1] if node.level else [])
+            source = ".".join(filter(None, (base, node.module or "")))
+
+            for alias in node.names:
+                imports[alias.asname or alias.name] = (source, alias.name)
+
+    return imports
+
+
+def _readers(tree: ast.Module) -> list[tuple[str, ast.AST]]:
+    """The functions, methods and module level components, with their qualified names"""
+    readers: list[tuple[str, ast.AST]] = []
+    stack: list[tuple[str, ast.AST]] = [("", tree)]
+
+    while stack:
+        prefix, parent = stack.pop()
+
+        for node in ast.iter_child_nodes(parent):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                readers.append((f"{prefix}{node.name}", node))
+                stack.append((f"{prefix}{node.name}.<locals>.", node))
+
+            elif isinstance(node, ast.ClassDef):
+                stack.append((f"{prefix}{node.name}.", node))
+
+            elif (
+                not prefix
+                and isinstance(node, (ast.Assign, ast.AnnAssign))
+                and node.value is not None
+                and _called_name(node.value) == "Component"
+            ):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                readers.extend(
+                    (target.id, node.value) for target in targets if isinstance(target, ast.Name)
+                )
+
+            elif not isinstance(node, (ast.Lambda, ast.expr)):
+                stack.append((prefix, node))
+
+    return readers
+
+
+class _Usage(ast.NodeVisitor):
+    """Collects the references read and written in one function or component
+
+    Functions nested inside are readers of their own, so they aren't visited. Names that
+    are local to the function shadow references of the same name.
+    """
+
+    def __init__(
+        self, references: dict[str, str], imports: dict[str, tuple[str, str]], module: str
+    ) -> None:
+        self.references = references
+        self.imports = imports
+        self.module = module
+        self.locals: set[str] = set()
+        self.reads: dict[str, None] = {}
+        self.writes: dict[str, None] = {}
+
+    def visit_scope(self, node: ast.AST) -> None:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            self.locals = _local_names(node)
+
+            for statement in node.body:
+                self.visit(statement)
+        else:
+            self.visit(node)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        # Decorators and defaults are evaluated in the enclosing function
+        for expression in (*node.decorator_list, *node.args.defaults, *node.args.kw_defaults):
+            if expression is not None:
+                self.visit(expression)
+
+    visit_AsyncFunctionDef = visit_FunctionDef  # type: ignore[assignment]
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if isinstance(node.ctx, ast.Load) and (name := self._reference(node.id)):
+            self.reads[name] = None
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        if name := self._module_reference(node):
+            self.reads[name] = None
+        else:
+            self.generic_visit(node)
+
+    def visit_AugAssign(self, node: ast.AugAssign) -> None:
+        self._write(node.target, also_read=True)
+        self.visit(node.value)
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        for target in node.targets:
+            self._write(target)
+
+        self.visit(node.value)
+
+    def visit_Delete(self, node: ast.Delete) -> None:
+        for target in node.targets:
+            self._write(target)
+
+    def _write(self, target: ast.expr, also_read: bool = False) -> None:
+        """Records the reference written by assigning to the target, i.e. `count += 1`,
+        `todos[0] = "a"` or `state.count = 0`"""
+        base = target
+        name = ""
+
+        while isinstance(base, (ast.Subscript, ast.Attribute)):
+            if isinstance(base, ast.Attribute) and (name := self._module_reference(base)):
+                break
+
+            if isinstance(base, ast.Subscript):
+                self.visit(base.slice)
+
+            base = base.value
+
+        if not name and isinstance(base, ast.Name):
+            name = self._reference(base.id)
+
+        if name:
+            self.writes[name] = None
+
+            if also_read or base is not target:
+                self.reads[name] = None
+
+    def _module_reference(self, node: ast.Attribute) -> str:
+        """The reference read as `state.count`, where `state` is the module making `count`,
+        or an empty string"""
+        if isinstance(node.value, ast.Name) and node.value.id not in self.locals:
+            imported = ".".join(filter(None, self.imports.get(node.value.id, ())))
+
+            if imported and self.references.get(node.attr) == imported:
+                return node.attr
+
+        return ""
+
+    def _reference(self, name: str) -> str:
+        """The reference the name refers to in the scope, or an empty string"""
+        if name in self.locals:
+            return ""
+
+        if self.references.get(name) == self.module:
+            return name
+
+        _, original = self.imports.get(name, ("", ""))
+        return original if original in self.references else ""
+
+
+def _local_names(function: ast.FunctionDef | ast.AsyncFunctionDef) -> set[str]:
+    """The names bound in the function, less those declared `global` or `nonlocal`"""
+    arguments = function.args
+    names = {
+        argument.arg
+        for argument in (
+            *arguments.posonlyargs,
+            *arguments.args,
+            *arguments.kwonlyargs,
+            *filter(None, (arguments.vararg, arguments.kwarg)),
+        )
+    }
+    declared: set[str] = set()
+    stack: list[ast.AST] = list(function.body)
+
+    while stack:
+        node = stack.pop()
+
+        if isinstance(node, (ast.Global, ast.Nonlocal)):
+            declared.update(node.names)
+        elif isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+            names.add(node.id)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+            continue
+        elif isinstance(node, ast.Lambda):
+            continue
+
+        stack.extend(ast.iter_child_nodes(node))
+
+    return names - declared
@@ -13,19 +13,39 @@ assigned the name they are given on instantiation
 
 References can be accessed at any time during the session and
 from any page component using import statements
+
+Values derived from references are made with `computed`, they're only worked out again
+once a reference they read changes:
+```Python
+@computed
+def remaining() -> int:
+    return sum(not todo.done for todo in todos)
+```
 """
 
 from __future__ import annotations
 
-from types import CodeType
+import sys
+from collections.abc import Callable, Iterator
+from contextvars import ContextVar
+from enum import Enum
+from functools import update_wrapper
 from typing import Any, Generic, TypeVar
 
-from .application import Application
+from . import application
 
-__all__ = ("Reference", "MakeReference")
+__all__ = ("Computed", "Reference", "MakeReference", "computed")
 
 T = TypeVar("T", bound=Any)
 
+# The references and computed values read while a computed value is worked out, by id
+_reading: ContextVar[dict[int, Reference] | None] = ContextVar("_reading", default=None)
+
+
+class _Stale(Enum):
+    # An enum so it's still the same object once a session is unpickled, see `session`
+    STALE = "stale"
+
 
 # :TODO Finish implementing dunder methods. Unless there's an easier way to do this.
 
@@ -40,17 +60,28 @@ class Reference(Generic[T]):
     """
 
     def __init__(self, var: T) -> None:
-        self._var = var
-        self._modification_checkpoints: dict[str, CodeType] = {}
-
-    def _propagate_modification_checkpoint(self) -> None:
-        """When _var is initially accessed, this function is called.
-        Adds the caller's code object to the `_modification_checkpoints` list so pynetic
-        knows the calling function is a reactive function.
-        Basically binding the object or function to the Reference
-        """
-        caller = self.self.sys._getframe(2).f_code
-        self._modification_checkpoints[caller.f_name] = caller
+        # Each session has its own value, kept in the session store, see `session`
+        self._sessions = application.Application.sessions
+        self._slot = self._sessions.register(var)
+        # Counts the changes in each session, computed values compare it when read
+        self._version_slot = self._sessions.register(0)
+
+    @property
+    def _var(self) -> T:
+        if (reads := _reading.get()) is not None:
+            reads[id(self)] = self
+
+        return self._sessions.get(self._slot)
+
+    @_var.setter
+    def _var(self, value: T) -> None:
+        self._sessions.set(self._slot, value)
+
+    def _changed(self) -> None:
+        """Called after `_var` is changed in place or replaced, schedules an update of
+        everything depending on the Reference, see `scheduler.Scheduler`"""
+        self._sessions.set(self._version_slot, self._sessions.get(self._version_slot) + 1)
+        application.Application.scheduler.changed(self)
 
     # :TODO correct the return type so it returns the correct type
     def __call__(self, *args, **kwargs) -> Any:
@@ -58,39 +89,44 @@ class Reference(Generic[T]):
         return self
 
     def __add__(self, __other: T) -> T:
-        self._add_modification_checkpoint()
-        return __other
+        return self._var + __other
 
     def __sub__(self, __other: T) -> T:
-        self._add_modification_checkpoint()
-        return __other
+        return self._var - __other
 
     def __mul__(self, __other: T) -> T:
-        self._add_modification_checkpoint()
-        return __other
+        return self._var * __other
 
     def __floordiv__(self, __other: T) -> T:
-        self._add_modification_checkpoint()
-        return __other
+        return self._var // __other
 
     def __truediv__(self, __other: T) -> T:
-        self._add_modification_checkpoint()
-        return __other
+        return self._var / __other
 
-    def __iadd__(self, __other: T) -> None:
-        self._add_modification_checkpoint()
+    def __iadd__(self, __other: T) -> Reference[T]:
+        self._var += __other
+        self._changed()
+        return self
 
-    def __isub__(self, __other: T) -> None:
-        self._add_modification_checkpoint()
+    def __isub__(self, __other: T) -> Reference[T]:
+        self._var -= __other
+        self._changed()
+        return self
 
-    def __imul__(self, __other: T) -> None:
-        self._add_modification_checkpoint()
+    def __imul__(self, __other: T) -> Reference[T]:
+        self._var *= __other
+        self._changed()
+        return self
 
-    def __ifloordiv__(self, __other: T) -> None:
-        self._add_modification_checkpoint()
+    def __ifloordiv__(self, __other: T) -> Reference[T]:
+        self._var //= __other
+        self._changed()
+        return self
 
-    def __itruediv__(self, __other: T) -> None:
-        self._add_modification_checkpoint()
+    def __itruediv__(self, __other: T) -> Reference[T]:
+        self._var /= __other
+        self._changed()
+        return self
 
     def __lt__(self, __other: T) -> bool:
         return True
@@ -110,24 +146,25 @@ class Reference(Generic[T]):
     def __gt__(self, __other: T) -> bool:
         return True
 
-    def __getattribute__(self, __name: str) -> Any:
-        return self
-
     def __getattr__(self, __name: str) -> Any:
         return self
 
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._var)
+
     def __getitem__(self, __name: str) -> Any:
         return self
 
     def __get__(self, __name: str) -> Any:
         return self
 
-    def __setitem__(self, __name: str) -> Any:
-        self._add_modification_checkpoint()
+    def __setitem__(self, __name: Any, __value: Any) -> None:
+        self._var[__name] = __value
+        self._changed()
 
-    def __set__(self, __name: str) -> Any:
-        self._add_modification_checkpoint()
-        return self
+    def __set__(self, __instance: Any, __value: T) -> None:
+        self._var = __value
+        self._changed()
 
     def __bool__(self) -> Reference:
         return self
@@ -145,21 +182,138 @@ class Reference(Generic[T]):
         return self
 
 
+class Computed(Reference[T]):
+    """A value derived from references, made with `computed`
+
+    It's worked out when it's first read and cached, for each session. The versions of the
+    references and computed values read while working it out are cached with it, and it's
+    only worked out again when it's next read after one of them changed in that session.
+    They're also recorded as its inputs in the dependency graph, see `graph`, so elements
+    reading it are updated when they change.
+
+    Computed values can be used anywhere a `Reference` can but can't be assigned to.
+
+    args:
+        function (Callable[[], T]): Works out the value from references
+    """
+
+    def __init__(self, function: Callable[[], T]) -> None:
+        super().__init__(_Stale.STALE)  # type: ignore[arg-type]
+        self._function = function
+        # Every input read in any session, by version slot. Sessions only keep the slots, as
+        # they're the same in every process
+        self._inputs: dict[int, Reference] = {}
+        update_wrapper(self, function)  # type: ignore[arg-type]
+
+    @property
+    def _var(self) -> T:
+        if (reads := _reading.get()) is not None:
+            reads[id(self)] = self
+
+        return self._value()
+
+    @_var.setter
+    def _var(self, value: T) -> None:
+        raise AttributeError(f"Computed value {self._function.__name__!r} can't be assigned")
+
+    def _value(self) -> T:
+        """The session's cached value, worked out again if an input changed since"""
+        cached = self._sessions.get(self._slot)
+
+        if cached is _Stale.STALE or not self._current(cached[1]):
+            return self._evaluate()
+
+        return cached[0]
+
+    def _current(self, versions: dict[int, int]) -> bool:
+        """Whether the inputs are still at the versions the value was worked out from"""
+        for slot, version in versions.items():
+            # Worked out by another process sharing the session, see `session.SessionBackend`
+            if (source := self._inputs.get(slot)) is None:
+                return False
+
+            # Brings a computed input up to date, changing its version if it's worked out
+            if isinstance(source, Computed):
+                source._value()
+
+            if self._sessions.get(slot) != version:
+                return False
+
+        return True
+
+    def _evaluate(self) -> T:
+        """Works out the value, recording the references it reads as its inputs"""
+        reads: dict[int, Reference] = {}
+        token = _reading.set(reads)
+
+        try:
+            value = self._function()
+        finally:
+            _reading.reset(token)
+
+        graph = application.Application.graph
+
+        # Edges aren't removed once inputs aren't read, another session may still read them
+        for reference in reads.values():
+            self._inputs[reference._version_slot] = reference
+            graph.add(reference, self)
+
+        versions = {
+            reference._version_slot: self._sessions.get(reference._version_slot)
+            for reference in reads.values()
+        }
+        self._sessions.set(self._slot, (value, versions))
+        self._sessions.set(self._version_slot, self._sessions.get(self._version_slot) + 1)
+
+        return value
+
+    def _invalidate(self) -> None:
+        """Called by the dependency graph when an input changed. The value is checked against
+        its inputs' versions when it's read, so there's nothing to clear."""
+
+    def __call__(self) -> T:  # type: ignore[override]
+        return self._var
+
+
+def computed(function: Callable[[], T]) -> Computed[T]:
+    """Makes a value derived from references, worked out lazily and cached, see `Computed`
+
+    Usage:
+        ```Python
+        @computed
+        def total() -> float:
+            return sum(item.price for item in cart)
+
+        Span(total)
+        ```
+    """
+    return Computed(function)
+
+
 class ReferenceMaker:
-    """Context manager used to assign variables to a project"""
+    """Context manager used to assign variables to a project
+
+    The names assigned in the block, in the module using it, are made into references and
+    rebound to them, so the module's code reads and writes the session's values. They're
+    kept in `Application.references` by name, see `parser`.
+    """
 
     def __enter__(self) -> None:
-        self._initial_vars = globals() | locals()
+        self._namespace = sys._getframe(1).f_globals
+        self._initial_vars = dict(self._namespace)
 
     def __exit__(self, exception_type, exception_value, exception_traceback) -> None:
-        for name, value in (globals()).items():
-            if name in self._initial_vars:
+        if exception_type is not None:
+            return
+
+        for name, value in list(self._namespace.items()):
+            if name in self._initial_vars and self._initial_vars[name] is value:
                 continue
 
-            if name in Application.references:
+            if name in application.Application.references:
                 raise ValueError(f'Reference name: "{name}" already defined')
 
-            Application.references[name] = Reference(value)
+            self._namespace[name] = application.Application.references[name] = Reference(value)
 
 
-MakeReference = ReferenceMaker()
+MakeReference = ReferenceMaker
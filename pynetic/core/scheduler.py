@@ -0,0 +1,202 @@
+"""pynetic update scheduler
+
+An event handler often changes several references one after another. Rather than
+re-rendering after each change, the scheduler collects the changed references and
+updates once: everything depending on them is invalidated in one pass, see
+`graph.DependencyGraph.invalidate`, each watched page with an element to update is
+diffed once, see `diff`, and its patches are sent to the client in one message.
+
+Changes made inside `batch()` are applied when the outermost batch ends. Otherwise they're
+applied at the end of the current asyncio tick, or straight away when there's no event
+loop running.
+
+Pages and changes are kept per session, see `session`. Each session's changes are applied
+inside that session, so derived values are invalidated and pages are diffed with its own
+values, and its pages' patches are sent to its own client.
+
+Usage:
+    ```Python
+    scheduler = Scheduler(send=websocket_send)
+    scheduler.watch(*home.elements)
+
+    with scheduler.batch():
+        todos += ["Write docs"]
+        remaining += 1
+    ```
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Generator
+from contextlib import AbstractContextManager, contextmanager
+from contextvars import Context
+from typing import TYPE_CHECKING, Any
+
+from . import application
+from .diff import Patch, VNode, diff, snapshot
+from .html import HTMLElement
+from .reference import Reference
+from .session import current_session
+
+if TYPE_CHECKING:
+    from asyncio import Handle
+
+__all__ = ("Scheduler", "batch")
+
+
+class _Page:
+    __slots__ = ("elements", "snapshot", "send")
+
+    def __init__(
+        self,
+        elements: tuple[str | HTMLElement, ...],
+        send: Callable[[list[Patch]], Any] | None,
+    ) -> None:
+        self.elements = elements
+        self.snapshot: list[VNode | str] = snapshot(*elements)
+        self.send = send
+
+
+class Scheduler:
+    """Coalesces reference changes into one update per batch or event loop tick
+
+    Args:
+        send (Callable[[list[Patch]], Any] | None):
+            Sends a page's patches to the client, called once per page per update. Used for
+            the pages watched without a `send` of their own
+    """
+
+    def __init__(self, send: Callable[[list[Patch]], Any] | None = None) -> None:
+        self.send = send
+        # By session id, `None` being outside of any session
+        self._pages: dict[str | None, list[_Page]] = {}
+        self._changed: dict[str | None, dict[int, Reference]] = {}
+        self._depth = 0
+        self._handle: Handle | None = None
+
+    def watch(
+        self, *elements: str | HTMLElement, send: Callable[[list[Patch]], Any] | None = None
+    ) -> None:
+        """Keeps the page made of the elements up to date with the references it reads, for
+        the current session
+
+        Args:
+            *elements (str | HTMLElement): The page's elements
+            send (Callable[[list[Patch]], Any] | None):
+                Sends the page's patches to the session's client, the scheduler's `send` if
+                not given
+        """
+        self._pages.setdefault(current_session.get(), []).append(_Page(elements, send))
+
+    def unwatch(self, session_id: str | None) -> None:
+        """Stops updating the session's pages, i.e. once its client disconnects"""
+        self._pages.pop(session_id, None)
+        self._changed.pop(session_id, None)
+
+    def changed(self, reference: Reference) -> None:
+        """Records that the reference changed in the current session, scheduling an update if
+        one isn't already"""
+        self._changed.setdefault(current_session.get(), {})[id(reference)] = reference
+
+        if self._depth or self._handle is not None:
+            return
+
+        import asyncio  # deferred as it's only needed once a reference changes
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+        else:
+            # Not in the context of the first change, the sessions are entered when flushing
+            self._handle = loop.call_soon(self.flush, context=Context())
+
+    @contextmanager
+    def batch(self) -> Generator[None, None, None]:
+        """Holds back updates until the outermost batch ends, then updates once"""
+        self._depth += 1
+
+        try:
+            yield
+        finally:
+            self._depth -= 1
+
+            if not self._depth:
+                self.flush()
+
+    def flush(self) -> list[list[Patch]]:
+        """Applies the changes recorded so far, entering each session that has any, see
+        `session.SessionStore.session`
+
+        Returns:
+            list[list[Patch]]: The patches sent for each page that changed
+        """
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+        changed, self._changed = self._changed, {}
+        sent: list[list[Patch]] = []
+
+        for session_id, references in changed.items():
+            with _entered(session_id):
+                sent.extend(self._update(session_id, list(references.values())))
+
+        return sent
+
+    def _update(self, session_id: str | None, changed: list[Reference]) -> list[list[Patch]]:
+        """Invalidates what depends on the references and diffs the session's pages"""
+        dirty = application.Application.graph.invalidate(*changed)
+        roots = {id(root) for element in dirty for root in _roots(element)}
+        sent: list[list[Patch]] = []
+
+        for page in self._pages.get(session_id, ()):
+            if not any(id(element) in roots for element in page.elements):
+                continue
+
+            old, page.snapshot = page.snapshot, snapshot(*page.elements)
+
+            if patches := diff(old, page.snapshot):
+                sent.append(patches)
+
+                if (send := page.send or self.send) is not None:
+                    send(patches)
+
+        return sent
+
+
+def batch() -> AbstractContextManager[None]:
+    """Holds back updates until the block ends, see `Scheduler.batch`
+
+    For background tasks changing many references at once.
+
+    Usage:
+        ```Python
+        with batch():
+            for item in fetch_items():
+                todos += [item]
+        ```
+    """
+    return application.Application.scheduler.batch()
+
+
+@contextmanager
+def _entered(session_id: str | None) -> Generator[None, None, None]:
+    """Reads and writes the session's values inside the block, `None` being outside of any"""
+    if session_id == current_session.get():
+        yield
+    elif session_id is None:
+        token = current_session.set(None)
+
+        try:
+            yield
+        finally:
+            current_session.reset(token)
+    else:
+        with application.Application.sessions.session(session_id):
+            yield
+
+
+def _roots(element: HTMLElement) -> list[HTMLElement]:
+    """The topmost elements containing the element, one for each page it's reused in"""
+    return [ancestor for ancestor in (element, *element._ancestors()) if not ancestor._parents]
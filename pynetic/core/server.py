@@ -2,17 +2,237 @@
 Serves the production code for testing
 """
 
+from collections.abc import AsyncGenerator, Callable, Coroutine
+from contextlib import nullcontext
+from mimetypes import guess_type
+from secrets import token_urlsafe
+from typing import Any
+
 from starlette.applications import Starlette
 from starlette.requests import Request
-from starlette.responses import PlainTextResponse, Response
+from starlette.responses import (
+    FileResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
 from starlette.routing import Mount, Route, Router, WebSocketRoute
 from starlette.staticfiles import StaticFiles
 
+from .application import (
+    BUILD_FOLDER,
+    Application,
+    get_component,
+    project_modules,
+    route_name,
+)
+from .application import routes as route_modules
+from .build import critical
+from .build.compress import ENCODINGS, read_manifest
+from .build.fingerprint import read_assets
+from .component import Component
+from .css import serialize
+from .html import DOCTYPE, HTMLElement
+from .parser import analyze, read_dependencies
+from .session import SESSION_COOKIE
+
+# Content-hashed assets never change under the same name, so they're cached for a year
+# without being revalidated
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Random bytes in a session id, base64 encoded in its cookie
+SESSION_ID_BYTES = 16
+
 
 def startup():
+    # Analyzed on the fly when the app hasn't been built
+    Application.link(read_dependencies(BUILD_FOLDER) or analyze(*project_modules()))
     print("Ready to go")
 
 
-routes = []
+async def page_stream(
+    component: Component, session_id: str | None = None, head: bytes = b""
+) -> AsyncGenerator[bytes, None]:
+    """Streams a full HTML document for the component, starting with the doctype
+
+    The page is rendered with the session's values of the references, see `session`.
+    `head` is added at the end of the `<head>`, or the start of the document if there isn't
+    one, as `hydration.render_page` does.
+    """
+    yield DOCTYPE.encode()
+
+    if head and not has_head(component):
+        yield head
+        head = b""
+
+    buffered = b""
+
+    with nullcontext() if session_id is None else Application.sessions.session(session_id):
+        async for chunk in component.astream():
+            if not head:
+                yield chunk
+                continue
+
+            # Held back until the end of the `<head>`, which comes early in the document
+            buffered += chunk
+
+            if (end := buffered.find(b"</head>")) != -1:
+                yield buffered[:end] + head + buffered[end:]
+                head = buffered = b""
+
+    if buffered:
+        yield head + buffered
+
+
+def has_head(component: Component) -> bool:
+    """Whether the component has a `<head>`, at its top level or inside its `<html>`"""
+    return any(
+        isinstance(element, HTMLElement)
+        and (
+            element._tag == "head"
+            or any(
+                isinstance(child, HTMLElement) and child._tag == "head"
+                for child in element._children
+            )
+        )
+        for element in component.elements
+    )
+
+
+def page_endpoint(component: Component) -> Callable[[Request], Coroutine[None, None, Response]]:
+    """Creates an endpoint that streams the component's page as it renders
+
+    The response is sent as it is rendered so the browser can start parsing the `<head>`
+    while the rest of the body is still being rendered. Clients without a session cookie
+    are given a new session. As the page isn't built, the rules of every `Style` it uses,
+    i.e. those of the layout helpers in `extensions`, are inlined in its `<head>`.
+    """
+    rules = serialize(critical.stylesheet_rules(*component.elements))
+    head = critical.head(rules, "", complete=True).encode()
+
+    async def endpoint(request: Request) -> Response:
+        session_id = request.cookies.get(SESSION_COOKIE) or token_urlsafe(SESSION_ID_BYTES)
+        response = StreamingResponse(
+            page_stream(component, session_id, head), media_type="text/html"
+        )
+        response.set_cookie(SESSION_COOKIE, session_id, httponly=True, samesite="lax")
+
+        return response
+
+    return endpoint
+
+
+def accepted_encodings(request: Request) -> set[str]:
+    """The content codings the client accepts, from its `Accept-Encoding` header"""
+    accepted = set()
+
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        coding, _, parameters = coding.partition(";")
+        name, _, quality = parameters.strip().partition("=")
+
+        try:
+            if name.strip() == "q" and float(quality) == 0:
+                continue
+        except ValueError:
+            continue
+
+        accepted.add(coding.strip().lower())
+
+    return accepted
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an `If-None-Match` header matches the ETag, using the weak comparison"""
+    return any(
+        tag == "*" or tag.removeprefix("W/") == etag
+        for tag in map(str.strip, if_none_match.split(","))
+    )
+
+
+def built_file_response(request: Request, name: str, entry: dict[str, Any]) -> Response:
+    """Serves a file from the build folder, precompressed if the client accepts it
+
+    Each encoding of the file gets its own strong ETag from the file's content hash, and
+    `If-None-Match` is answered with `304 Not Modified` when it matches. Content-hashed
+    assets, see `build.fingerprint`, are marked immutable.
+
+    Args:
+        request (Request): The request
+        name (str): The file's path relative to the build folder
+        entry (dict[str, Any]): The file's entry in the build manifest
+    """
+    accepted = accepted_encodings(request)
+    encoding = next(
+        (
+            encoding
+            for encoding in ENCODINGS
+            if encoding in entry["encodings"] and (encoding in accepted or "*" in accepted)
+        ),
+        None,
+    )
+    etag = f'"{entry["hash"]}-{encoding}"' if encoding else f'"{entry["hash"]}"'
+    headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+
+    if name in hashed_assets:
+        headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+
+    if etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+
+    path = BUILD_FOLDER.joinpath(name)
+
+    if encoding:
+        headers["Content-Encoding"] = encoding
+        path = path.with_name(path.name + ENCODINGS[encoding])
+
+    return FileResponse(path, media_type=guess_type(name)[0], headers=headers)
+
+
+def built_page_endpoint(
+    name: str, entry: dict[str, Any]
+) -> Callable[[Request], Coroutine[None, None, Response]]:
+    """Creates an endpoint that serves a page from the build folder"""
+
+    async def endpoint(request: Request) -> Response:
+        return built_file_response(request, name, entry)
+
+    return endpoint
+
+
+async def built_file(request: Request) -> Response:
+    """Serves any other file listed in the build manifest, i.e. stylesheets and scripts"""
+    name = request.path_params["path"]
+
+    if name not in manifest:
+        return PlainTextResponse("Not Found", status_code=404)
+
+    return built_file_response(request, name, manifest[name])
+
+
+def page_routes() -> list[Route]:
+    """Creates a route for each module in the routes folder. `index` is served at `/`
+
+    Pages that have been built are served from the build folder, the rest are rendered on
+    each request. Modules without a component, i.e. helpers, aren't served.
+    """
+    page_routes: list[Route] = []
+
+    for route in route_modules():
+        name = route_name(route)
+
+        if f"{name}.html" in manifest:
+            endpoint = built_page_endpoint(f"{name}.html", manifest[f"{name}.html"])
+        elif (component := get_component(route)) is not None:
+            endpoint = page_endpoint(component)
+        else:
+            continue
+
+        page_routes.append(Route("/" if name == "index" else f"/{name}", endpoint=endpoint))
+
+    return page_routes
+
+
+manifest = read_manifest(BUILD_FOLDER)
+hashed_assets = set(read_assets(BUILD_FOLDER).values())
+routes = [*page_routes(), Route(f"/{BUILD_FOLDER.name}/{{path:path}}", endpoint=built_file)]
 
 app = Starlette(debug=True, routes=routes, on_startup=[startup])
@@ -0,0 +1,362 @@
+"""pynetic session store
+
+Every client gets its own values for the app's references. Each reference is given a slot
+when it's made, and each session keeps its values in one list indexed by slot, copied
+from the references' initial values the first time the session is used.
+
+Values are read and written for the session entered with `SessionStore.session`, which
+is tracked by a context variable so concurrent requests each see their own. Outside of a
+session the initial values are used, as when building.
+
+Sessions idle for longer than the TTL are evicted, then the least recently used ones while
+there are more than `max_sessions` or their values take up more than `max_bytes`.
+
+With a backend, see `SessionBackend`, the values are loaded when a session is entered and
+saved when it's left, and only the sessions in use are held in memory. Several worker
+processes sharing a backend can then each handle any request for any session, i.e.
+behind a load balancer. `SQLiteBackend` is shared by the workers on one host.
+
+The app's store is `Application.sessions`, its limits can be set before serving:
+```Python
+Application.sessions.ttl = 15 * 60
+Application.sessions.max_bytes = 512 * 1024**2
+Application.sessions.backend = SQLiteBackend(CACHE_FOLDER.joinpath("sessions.db"))
+```
+
+Usage:
+    ```Python
+    sessions = SessionStore(ttl=15 * 60, max_bytes=512 * 1024**2)
+    slot = sessions.register(0)
+
+    with sessions.session(request.cookies[SESSION_COOKIE]):
+        sessions.set(slot, sessions.get(slot) + 1)
+    ```
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from copy import deepcopy
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import sqlite3
+
+__all__ = ("SESSION_COOKIE", "SQLiteBackend", "SessionBackend", "SessionStore", "current_session")
+
+SESSION_COOKIE = "pynetic_session"
+# Seconds a session can be idle before it's evicted
+SESSION_TTL = 30 * 60
+# Idle sessions are expired from a backend at most this many times per TTL, by each process
+EXPIRIES_PER_TTL = 10
+
+current_session: ContextVar[str | None] = ContextVar("current_session", default=None)
+
+
+class _Session:
+    __slots__ = ("values", "used", "size", "users")
+
+    def __init__(self, values: list[Any], used: float) -> None:
+        self.values = values
+        self.used = used
+        self.size = _size(values)
+        # Blocks using the session, it isn't evicted while there are any
+        self.users = 0
+
+
+class SessionBackend(ABC):
+    """Keeps sessions' values outside of the worker process, see `SQLiteBackend`
+
+    Values are serialized with `pickle`, override `dumps` and `loads` to change that.
+    Writes to the same session from two workers at once are last write wins.
+    """
+
+    @abstractmethod
+    def load(self, session_id: str) -> list[Any] | None:
+        """The session's values, or `None` if the session doesn't exist"""
+
+    @abstractmethod
+    def save(self, session_id: str, values: list[Any], used: float) -> None:
+        """Stores the session's values, `used` being when it was last used"""
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        """Deletes the session, if it exists"""
+
+    @abstractmethod
+    def expire(self, before: float) -> list[str]:
+        """Deletes the sessions last used before the time, returning their ids"""
+
+    def dumps(self, values: list[Any]) -> bytes:
+        import pickle  # deferred as it's only needed with a backend
+
+        return pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, data: bytes) -> list[Any] | None:
+        import pickle  # deferred as it's only needed with a backend
+
+        try:
+            return pickle.loads(data)  # nosec: only the app's own backend writes sessions
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # Written by a version of the app that no longer matches, start afresh
+            return None
+
+
+class SQLiteBackend(SessionBackend):
+    """Keeps sessions in an SQLite database, shared by the worker processes on one host
+
+    The database is opened in WAL mode so workers read while another writes. Each process
+    opens its own connection on first use, so the backend can be made before workers fork.
+
+    Sessions are unpickled when loaded, which can run arbitrary code, so the database file
+    must not be writable by anyone untrusted.
+
+    Args:
+        path (Path | str): The database file, made if it doesn't exist
+        timeout (float): Seconds to wait for another worker's write to finish
+    """
+
+    def __init__(self, path: Path | str, timeout: float = 5.0) -> None:
+        self.path = Path(path)
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        self._pid = 0
+
+    def load(self, session_id: str) -> list[Any] | None:
+        row = self._execute("SELECT data FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        return None if row is None else self.loads(row[0])
+
+    def save(self, session_id: str, values: list[Any], used: float) -> None:
+        self._execute(
+            "INSERT INTO sessions (id, data, used) VALUES (?, ?, ?) "
+            "ON CONFLICT (id) DO UPDATE SET data = excluded.data, used = excluded.used",
+            (session_id, self.dumps(values), used),
+        )
+
+    def delete(self, session_id: str) -> None:
+        self._execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def expire(self, before: float) -> list[str]:
+        # In one write transaction, so no session is used again between the two. `RETURNING`
+        # would need SQLite 3.35
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+
+            try:
+                rows = connection.execute(
+                    "SELECT id FROM sessions WHERE used < ?", (before,)
+                ).fetchall()
+                connection.execute("DELETE FROM sessions WHERE used < ?", (before,))
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+            connection.execute("COMMIT")
+
+        return [session_id for (session_id,) in rows]
+
+    def _execute(self, sql: str, parameters: tuple[Any, ...]) -> sqlite3.Cursor:
+        with self._lock:
+            return self._connect().execute(sql, parameters)
+
+    def _connect(self) -> sqlite3.Connection:
+        import sqlite3  # deferred as it's only needed with this backend
+
+        # A connection can't be shared with a forked process
+        if self._connection is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False
+            )
+            self._connection.execute("PRAGMA journal_mode = WAL")
+            self._connection.execute("PRAGMA synchronous = NORMAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS sessions "
+                "(id TEXT PRIMARY KEY, data BLOB NOT NULL, used REAL NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS sessions_used ON sessions (used)")
+            self._pid = os.getpid()
+
+        return self._connection
+
+
+class SessionStore:
+    """The references' values for each session, evicting idle sessions
+
+    Args:
+        ttl (float): Seconds a session can be idle before it's evicted
+        max_sessions (int | None): Most sessions kept, `None` for no limit
+        max_bytes (int | None):
+            Most memory the sessions' values can take up, `None` for no limit. Measured
+            shallowly with `sys.getsizeof` when a session is left, so it's an estimate
+        backend (SessionBackend | None):
+            Where sessions are kept between requests, `None` to keep them in memory
+        clock (Callable[[], float]):
+            Returns the current time in seconds, comparable between processes when they
+            share a backend
+    """
+
+    def __init__(
+        self,
+        ttl: float = SESSION_TTL,
+        max_sessions: int | None = None,
+        max_bytes: int | None = None,
+        backend: SessionBackend | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.backend = backend
+        self.clock = clock
+        self.memory = 0
+        self._initial: list[Any] = []
+        # When idle sessions can next be expired from the backend
+        self._next_expiry = 0.0
+        # Least recently used first
+        self._sessions: OrderedDict[str, _Session] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def register(self, value: Any) -> int:
+        """Gives a reference a slot, with its initial value
+
+        Returns:
+            int: The slot the reference's value is kept in
+        """
+        self._initial.append(value)
+
+        for session in self._sessions.values():
+            session.values.append(deepcopy(value))
+
+        return len(self._initial) - 1
+
+    def get(self, slot: int) -> Any:
+        """The value in the slot for the current session"""
+        return self._values()[slot]
+
+    def set(self, slot: int, value: Any) -> None:
+        """Replaces the value in the slot for the current session"""
+        self._values()[slot] = value
+
+    @contextmanager
+    def session(self, session_id: str) -> Generator[None, None, None]:
+        """Reads and writes values for the session inside the block
+
+        The session is made if it doesn't exist yet. When the block ends its size is
+        measured and idle or excess sessions are evicted, see `evict`.
+        """
+        now = self.clock()
+
+        if (session := self._sessions.get(session_id)) is None:
+            # Another worker may have changed it since this one last held the session
+            values = None if self.backend is None else self.backend.load(session_id)
+
+            if values is None:
+                values = deepcopy(self._initial)
+            else:
+                # References made since the session was saved start with their initial values
+                values.extend(deepcopy(self._initial[len(values) :]))
+
+            session = self._sessions[session_id] = _Session(values, now)
+            self.memory += session.size
+        else:
+            session.used = now
+            self._sessions.move_to_end(session_id)
+
+        session.users += 1
+        token = current_session.set(session_id)
+
+        try:
+            yield
+        finally:
+            current_session.reset(token)
+            session.users -= 1
+            session.used = self.clock()
+
+            if self._sessions.get(session_id) is session:
+                size = _size(session.values)
+                self.memory += size - session.size
+                session.size = size
+                self._sessions.move_to_end(session_id)
+
+            if self.backend is not None:
+                self.backend.save(session_id, session.values, session.used)
+
+                if not session.users:
+                    self.discard(session_id, keep=True)
+
+            self.evict()
+
+    def discard(self, session_id: str, keep: bool = False) -> None:
+        """Removes the session, i.e. when the client logs out
+
+        Args:
+            session_id (str): The session's id
+            keep (bool): Only removes it from memory, leaving it in the backend
+        """
+        if (session := self._sessions.pop(session_id, None)) is not None:
+            self.memory -= session.size
+
+        if self.backend is not None and not keep:
+            self.backend.delete(session_id)
+
+    def evict(self) -> list[str]:
+        """Removes the sessions idle for longer than the TTL, then the least recently used
+        while over `max_sessions` or `max_bytes`. Sessions in use are kept.
+
+        With a backend, the sessions idle for longer than the TTL are removed from it too,
+        while those over the limits are only removed from memory. As the backend is shared,
+        that's done at most `EXPIRIES_PER_TTL` times per TTL by each process.
+
+        Returns:
+            list[str]: The ids of the sessions removed
+        """
+        now = self.clock()
+        expired = now - self.ttl
+        evicted: dict[str, None] = {}
+
+        if self.backend is not None and now >= self._next_expiry:
+            self._next_expiry = now + self.ttl / EXPIRIES_PER_TTL
+            evicted.update(dict.fromkeys(self.backend.expire(expired)))
+
+        for session_id, session in list(self._sessions.items()):
+            over = (self.max_sessions is not None and len(self._sessions) > self.max_sessions) or (
+                self.max_bytes is not None and self.memory > self.max_bytes
+            )
+
+            if session.used >= expired and not over:
+                break
+
+            if not session.users:
+                self.discard(session_id, keep=session.used >= expired)
+                evicted[session_id] = None
+
+        return list(evicted)
+
+    def _values(self) -> list[Any]:
+        session_id = current_session.get()
+
+        if session_id is None or (session := self._sessions.get(session_id)) is None:
+            return self._initial
+
+        return session.values
+
+
+def _size(values: list[Any]) -> int:
+    return sys.getsizeof(values) + sum(map(sys.getsizeof, values))
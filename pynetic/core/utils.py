@@ -1,7 +1,6 @@
 """pynetic utilities module"""
 
-from collections.abc import Callable, Iterable
-from dataclasses import dataclass
+from collections.abc import Callable, Hashable, Iterable, Iterator
 from itertools import count, product
 from string import ascii_lowercase, ascii_uppercase
 from types import FunctionType
@@ -17,6 +16,10 @@ class For:
         each (Iterable): The iterable to loop over
         condition (Callable | None): The function to use as a condition in the for loop
         do (Callable): What to do in the loop
+        key (Callable | None):
+            Returns the key identifying the element made for an item, so the element is
+            moved rather than re-created when the items are reordered.
+            Defaults to the item itself when it is hashable
 
     Usage:
         ```Python
@@ -31,13 +34,38 @@ class For:
         )
     """
 
-    def __init__(self, each: Iterable, condition: Callable | None, statements: Any, /) -> None:
+    def __init__(
+        self,
+        each: Iterable,
+        condition: Callable | None,
+        statements: Any,
+        /,
+        key: Callable[[Any], Hashable] | None = None,
+    ) -> None:
         self.each = each
         self.condition = condition
         self.statements = statements
+        self.key = key
+
+    def __iter__(self) -> Iterator[Any]:
+        """Runs the loop, yielding the result of `statements` for each item meeting `condition`"""
+        for item in self.each:
+            if self.condition is None or self.condition(item):
+                yield self.statements(item)
+
+    def keyed(self) -> Iterator[tuple[Hashable | None, Any]]:
+        """Runs the loop like `__iter__`, yielding each result along with the item's key"""
+        for item in self.each:
+            if self.condition is None or self.condition(item):
+                if self.key is not None:
+                    key = self.key(item)
+                else:
+                    key = item if isinstance(item, Hashable) else None
+
+                yield key, self.statements(item)
 
 
 def iter_short_names():
     """Generator over a-z ... A-Z ... aa-ZZ ..."""
-    for i in count():
+    for i in count(1):
         yield from map("".join, product(all_letters, repeat=i))
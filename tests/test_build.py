@@ -0,0 +1,273 @@
+import gzip
+from types import ModuleType
+
+from starlette.testclient import TestClient
+
+from pynetic.core import server
+from pynetic.core.application import get_component
+from pynetic.core.build.atomic import AtomicCSS
+from pynetic.core.build.compress import ENCODINGS, compress, read_manifest
+from pynetic.core.build.critical import critical_rules
+from pynetic.core.build.critical import head as critical_head
+from pynetic.core.build.fingerprint import Assets, read_assets
+from pynetic.core.build.minify import minify
+from pynetic.core.build.report import BuildReport
+from pynetic.core.build.treeshake import tree_shake
+from pynetic.core.build.usage import Usage
+from pynetic.core.component import Component
+from pynetic.core.css import parse, serialize
+from pynetic.core.html import Div, Li, Ul
+from pynetic.core.reference import Reference
+from pynetic.core.utils import For
+
+
+def test_minify_collapses_whitespace():
+    assert minify("<div>\n  <b>a</b>   <i>b</i>\n</div>") == "<div> <b>a</b> <i>b</i> </div>"
+
+
+def test_minify_keeps_preformatted_text():
+    html = "<pre>  a\n  b </pre><textarea> c  </textarea><script>if (a < b) {}</script>"
+
+    assert minify(html) == html
+
+
+def test_minify_drops_whitespace_that_is_not_rendered():
+    assert minify("<ul>\n  <li>a</li>\n  <li>b</li>\n</ul>") == "<ul><li>a<li>b</ul>"
+
+
+def test_minify_optional_end_tags():
+    assert minify("<table><tr><td>1</td><td>2</td></tr><tr><td>3</td></tr></table>") == (
+        "<table><tr><td>1<td>2<tr><td>3</table>"
+    )
+    assert minify("<div><p>a</p><p>b</p></div>") == "<div><p>a<p>b</div>"
+    assert minify("<a><p>a</p></a>") == "<a><p>a</p></a>"
+
+
+def test_minify_attributes():
+    assert minify('<input type="checkbox" checked="checked" disabled="">') == (
+        "<input type=checkbox checked disabled>"
+    )
+    assert minify('<a href="/a b" title=\'say "hi"\' class="">x</a>') == (
+        '<a href="/a b" title=\'say "hi"\' class="">x</a>'
+    )
+
+
+def test_minify_keeps_boolean_attributes_with_other_values():
+    assert minify('<details hidden="until-found">a</details>') == (
+        "<details hidden=until-found>a</details>"
+    )
+
+
+def test_minify_keeps_self_closing_foreign_elements():
+    assert minify('<svg><path d="M0 0"/><circle r=1 /></svg>') == (
+        '<svg><path d="M0 0"/><circle r=1 /></svg>'
+    )
+    assert minify("<br/>") == "<br>"
+
+
+def test_minify_document():
+    html = (
+        "<!DOCTYPE html>\n<html>\n<head><title>a</title></head>\n<body><!-- x --></body>\n</html>"
+    )
+
+    assert minify(html) == "<!DOCTYPE html><html><head><title>a</title><body>"
+
+
+def test_build_report():
+    report = BuildReport()
+    report.add("minify", "index", 200, 150)
+
+    assert report.entries[0].saved == 50
+    assert "50 (25.0%)" in str(report)
+
+    report.remove("tree-shake", [f".unused-{index}" for index in range(25)])
+
+    assert "tree-shake removed 25:\n  .unused-0" in str(report)
+    assert str(report).endswith("  .unused-19\n  ... and 5 more")
+
+
+def test_compress_writes_variants_and_manifest(tmp_path):
+    tmp_path.joinpath("index.html").write_text("<p>hello " * 100)
+    tmp_path.joinpath("image.png").write_bytes(b"not compressed")
+
+    manifest = compress(tmp_path, workers=2)
+
+    assert list(manifest) == ["index.html"]
+    assert manifest["index.html"]["size"] == 900
+    assert read_manifest(tmp_path) == manifest
+
+    for encoding, size in manifest["index.html"]["encodings"].items():
+        assert tmp_path.joinpath("index.html" + ENCODINGS[encoding]).stat().st_size == size
+
+    assert gzip.decompress(tmp_path.joinpath("index.html.gz").read_bytes()) == b"<p>hello " * 100
+
+
+def test_server_negotiates_precompressed_files(tmp_path, monkeypatch):
+    tmp_path.joinpath("app.js").write_text("console.log('hello');" * 100)
+    monkeypatch.setattr(server, "BUILD_FOLDER", tmp_path)
+    monkeypatch.setattr(server, "manifest", compress(tmp_path, workers=1))
+    client = TestClient(server.app)
+
+    response = client.get("/build/app.js", headers={"Accept-Encoding": "gzip"})
+    etag = response.headers["etag"]
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == "console.log('hello');" * 100
+    assert etag.startswith('"') and not etag.startswith("W/")
+
+    response = client.get(
+        "/build/app.js", headers={"Accept-Encoding": "gzip", "If-None-Match": etag}
+    )
+
+    assert response.status_code == 304
+    assert response.content == b""
+
+    response = client.get("/build/app.js", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] != etag
+    assert client.get("/build/missing.js").status_code == 404
+    assert "cache-control" not in response.headers
+
+
+def test_route_modules_without_a_component_are_skipped():
+    helpers, page = ModuleType("routes.helpers"), ModuleType("routes.page")
+    page.home = Component(Div("a"))
+
+    assert get_component(helpers) is None
+    assert get_component(page) is page.home
+
+
+def test_assets_named_by_content_hash(tmp_path):
+    assets = Assets(tmp_path)
+    first = assets.write("styles.css", "a{color:red}")
+    tmp_path.joinpath(first + ".gz").write_bytes(b"")
+
+    assert first == assets.write("styles.css", "a{color:red}")
+    assert first.startswith("styles.") and first.endswith(".css") and len(first) == 19
+
+    second = assets.write("styles.css", "a{color:blue}")
+    assets.save()
+
+    assert second != first
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["assets.json", second]
+    assert read_assets(tmp_path) == {"styles.css": second}
+    assert assets.url("styles.css") == f"/{tmp_path.name}/{second}"
+
+
+def test_server_caches_hashed_assets_forever(tmp_path, monkeypatch):
+    assets = Assets(tmp_path)
+    name = assets.write("styles.css", "a{color:red}")
+    monkeypatch.setattr(server, "BUILD_FOLDER", tmp_path)
+    monkeypatch.setattr(server, "manifest", compress(tmp_path, workers=1))
+    monkeypatch.setattr(server, "hashed_assets", {name})
+    response = TestClient(server.app).get(f"/build/{name}")
+
+    assert response.text == "a{color:red}"
+    assert response.headers["cache-control"] == server.IMMUTABLE_CACHE_CONTROL
+
+
+def test_atomic_css_interns_declarations():
+    items = [Li("x").style(display="flex", **{"::before": {"content": '""'}}) for _ in range(3)]
+    page = Ul(*items, classes="a")
+    atomic = AtomicCSS()
+    atomic.compile(page)
+
+    assert atomic.stylesheet() == '.b{display:flex}.c::before{content:""}'
+    assert page.render() == '<ul class="a">' + '<li class="b c">x</li>' * 3 + "</ul>"
+    assert atomic.added < atomic.before
+
+
+def test_atomic_css_keeps_references_inline():
+    color = Reference("red")
+    element = Div(Div("a").style(color=color, margin="0"))
+    atomic = AtomicCSS()
+    atomic.compile(element)
+
+    assert atomic.stylesheet() == ".a{margin:0}"
+    assert element.render() == '<div><div class="a" style="color:red">a</div></div>'
+
+
+def test_atomic_css_keeps_shorthands_with_their_longhands():
+    first = Div("a").style(margin_top="5px")
+    second = Div("b").style(margin="0", margin_top="5px")
+    atomic = AtomicCSS()
+    atomic.compile(Div(first, second))
+
+    assert atomic.stylesheet() == ".a{margin-top:5px}.b{margin:0;margin-top:5px}"
+    assert second.render() == '<div class="b">b</div>'
+
+
+def test_atomic_css_keeps_names_and_cascade_of_stylesheets():
+    rules = parse(".a{color:red} #main .note{padding:1px}")
+    items = Reference(["b"])
+    element = Div(Ul(For(items, None, lambda name: Li(name, classes=name)))).style(
+        display="flex", padding="0"
+    )
+    atomic = AtomicCSS(rules)
+    atomic.compile(element)
+
+    assert atomic.stylesheet() == ".c{display:flex}"
+    assert element.render().startswith('<div class="c" style="padding:0">')
+
+
+def test_usage_matches_selectors():
+    usage = Usage.of(Ul(Li("a", classes="sm:flex", id="first"), title="x"))
+
+    assert usage.matches("ul > li.sm\\:flex:hover")
+    assert usage.matches("#first, .missing")
+    assert usage.matches("body [title]:not(.missing)")
+    assert not usage.matches("li.missing, div")
+
+
+def test_critical_rules():
+    rules = parse(
+        "@import url(a.css);.a{animation:spin 1s}.b{color:red}"
+        "@media print{.a{c:d}.b{e:f}}@keyframes spin{to{x:y}}@keyframes other{}"
+    )
+    usage = Usage.of(Div(classes="a"))
+
+    assert serialize(critical_rules(rules, usage)) == (
+        ".a{animation:spin 1s}@media print{.a{c:d}}@keyframes spin{to{x:y}}"
+    )
+
+
+def test_tree_shake():
+    rules = parse(
+        '@charset "utf-8";.a{animation:spin 1s}.b{color:red}.toast{x:y}'
+        "@media print{.b{e:f}}@font-face{font-family:f}"
+        "@keyframes spin{to{x:y}}@keyframes fade{to{x:y}}"
+    )
+    usage = Usage.of(Div(classes="a"))
+    kept, removed = tree_shake(rules, usage, safelist={"toast"})
+
+    assert serialize(kept) == (
+        '@charset "utf-8";.a{animation:spin 1s}.toast{x:y}'
+        "@font-face{font-family:f}@keyframes spin{to{x:y}}"
+    )
+    assert removed == [".b", ".b", "@media print", "@keyframes fade"]
+
+
+def test_tree_shake_keeps_keyframes_used_by_inline_and_prefixed_styles():
+    rules = parse(
+        ".a{-webkit-animation-name:spin}@keyframes spin{to{x:y}}@keyframes fade{to{x:y}}"
+        "@keyframes pulse{to{x:y}}@keyframes gone{to{x:y}}"
+    )
+    items = Reference(["fade"])
+    page = Div(
+        Div(classes="a"),
+        Ul(For(items, None, lambda name: Li(name).style(animation=f"{name} 1s"))),
+    )
+    kept, removed = tree_shake(rules, Usage.of(page), safelist={"pulse"})
+
+    assert removed == ["@keyframes gone"]
+
+    animation = Reference("gone 1s")
+    kept, removed = tree_shake(rules, Usage.of(Div("a").style(animation=animation)))
+
+    assert removed == [".a"]
+
+
+def test_critical_head():
+    assert critical_head("a</b", "/s.css", complete=True) == "<style>a<\\/b</style>"
+    assert '<link rel="preload" href="/s.css" as="style"' in critical_head("", "/s.css")
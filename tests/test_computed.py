@@ -0,0 +1,159 @@
+import asyncio
+
+import pytest
+
+from pynetic.core import application
+from pynetic.core.component import Component
+from pynetic.core.diff import SET_TEXT
+from pynetic.core.graph import DependencyGraph
+from pynetic.core.html import Div, P
+from pynetic.core.reference import Reference, computed
+from pynetic.core.scheduler import Scheduler
+from pynetic.core.session import SessionStore, SQLiteBackend
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    sent = []
+    scheduler = Scheduler(send=sent.append)
+    monkeypatch.setattr(application.Application, "graph", DependencyGraph())
+    monkeypatch.setattr(application.Application, "scheduler", scheduler)
+    monkeypatch.setattr(application.Application, "sessions", SessionStore())
+    scheduler.sent = sent
+    return scheduler
+
+
+def counted(function):
+    def wrapper():
+        wrapper.calls += 1
+        return function()
+
+    wrapper.calls = 0
+    return wrapper
+
+
+def test_computed_is_lazy_and_cached(scheduler):
+    todos = Reference(["a", "b"])
+    count = counted(lambda: len(todos._var))
+    total = computed(count)
+
+    assert count.calls == 0
+    assert total() == 2 and total() == 2
+    assert count.calls == 1
+
+    todos += ["c"]
+
+    assert count.calls == 1
+    assert total() == 3
+    assert count.calls == 2
+
+
+def test_computed_only_recomputes_when_its_inputs_change(scheduler):
+    first, second, unread = Reference(1), Reference(True), Reference(0)
+    value = counted(lambda: first._var if second._var else 0)
+    result = computed(value)
+    result()
+
+    unread += 1
+    result()
+
+    assert value.calls == 1
+
+    second.__set__(None, False)
+    assert result() == 0
+
+    # No longer read, so not worked out again, though still linked for other sessions
+    first += 1
+    result()
+
+    assert value.calls == 2
+    assert list(map(id, application.Application.graph.dependencies(result))) == [
+        id(second),
+        id(first),
+    ]
+
+
+def test_computed_values_depending_on_computed_values(scheduler):
+    todos = Reference([1, 2, 3])
+    total = computed(lambda: sum(todos._var))
+    doubled = computed(lambda: total() * 2)
+    elements = (Div(P(doubled)),)
+    Component(*elements)
+    scheduler.watch(*elements)
+
+    todos += [4]
+
+    assert doubled() == 20
+    assert [patch.op for patch in scheduler.sent[0]] == [SET_TEXT]
+
+
+def test_computed_values_are_cached_per_session(scheduler):
+    name = Reference("John")
+    upper = computed(lambda: name._var.upper())
+
+    with application.Application.sessions.session("a"):
+        name.__set__(None, "Jane")
+        assert upper() == "JANE"
+
+    with application.Application.sessions.session("b"):
+        assert upper() == "JOHN"
+
+
+def test_computed_values_cant_be_assigned(scheduler):
+    total = computed(lambda: 1)
+
+    with pytest.raises(AttributeError):
+        total.__set__(None, 2)
+
+
+@pytest.mark.asyncio
+async def test_computed_values_are_invalidated_in_every_session_changing_an_input(scheduler):
+    sessions = application.Application.sessions
+    first, flag = Reference(1), Reference(True)
+    value = computed(lambda: first._var if flag._var else 0)
+
+    with sessions.session("b"):
+        value()
+
+    with sessions.session("a"):
+        flag.__set__(None, False)
+        value()
+
+    await asyncio.sleep(0)
+
+    # Changed in both sessions in one tick, after "a" stopped reading `first`
+    for session_id in ("a", "b"):
+        with sessions.session(session_id):
+            first += 1
+
+    await asyncio.sleep(0)
+
+    with sessions.session("a"):
+        assert value() == 0
+
+    with sessions.session("b"):
+        assert value() == 2
+
+
+def test_computed_values_are_invalidated_in_sessions_kept_in_a_backend(
+    scheduler, monkeypatch, tmp_path
+):
+    sessions = SessionStore(backend=SQLiteBackend(tmp_path.joinpath("sessions.db")))
+    monkeypatch.setattr(application.Application, "sessions", sessions)
+    todos = Reference(["a"])
+    total = computed(lambda: len(todos._var))
+    doubled = computed(lambda: total() * 2)
+
+    with sessions.session("a"):
+        assert doubled() == 2
+
+    with sessions.session("a"):
+        todos += ["b"]
+
+    assert len(sessions) == 0
+
+    with sessions.session("a"):
+        assert doubled() == 4
+
+    with sessions.session("b"):
+        assert doubled() == 2
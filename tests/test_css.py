@@ -0,0 +1,189 @@
+import os
+
+import pytest
+
+from pynetic.core import css
+from pynetic.core.cache import ParseCache
+from pynetic.core.css import Rule, Style, parse, style
+from pynetic.core.html import Div
+
+
+class CountingParser:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, text):
+        self.calls += 1
+        return text.upper()
+
+
+@pytest.fixture
+def parse_cache(tmp_path, monkeypatch):
+    cache = ParseCache(css.parse, tmp_path)
+    monkeypatch.setattr(css, "_parse_cache", lambda validate=False: cache)
+    return cache
+
+
+def test_parse_cache_memory_tier():
+    parser = CountingParser()
+    cache = ParseCache(parser, maxsize=1)
+
+    assert cache.parse_text("a") == cache.parse_text("a") == "A"
+    assert parser.calls == 1
+
+    cache.parse_text("b")
+    cache.parse_text("a")
+    assert parser.calls == 3
+
+
+def test_parse_cache_disk_tier(tmp_path):
+    parser = CountingParser()
+    ParseCache(parser, tmp_path).parse_text("a")
+
+    assert ParseCache(parser, tmp_path).parse_text("a") == "A"
+    assert ParseCache(parser, tmp_path, version="2").parse_text("a") == "A"
+    assert parser.calls == 2
+
+
+def test_parse_cache_files(tmp_path):
+    parser = CountingParser()
+    cache = ParseCache(parser)
+    path = tmp_path.joinpath("style.css")
+    path.write_text("a")
+
+    assert cache.parse_file(path) == cache.parse_file(path) == "A"
+    assert parser.calls == 1
+
+    path.write_text("bb")
+    os.utime(path, ns=(0, 0))
+
+    assert cache.parse_file(path) == "BB"
+    assert parser.calls == 2
+
+
+def test_style_from_dict():
+    rules = Style({".a": {"font_size": "1px", "--my_var": 0, ":hover": {"color": "red"}}})
+
+    assert rules.render() == ".a{font-size:1px;--my_var:0}.a:hover{color:red}"
+
+
+def test_style_from_text(parse_cache):
+    sheet = style(
+        "@import url(a.css); .a > b { color: red !important } @media print { .a { x: y } }"
+    )
+
+    assert sheet.rules[1] == Rule(".a > b", (("color", "red !important"),))
+    assert sheet.render() == "@import url(a.css);.a > b{color:red !important}@media print{.a{x:y}}"
+    assert Style(sheet).rules is sheet.rules
+
+
+def test_style_from_file(tmp_path, parse_cache):
+    path = tmp_path.joinpath("style.css")
+    path.write_bytes(b".a { margin: 0 }")
+
+    assert style(path).render() == ".a{margin:0}"
+    assert list(tmp_path.glob("*.pickle"))
+
+
+def test_style_rejects_other_types():
+    with pytest.raises(TypeError):
+        style(1)
+
+
+def test_parse_declarations_and_nesting():
+    rules = parse(
+        "/* a; { */ .a,  b > c { color : red ; --x: 1px } "
+        "@media (min-width: 600px) { .b { margin: 0 } } @media print {}"
+    )
+
+    assert rules == (
+        Rule(".a, b > c", (("color", "red"), ("--x", "1px"))),
+        Rule("@media (min-width: 600px)", rules=(Rule(".b", (("margin", "0"),)),)),
+        Rule("@media print", rules=()),
+    )
+
+
+def test_parse_keeps_strings_escapes_and_functions_whole():
+    rules = parse(
+        '.sm\\:flex{display:flex} a[title="}"]{content:"\\";}"} '
+        ".i{background:url(data:image/png;base64,AA==)}"
+    )
+
+    assert [rule.selector for rule in rules] == [".sm\\:flex", 'a[title="}"]', ".i"]
+    assert rules[1].declarations == (("content", '"\\";}"'),)
+    assert rules[2].declarations == (("background", "url(data:image/png;base64,AA==)"),)
+
+
+def test_parse_statements_and_unclosed_blocks():
+    assert parse('@import url("a.css"); .a { color: red') == (
+        Rule('@import url("a.css");'),
+        Rule(".a", (("color", "red"),)),
+    )
+
+
+def test_parse_round_trips(parse_cache):
+    css = "@media x{.a{b:c;&:hover{d:e}}}@keyframes k{from{opacity:0}}@font-face{src:url(a)}"
+
+    assert Style(css).render() == css
+
+
+def test_parse_validated_with_cssutils():
+    assert parse(".a>b{color:red}", validate=True) == (Rule(".a > b", (("color", "red"),)),)
+
+
+def test_property_name():
+    assert css.property_name("background_color") == "background-color"
+    assert css.property_name("--main_color") == "--main_color"
+    assert "background-color" in css.PROPERTIES
+    assert ":nth-child" in css.PSEUDO_CLASSES and "px" in css.UNITS
+
+
+def test_style_validated_only_in_strict_mode(monkeypatch):
+    Div().style(colour="red")
+    monkeypatch.setattr(css, "STRICT", True)
+    Div().style(
+        background_color="red",
+        _webkit_line_clamp="2",
+        **{"--gap": "1rem", ":hover::before": {"content": "''"}, "@media print": {"color": "red"}},
+    )
+
+    with pytest.raises(ValueError, match="did you mean 'color'"):
+        Div().style(colour="red")
+
+    with pytest.raises(ValueError, match="pseudo selector ':hovr'"):
+        Div().style(**{":hovr": {"color": "red"}})
+
+
+def test_units_shortest_form():
+    assert [css.px(0), css.px(1.50), css.em(-0.25), css.ex(2)] == ["0", "1.5px", "-.25em", "2ex"]
+    assert css.percent(0) == "0%"
+
+
+def test_colors_shortest_form():
+    assert [css.rgb(255, 0, 0), css.rgb(255, 255, 255), css.rgb(210, 180, 140)] == [
+        "red",
+        "#fff",
+        "tan",
+    ]
+    assert css.hsl(120, 100, 25) == "green"
+    assert css.rgb(0, 0, 0, 0.5) == "#00000080"
+
+
+def test_normalize():
+    assert css.normalize("background", 'white url("a 0px.png") 0px 0.50em') == (
+        '#fff url("a 0px.png") 0 .5em'
+    )
+    assert css.normalize("color", "rgb(255, 255, 255)") == "#fff"
+    assert css.normalize("color", "blue") == "blue"
+    assert css.normalize("border", "1.0px solid #FF0000") == "1px solid red"
+    assert css.normalize("transition", "opacity 0.30s") == "opacity .3s"
+    assert css.normalize("font-family", "White") == "White"
+    assert css.normalize("width", "calc(100% - 0px)") == "calc(100% - 0px)"
+    assert css.normalize("flex", "1 0px") == "1 0px"
+    assert css.normalize("--gap", "0px") == "0px"
+
+
+def test_serialize_normalizes_values():
+    assert (
+        css.serialize(parse(".a{margin:0px auto;color:#ffffff}")) == ".a{margin:0 auto;color:#fff}"
+    )
@@ -0,0 +1,125 @@
+import random
+from html import escape
+
+import pytest
+
+from pynetic.core.diff import (
+    INSERT,
+    MOVE,
+    REMOVE,
+    SET_ATTR,
+    SET_TEXT,
+    Patch,
+    diff,
+    snapshot,
+)
+from pynetic.core.html import Div, Li, Span, Ul
+from pynetic.core.reference import Reference
+from pynetic.core.utils import For
+
+
+class Markup(str):
+    """HTML inserted by a patch, rendered as is"""
+
+
+def render(nodes):
+    return "".join(
+        node
+        if isinstance(node, Markup)
+        else escape(node)
+        if isinstance(node, str)
+        else "<{tag}{attributes}>{children}</{tag}>".format(
+            tag=node.tag,
+            attributes="".join(f' {name}="{value}"' for name, value in node.attributes.items()),
+            children=render(node.children),
+        )
+        for node in nodes
+    )
+
+
+def apply(nodes, patches):
+    """Applies patches to a snapshot the same way the client does to the page"""
+    for op, path, args in patches:
+        children = nodes
+        for index in path[:-1] if op in (SET_TEXT, SET_ATTR) else path:
+            children = children[index].children
+
+        if op == SET_TEXT:
+            children[path[-1]] = args[0]
+        elif op == SET_ATTR:
+            name, value = args
+            attributes = children[path[-1]].attributes
+            attributes.pop(name) if value is None else attributes.__setitem__(name, value)
+        elif op == INSERT:
+            children.insert(args[0], Markup(args[1]))
+        elif op == REMOVE:
+            children.pop(args[0])
+        elif op == MOVE:
+            children.insert(args[1], children.pop(args[0]))
+
+    return nodes
+
+
+def test_no_changes():
+    page = Div("a", Ul(Li("b")), title="c")
+
+    assert diff(snapshot(page), snapshot(page)) == []
+
+
+def test_set_text():
+    text = Reference("a")
+    page = Div(Span(text))
+    before = snapshot(page)
+    text._var = "b"
+
+    assert diff(before, snapshot(page)) == [Patch(SET_TEXT, (0, 0, 0), ("b",))]
+
+
+def test_set_attr():
+    title = Reference("a")
+    page = Div(Span(title=title))
+    before = snapshot(page)
+    title._var = "b"
+
+    assert diff(before, snapshot(page)) == [Patch(SET_ATTR, (0, 0), ("title", "b"))]
+
+
+def test_insert_and_remove():
+    items = ["a", "b", "c"]
+    page = Ul(For(items, None, Li))
+    before = snapshot(page)
+    items.remove("b")
+    items.append("d")
+
+    assert diff(before, snapshot(page)) == [
+        Patch(REMOVE, (0,), (1,)),
+        Patch(INSERT, (0,), (2, "<li>d</li>")),
+    ]
+
+
+def test_keyed_rotation_is_one_move():
+    items = list(range(100))
+    page = Ul(For(items, None, lambda item: Li(str(item))))
+    before = snapshot(page)
+    items.append(items.pop(0))
+
+    assert diff(before, snapshot(page)) == [Patch(MOVE, (0,), (0, 99))]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_changes(seed):
+    rng = random.Random(seed)
+    items = [{"id": index, "text": str(index)} for index in range(50)]
+    page = Ul(For(items, None, lambda item: Li(item["text"]), key=lambda item: item["id"]))
+    before = snapshot(page)
+
+    rng.shuffle(items)
+    del items[rng.randrange(len(items))]
+    items.insert(rng.randrange(len(items)), {"id": 100, "text": "new"})
+    items[rng.randrange(len(items))]["text"] = "changed"
+
+    patches = diff(before, after := snapshot(page))
+
+    assert render(apply(before, patches)) == render(after)
+    assert [op for op, *_ in patches].count(INSERT) == 1
+    assert [op for op, *_ in patches].count(REMOVE) == 1
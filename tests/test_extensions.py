@@ -0,0 +1,55 @@
+from starlette.applications import Starlette
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from pynetic.core.build.critical import stylesheet_rules
+from pynetic.core.component import Component
+from pynetic.core.css import serialize
+from pynetic.core.extensions.css_extensions import Center, Color, Flex
+from pynetic.core.extensions.html_extensions import FlexBox, FlexDirection
+from pynetic.core.html import Body, Div, Head, Html, Title
+from pynetic.core.server import page_endpoint
+
+
+def test_layout_helpers_share_utility_classes():
+    page = Div(
+        FlexBox(FlexDirection.column)(Flex(1)("a"), Flex(1)("b"), Flex(2, 0)("c")),
+        Center(Div("d")),
+        Center(Div("e")),
+    )
+    first, second, third = page._children[0]._children[:3]
+
+    assert first._classes == second._classes != third._classes
+    assert not first._styles and first._classes[0].startswith("pn-flex-")
+    assert 'class="pn-center">d<' in page.render()
+    assert serialize(stylesheet_rules(page)).count(".pn-center{") == 1
+    assert ".pn-flex-box-column{display:flex;flex-direction:column}" in serialize(
+        stylesheet_rules(page)
+    )
+
+
+def test_color_members_are_shortest_form():
+    assert (Color.white.value, Color.red.value, Color.blue.value) == ("#fff", "red", "blue")
+
+
+def test_utilities_invalidate_rendered_elements():
+    child = Div("a")
+    page = Div(child)
+    rendered, content_hash = page.render(), page.content_hash
+    Center(child)
+
+    assert page.render() == '<div><div class="pn-center">a</div></div>' != rendered
+    assert page.content_hash != content_hash
+    assert len(Flex(1)(Div())._classes[0]) == len("pn-flex-") + 16
+
+
+def test_unbuilt_pages_inline_the_utility_css():
+    def page(*elements):
+        app = Starlette(routes=[Route("/", page_endpoint(Component(*elements)))])
+        return TestClient(app).get("/").text
+
+    document = page(Html(Head(Title("a")), Body(Center(Div("b")))))
+
+    assert "<title>a</title><style>.pn-center{" in document
+    assert document.index("</style>") < document.index("</head>")
+    assert page(Center(Div("b"))).startswith("<!DOCTYPE html><style>.pn-center{")
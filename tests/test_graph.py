@@ -0,0 +1,71 @@
+import pytest
+
+from pynetic.core import application
+from pynetic.core.component import Component
+from pynetic.core.graph import DependencyGraph
+from pynetic.core.html import Div, P
+from pynetic.core.reference import Reference
+from pynetic.core.utils import For
+
+
+class Derived:
+    def __init__(self, log, name):
+        self.log = log
+        self.name = name
+
+    def _invalidate(self):
+        self.log.append(self.name)
+
+
+def test_diamond_updates_each_node_once_in_order():
+    log = []
+    graph = DependencyGraph()
+    source = Reference(1)
+    left, right, bottom = Derived(log, "left"), Derived(log, "right"), Derived(log, "bottom")
+    graph.add(source, left)
+    graph.add(source, right)
+    graph.add(left, bottom)
+    graph.add(right, bottom)
+    graph.add(source, bottom)
+
+    graph.invalidate(source)
+
+    assert sorted(log[:2]) == ["left", "right"] and log[2:] == ["bottom"]
+
+
+def test_invalidate_returns_topmost_elements():
+    graph = DependencyGraph()
+    title, items = Reference("a"), Reference([1, 2])
+    inner = P(title)
+    outer = Div(inner, For(items, None, str))
+    graph.track(Div(outer))
+
+    outer.render()
+
+    assert graph.invalidate(title) == [inner]
+    assert graph.invalidate(title, items) == [outer]
+    assert outer._cache is None
+
+
+def test_cycles_are_rejected():
+    graph = DependencyGraph()
+    first, second = Derived([], "first"), Derived([], "second")
+    graph.add(first, second)
+    graph.add(second, first)
+
+    with pytest.raises(ValueError, match="cycle"):
+        graph.invalidate(first)
+
+
+def test_reference_changes_rerender_readers(monkeypatch):
+    monkeypatch.setattr(application.Application, "graph", DependencyGraph())
+    count = Reference(1)
+    element = Div(P(count))
+    Component(element)
+
+    assert element.render() == "<div><p>1</p></div>"
+
+    count += 1
+
+    assert element.render() == "<div><p>2</p></div>"
+    assert application.Application.graph.dependents(count) == [element._children[0]]
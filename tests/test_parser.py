@@ -0,0 +1,201 @@
+import sys
+from importlib.util import module_from_spec, spec_from_file_location
+from textwrap import dedent
+from types import ModuleType
+
+from pynetic.core import application
+from pynetic.core.graph import DependencyGraph
+from pynetic.core.parser import analyze, read_dependencies
+from pynetic.core.reference import Reference
+from pynetic.core.session import SessionStore
+
+
+def module(tmp_path, name: str, source: str, package: bool = False) -> ModuleType:
+    path = tmp_path.joinpath(f"{name.replace('.', '_')}.py")
+    path.write_text(dedent(source))
+    made = ModuleType(name)
+    made.__file__ = str(path)
+
+    if package:
+        made.__path__ = [str(tmp_path)]
+
+    return made
+
+
+def test_analyze_finds_readers_and_writers(tmp_path):
+    state = module(
+        tmp_path,
+        "app.state",
+        """
+        from pynetic import MakeReference
+
+        with MakeReference():
+            count: int = 0
+            todos = []
+        """,
+    )
+    index = module(
+        tmp_path,
+        "app.routes.index",
+        """
+        from ..state import count, todos as items
+        from .. import state
+        from pynetic import Component, Div
+
+        def increment():
+            global count
+            count += 1
+
+        def add(text):
+            items[len(items)] = text
+
+        def shadowed(count):
+            return count
+
+        def total():
+            return state.count
+
+        class Todos:
+            def show(self):
+                return [item for item in items]
+
+        home = Component(Div(lambda: count))
+        """,
+    )
+
+    dependencies = analyze(state, index)
+
+    assert dependencies.references == {"count": "app.state", "todos": "app.state"}
+    assert dependencies.reads == {
+        "app.routes.index:increment": ("count",),
+        "app.routes.index:add": ("todos",),
+        "app.routes.index:total": ("count",),
+        "app.routes.index:Todos.show": ("todos",),
+        "app.routes.index:home": ("count",),
+    }
+    assert dependencies.writes == {
+        "app.routes.index:increment": ("count",),
+        "app.routes.index:add": ("todos",),
+    }
+
+
+def test_writes_through_the_module_making_the_reference(tmp_path):
+    state = module(
+        tmp_path,
+        "app.state",
+        """
+        with MakeReference():
+            count = 0
+            todos = []
+        """,
+    )
+    index = module(
+        tmp_path,
+        "app.index",
+        """
+        import app.state as st
+        from app import state
+
+        def increment():
+            state.count += 1
+
+        def reset():
+            st.count = 5
+
+        def rename():
+            st.todos[0] = "x"
+        """,
+    )
+
+    dependencies = analyze(state, index)
+
+    assert dependencies.writes == {
+        "app.index:increment": ("count",),
+        "app.index:reset": ("count",),
+        "app.index:rename": ("todos",),
+    }
+    assert dependencies.reads == {
+        "app.index:increment": ("count",),
+        "app.index:rename": ("todos",),
+    }
+
+
+def test_nested_functions_are_readers_of_their_own(tmp_path):
+    index = module(
+        tmp_path,
+        "index",
+        """
+        with MakeReference():
+            name = "John"
+
+        def outer():
+            def inner():
+                return name
+
+            return inner
+        """,
+    )
+
+    assert analyze(index).reads == {"index:outer.<locals>.inner": ("name",)}
+
+
+def test_dependency_table_round_trips(tmp_path):
+    index = module(
+        tmp_path,
+        "index",
+        """
+        with MakeReference():
+            name = "John"
+
+        def greet():
+            return name
+        """,
+    )
+    analyze(index).save(tmp_path.joinpath("dependencies.json"))
+
+    assert read_dependencies(tmp_path) == analyze(index)
+    assert read_dependencies(tmp_path.joinpath("missing")) is None
+
+
+def test_references_are_linked_to_the_components_and_computed_values_reading_them(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setattr(application.Application, "references", {})
+    monkeypatch.setattr(application.Application, "graph", DependencyGraph())
+    monkeypatch.setattr(application.Application, "sessions", SessionStore())
+    path = tmp_path.joinpath("linked.py")
+    path.write_text(
+        dedent(
+            """
+            from pynetic.core.component import Component
+            from pynetic.core.html import Div
+            from pynetic.core.reference import MakeReference, computed
+
+            with MakeReference():
+                count = 0
+
+            @computed
+            def doubled():
+                return count._var * 2
+
+            def increment():
+                global count
+                count += 1
+
+            home = Component(Div(lambda: count))
+            """
+        )
+    )
+    linked = module_from_spec(spec_from_file_location("linked", path))
+    monkeypatch.setitem(sys.modules, "linked", linked)
+    linked.__spec__.loader.exec_module(linked)
+
+    assert isinstance(linked.count, Reference)
+    assert application.Application.references == {"count": linked.count}
+
+    application.Application.link(analyze(linked))
+
+    assert application.Application.graph.dependents(linked.count) == [
+        linked.doubled,
+        *linked.home.elements,
+    ]
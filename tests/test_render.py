@@ -0,0 +1,242 @@
+import json
+
+import pytest
+
+from pynetic.core import html, hydration
+from pynetic.core.component import Component
+from pynetic.core.css import Style
+from pynetic.core.html import Br, Div, define_element
+from pynetic.core.reference import Reference
+from pynetic.core.utils import For
+
+
+def test_stream_element():
+    assert b"".join(Div("Some content").stream()).decode() == "<div>Some content</div>"
+
+
+def test_stream_attributes():
+    element = Div(classes=["foo_bar", "baz"], id="qux", title="a < b")
+
+    assert b"".join(element.stream()).decode() == (
+        '<div id="qux" class="foo-bar baz" title="a &lt; b"></div>'
+    )
+
+
+def test_stream_self_closing():
+    assert b"".join(Div(Br()).stream()).decode() == "<div><br></div>"
+
+
+def test_stream_children_depth_first():
+    element = Div(Div("a", Div("b")), Div("c"))
+
+    assert b"".join(element.stream()).decode() == "<div><div>a<div>b</div></div><div>c</div></div>"
+
+
+def test_stream_chunk_size():
+    element = Div(*(Div(Reference(i)) for i in range(100)))
+    chunks = list(element.stream(chunk_size=64))
+
+    assert len(chunks) > 1
+    assert b"".join(chunks).decode() == b"".join(element.stream()).decode()
+
+
+def test_stream_deep_tree():
+    element = Div()
+    for _ in range(5000):
+        element = Div(element)
+
+    assert b"".join(element.stream()).decode().count("<div>") == 5001
+
+
+@pytest.mark.asyncio
+async def test_astream_component():
+    component = Component("<text>", Div("a"))
+
+    assert b"".join([chunk async for chunk in component.astream()]) == b"&lt;text&gt;<div>a</div>"
+
+
+def test_render_string():
+    assert Div("a", Div(Br()), id="b").render() == '<div id="b">a<div><br></div></div>'
+
+
+def test_render_lxml_matches_string():
+    element = Div("a & b", Div(Br(), classes="c"), title="d")
+
+    assert element.render("lxml") == element.render("string")
+
+
+def test_render_lxml_invalid_tag():
+    with pytest.raises(ValueError):
+        define_element("not-a-tag", "")().render("lxml")
+
+
+def test_render_unknown_backend():
+    with pytest.raises(ValueError):
+        Div().render("unknown")
+
+
+def test_static_subtree_is_precompiled():
+    static = Div(Div("a"), title="b")
+    element = Div(static, Div(Reference("c")))
+
+    assert element.render() == '<div><div title="b"><div>a</div></div><div>c</div></div>'
+    assert static._cache == b'<div title="b"><div>a</div></div>'
+    assert element._cache is None
+
+
+def test_dynamic_elements_are_not_precompiled():
+    element = Div(Div(For([1, 2], None, str)), Div(on_click=print), Div(title=Reference("a")))
+    element.render()
+
+    assert not element._static
+    assert all(child._cache is None for child in element._children)
+
+
+def test_style_invalidates_precompiled_ancestors():
+    leaf = Div("a")
+    element = Div(Div(leaf))
+    element.render()
+
+    leaf.style(color="red")
+
+    assert element._cache is None
+    assert element.render() == '<div><div><div style="color:red">a</div></div></div>'
+
+
+def test_style_reference_makes_ancestors_dynamic():
+    leaf = Div("a")
+    element = Div(leaf)
+    color = Reference("red")
+
+    leaf.style(color=color)
+    color._var = "blue"
+
+    assert not element._static
+    assert element.render() == '<div><div style="color:blue">a</div></div>'
+
+
+def test_elements_are_compact():
+    element = Div()
+
+    assert not hasattr(element, "__dict__")
+    assert element._children == ()
+    assert element._named_children is element._styles is Div()._events
+
+    element.style(color="red")
+    assert Div()._styles == {}
+
+
+def test_tagged_elements_are_created_once():
+    assert html.Div is Div
+    assert Div._tag == "div"
+    assert Br._self_closing
+
+
+def test_unknown_tagged_element():
+    with pytest.raises(AttributeError):
+        html.NotATag
+
+
+def test_content_hash():
+    assert Div(Div("a"), title="b").content_hash == Div(Div("a"), title="b").content_hash
+    assert Div(Div("a")).content_hash != Div(Div("b")).content_hash
+    assert Div(Reference("a")).content_hash != Div(Reference("a")).content_hash
+
+
+def test_content_hash_of_styles_follows_their_rules():
+    def styled(color):
+        return Div("a", Style({".a": {"color": color}}))
+
+    assert styled("red")._static
+    assert styled("red").content_hash == styled("red").content_hash
+    assert styled("red").content_hash != styled("blue").content_hash
+
+
+def test_content_hash_follows_style():
+    leaf, sibling = Div("a"), Div("b")
+    element = Div(Div(leaf), sibling)
+    before, sibling_hash = element.content_hash, sibling.content_hash
+
+    leaf.style(color="red")
+
+    assert element._hash is None and sibling._hash == sibling_hash
+    assert element.content_hash != before
+
+
+def test_restyling_a_shared_element_invalidates_every_parent():
+    shared = Div("a")
+    first, second = Div(shared), Div(Div(shared))
+    renders = first.render(), second.render()
+    hashes = first.content_hash, second.content_hash
+
+    shared.style(color="red")
+
+    assert (
+        (first.render(), second.render())
+        == (
+            '<div><div style="color:red">a</div></div>',
+            '<div><div><div style="color:red">a</div></div></div>',
+        )
+        != renders
+    )
+    assert first.content_hash != hashes[0] and second.content_hash != hashes[1]
+
+
+def test_identical_components_are_equal():
+    assert len({Component(Div("a")), Component(Div("a")), Component(Div("b"))}) == 2
+
+
+def test_components_with_colliding_hashes_are_not_equal(monkeypatch):
+    monkeypatch.setattr(Component, "__hash__", lambda self: 0)
+
+    assert Component(Div("a")) != Component(Div("b"))
+    assert len({Component(Div("a")), Component(Div("b"))}) == 2
+
+
+def test_islands_mark_interactive_elements_only():
+    def increment():
+        pass
+
+    count = Reference(0)
+    page = Component(
+        html.Html(html.Body(Div("static"), Div(html.Button("+", on_click=increment), Div(count))))
+    )
+    rendered = hydration.render_page(page)
+
+    assert '<div>static</div><div><button data-island="a">+</button><div data-island="b">0' in (
+        rendered
+    )
+    assert "def increment():" in rendered
+    assert rendered.index("pynetic-islands") < rendered.index("</body>")
+
+
+def test_handlers_with_the_same_name_are_registered_apart():
+    def make(text):
+        def handler():
+            return text
+
+        return handler
+
+    items = Reference(["a"])
+    page = Component(
+        Div(
+            html.Button("1", on_click=make(1)),
+            html.Button("2", on_click=make(2)),
+            html.Ul(For(items, None, html.Li)),
+        )
+    )
+    data = json.loads(
+        hydration.render_page(page).split('id="pynetic-islands">')[1].split("</script>")[0]
+    )
+
+    assert data["a"]["events"] != data["b"]["events"]
+    assert data["c"]["references"] == [f"${items._slot}"]
+
+
+def test_lambda_handlers_are_rejected():
+    with pytest.raises(ValueError):
+        hydration.render_page(Component(Div(html.Button("+", on_click=lambda event: None))))
+
+
+def test_static_page_ships_no_scripts():
+    assert "<script" not in hydration.render_page(Component(Div(Div("a"))))
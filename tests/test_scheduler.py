@@ -0,0 +1,141 @@
+import asyncio
+
+import pytest
+
+from pynetic.core import application
+from pynetic.core.component import Component
+from pynetic.core.diff import SET_TEXT
+from pynetic.core.graph import DependencyGraph
+from pynetic.core.html import Div, P
+from pynetic.core.reference import Reference
+from pynetic.core.scheduler import Scheduler, batch
+from pynetic.core.session import SessionStore, SQLiteBackend
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    sent = []
+    scheduler = Scheduler(send=sent.append)
+    monkeypatch.setattr(application.Application, "graph", DependencyGraph())
+    monkeypatch.setattr(application.Application, "scheduler", scheduler)
+    scheduler.sent = sent
+    return scheduler
+
+
+def page(*references):
+    elements = (Div(*(P(reference) for reference in references)),)
+    Component(*elements)
+    return elements
+
+
+def test_batch_sends_one_message(scheduler):
+    first, second = Reference(1), Reference("a")
+    scheduler.watch(*page(first, second))
+
+    with batch():
+        first += 1
+
+        with batch():
+            second += "b"
+
+        assert scheduler.sent == []
+
+        first += 1
+
+    assert len(scheduler.sent) == 1
+    assert [(patch.op, patch.args) for patch in scheduler.sent[0]] == [
+        (SET_TEXT, ("3",)),
+        (SET_TEXT, ("ab",)),
+    ]
+
+
+def test_changes_are_sent_straight_away_without_an_event_loop(scheduler):
+    count = Reference(1)
+    scheduler.watch(*page(count))
+
+    count += 1
+    count += 1
+
+    assert len(scheduler.sent) == 2
+
+
+@pytest.mark.asyncio
+async def test_changes_coalesce_per_event_loop_tick(scheduler):
+    count = Reference(1)
+    scheduler.watch(*page(count))
+
+    count += 1
+    count += 1
+    assert scheduler.sent == []
+
+    await asyncio.sleep(0)
+
+    assert [patch.args for patch in scheduler.sent[0]] == [("3",)]
+
+
+def test_unwatched_pages_are_not_diffed(scheduler):
+    count = Reference(1)
+    page(count)
+
+    count += 1
+
+    assert scheduler.flush() == [] and scheduler.sent == []
+
+
+def test_elements_shared_by_pages_update_each_page(scheduler):
+    count = Reference(1)
+    shared = P(count)
+    pages = (Div(shared),), (Div(Div(shared)),)
+
+    for elements in pages:
+        Component(*elements)
+        scheduler.watch(*elements)
+
+    count += 1
+
+    assert [[patch.args for patch in patches] for patches in scheduler.sent] == [[("2",)]] * 2
+
+
+def test_each_sessions_changes_are_applied_and_sent_in_that_session(scheduler, monkeypatch):
+    sessions = SessionStore()
+    monkeypatch.setattr(application.Application, "sessions", sessions)
+    count = Reference(1)
+    elements = page(count)
+    sent = {"a": [], "b": []}
+
+    for session_id in sent:
+        with sessions.session(session_id):
+            scheduler.watch(*elements, send=sent[session_id].append)
+
+    with batch():
+        for session_id, change in (("a", 5), ("b", 7)):
+            with sessions.session(session_id):
+                count += change
+
+    assert [patch.args for patch in sent["a"][0]] == [("6",)]
+    assert [patch.args for patch in sent["b"][0]] == [("8",)]
+    assert len(sent["a"]) == len(sent["b"]) == 1 and scheduler.sent == []
+
+
+@pytest.mark.asyncio
+async def test_deferred_updates_enter_each_session(scheduler, monkeypatch, tmp_path):
+    # With a backend sessions are saved and dropped from memory when their block ends
+    sessions = SessionStore(backend=SQLiteBackend(tmp_path.joinpath("sessions.db")))
+    monkeypatch.setattr(application.Application, "sessions", sessions)
+    count = Reference(1)
+    elements = page(count)
+    sent = {"a": [], "b": []}
+
+    for session_id in sent:
+        with sessions.session(session_id):
+            scheduler.watch(*elements, send=sent[session_id].append)
+
+    for session_id, change in (("a", 5), ("b", 7)):
+        with sessions.session(session_id):
+            count += change
+
+    await asyncio.sleep(0)
+
+    assert [patch.args for patch in sent["a"][0]] == [("6",)]
+    assert [patch.args for patch in sent["b"][0]] == [("8",)]
+    assert len(sent["a"]) == len(sent["b"]) == 1 and scheduler.sent == []
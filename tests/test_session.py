@@ -0,0 +1,149 @@
+import pytest
+
+from pynetic.core.application import Application
+from pynetic.core.reference import Reference
+from pynetic.core.session import SessionBackend, SessionStore, SQLiteBackend
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def test_sessions_have_their_own_values():
+    sessions = SessionStore()
+    slot = sessions.register([])
+
+    with sessions.session("a"):
+        sessions.get(slot).append("a")
+
+    with sessions.session("b"):
+        assert sessions.get(slot) == []
+        sessions.set(slot, ["b"])
+
+    with sessions.session("a"):
+        assert sessions.get(slot) == ["a"]
+
+    assert sessions.get(slot) == []
+
+
+def test_idle_sessions_are_evicted(clock):
+    sessions = SessionStore(ttl=10, clock=clock)
+
+    with sessions.session("a"):
+        pass
+
+    clock.now = 5
+
+    with sessions.session("b"):
+        pass
+
+    clock.now = 12
+
+    assert sessions.evict() == ["a"]
+    assert "b" in sessions
+
+
+def test_least_recently_used_sessions_are_evicted_over_the_limits(clock):
+    sessions = SessionStore(max_sessions=2, clock=clock)
+    sessions.register(0)
+
+    for session_id in "abca":
+        with sessions.session(session_id):
+            pass
+
+    assert list(sessions._sessions) == ["c", "a"]
+
+    sessions = SessionStore(clock=clock)
+    slot = sessions.register("")
+
+    with sessions.session("a"):
+        sessions.set(slot, "x" * 1000)
+
+    sessions.max_bytes = sessions.memory
+
+    with sessions.session("b"):
+        sessions.set(slot, "y" * 1000)
+
+    assert "a" not in sessions and "b" in sessions
+    assert sessions.memory <= sessions.max_bytes
+
+
+def test_references_read_the_current_session(monkeypatch):
+    monkeypatch.setattr(Application, "sessions", SessionStore())
+    monkeypatch.setattr(Application.scheduler, "changed", lambda reference: None)
+    count = Reference(0)
+
+    with Application.sessions.session("a"):
+        count += 1
+
+    with Application.sessions.session("b"):
+        assert count._var == 0
+
+    with Application.sessions.session("a"):
+        assert count._var == 1
+
+
+def test_workers_sharing_a_backend_see_each_others_changes(tmp_path, clock):
+    workers = [
+        SessionStore(backend=SQLiteBackend(tmp_path.joinpath("sessions.db")), clock=clock)
+        for _ in range(2)
+    ]
+    slots = [worker.register([]) for worker in workers]
+
+    with workers[0].session("a"):
+        workers[0].get(slots[0]).append("first")
+
+    assert len(workers[0]) == 0
+
+    with workers[1].session("a"):
+        assert workers[1].get(slots[1]) == ["first"]
+        workers[1].get(slots[1]).append("second")
+
+    with workers[0].session("a"):
+        assert workers[0].get(slots[0]) == ["first", "second"]
+
+
+def test_idle_sessions_are_expired_from_the_backend(tmp_path, clock):
+    backend = SQLiteBackend(tmp_path.joinpath("sessions.db"))
+    sessions = SessionStore(ttl=10, backend=backend, clock=clock)
+    slot = sessions.register(0)
+
+    with sessions.session("a"):
+        sessions.set(slot, 1)
+
+    clock.now = 11
+
+    assert sessions.evict() == ["a"]
+    assert backend.load("a") is None
+
+
+def test_backend_expiry_is_rate_limited(tmp_path, clock):
+    class Backend(SQLiteBackend):
+        expiries = 0
+
+        def expire(self, before: float) -> list[str]:
+            self.expiries += 1
+            return super().expire(before)
+
+    backend = Backend(tmp_path.joinpath("sessions.db"))
+    sessions = SessionStore(ttl=10, backend=backend, clock=clock)
+
+    for now in (0, 0.5, 0.9, 1):
+        clock.now = now
+
+        with sessions.session("a"):
+            pass
+
+    assert backend.expiries == 2
+
+    with pytest.raises(TypeError):
+        SessionBackend()